@@ -95,6 +95,49 @@ class Config(object):
     def as_dict(self):
         return self.config
     
+class BaseEnumMetaclass(type):
+    """
+    Metaclass of BaseEnum. The values of an enum are collected once, when
+    the class is created, so list(), dict() and has() do not walk dir() on
+    every call. has() is a set lookup for hashable values. Assigning a class
+    attribute after creation collects the values again.
+    """
+    def __init__(cls, name, bases, namespace):
+        super(BaseEnumMetaclass, cls).__init__(name, bases, namespace)
+        cls._collect_values()
+
+    def __setattr__(cls, attr, value):
+        super(BaseEnumMetaclass, cls).__setattr__(attr, value)
+        if not attr.startswith('_enum_'):
+            cls._collect_values()
+
+    def __delattr__(cls, attr):
+        super(BaseEnumMetaclass, cls).__delattr__(attr)
+        cls._collect_values()
+
+    def _collect_values(cls):
+        """
+        Collect the enum attributes, those not callable and not starting
+        with '__', in dir() order.
+        """
+        items = [(attr, getattr(cls, attr)) for attr in dir(cls)
+                 if not attr.startswith('__') and not attr.startswith('_enum_')
+                 and not callable(getattr(cls, attr))]
+
+        hashable_values = set()
+        unhashable_values = []
+        for (attr, value) in items:
+            try:
+                hashable_values.add(value)
+            except TypeError:
+                # e.g. the lists in InstErrorCode
+                unhashable_values.append(value)
+
+        type.__setattr__(cls, '_enum_items', items)
+        type.__setattr__(cls, '_enum_values', [value for (attr, value) in items])
+        type.__setattr__(cls, '_enum_value_set', frozenset(hashable_values))
+        type.__setattr__(cls, '_enum_unhashable_values', unhashable_values)
+
 class BaseEnum(object):
     """Base class for enums.
     
@@ -114,21 +157,17 @@ class BaseEnum(object):
     are quicker to execute and more compartmentalized so that code can be
     re-used more easily outside of a capability container as needed.
     """
-    
+    __metaclass__ = BaseEnumMetaclass
+
     @classmethod
     def list(cls):
         """List the values of this enum."""
-        return [getattr(cls,attr) for attr in dir(cls) if\
-                not callable(getattr(cls,attr)) and not attr.startswith('__')]
+        return list(cls._enum_values)
 
     @classmethod
     def dict(cls):
         """Return a dict representation of this enum."""
-        result = {}
-        for attr in dir(cls):
-            if not callable(getattr(cls,attr)) and not attr.startswith('__'):
-                result[attr] = getattr(cls,attr)
-        return result
+        return dict(cls._enum_items)
 
     @classmethod
     def has(cls, item):
@@ -143,7 +182,14 @@ class BaseEnum(object):
         @retval True if one of the class attributes has value item, false
         otherwise.
         """
-        return item in cls.list()
+        try:
+            if item in cls._enum_value_set:
+                return True
+        except TypeError:
+            # unhashable item, compare with every value
+            return item in cls._enum_values
+
+        return item in cls._enum_unhashable_values
 
 class EventKey(BaseEnum):
     """Keys to the event dictionary fields as used by the InstrumentProtocol
@@ -11,6 +11,10 @@
 __author__ = 'Steve Foley'
 __license__ = 'Apache 2.0'
 
+import re
+from collections import deque
+from collections import OrderedDict
+
 from mi.core.log import get_logger ; log = get_logger()
 
 from mi.core.exceptions import SampleException
@@ -473,4 +477,455 @@ class BinaryChunker(Chunker):
     def __init__(self, data_sieve_fn):
         Chunker.__init__(self, data_sieve_fn)
         self.buffer = []
-    
\ No newline at end of file
+    
+
+class BufferedChunker(Chunker):
+    """
+    A chunker engine that keeps its data in a single growable bytearray with
+    a read offset instead of re-slicing the whole buffer every time a chunk
+    is consumed. All chunk indices are kept as absolute stream positions in
+    deques, so consuming a chunk is O(1) and draining N records from a large
+    buffer is linear rather than quadratic. Consumed bytes are only dropped
+    from the front of the bytearray once they make up a large enough part
+    of it (lazy compaction).
+
+    The public interface is the same as Chunker, so this can be used as a
+    drop in replacement for StringChunker or BinaryChunker. Indices returned
+    by the *_with_index methods are relative to the start of the unconsumed
+    data, just like the original chunker.
+    """
+    # Don't bother compacting the buffer until this many bytes are consumed
+    COMPACT_THRESHOLD = 65536
+
+    def __init__(self, data_sieve_fn):
+        self.sieve = data_sieve_fn
+
+        self.raw_chunk_list = deque()
+        self.data_chunk_list = deque()
+        self.nondata_chunk_list = deque()
+
+        self._buffer = bytearray()
+        # absolute stream position of self._buffer[0]
+        self._base = 0
+        # absolute stream position of the first unconsumed byte
+        self._read_pos = 0
+        # absolute stream position the sieve needs to resume scanning from
+        self._resume_pos = 0
+
+    def _to_chunk(self, data):
+        """
+        Convert a piece of the internal buffer to what the caller expects
+        back from the chunker. Subclasses override this.
+        """
+        return data
+
+    @property
+    def buffer(self):
+        """
+        The unconsumed part of the buffer. This is a new copy of the data on
+        every read, so avoid it on hot paths such as debug logging.
+        """
+        return self._to_chunk(self._buffer[self._read_pos - self._base:])
+
+    def add_chunk(self, raw_data, timestamp):
+        """
+        Adds a chunk of data to the end of the buffer, includes the new indices
+        in the raw_chunk_list and sieves the unsieved part of the buffer for
+        new data blocks.
+
+        @param raw_data The bunch of raw data as a string or bytearray
+        @param timestamp The time (in NTP4 float format) that the data was
+            collected at the port agent
+        """
+        assert isinstance(timestamp, float)
+
+        start_index = self._base + len(self._buffer)
+        self._buffer.extend(raw_data)
+        end_index = self._base + len(self._buffer)
+
+        self.raw_chunk_list.append((start_index, end_index, timestamp))
+
+        self._sieve_buffer(timestamp)
+
+    def _sieve_buffer(self, timestamp):
+        """
+        Run the sieve over everything past the last data block and append
+        the data and non-data blocks found to the chunk lists. Like the
+        original chunker, whatever trails the last data block is only listed
+        as non-data when no data block was found at all, so a partial
+        record is not handed out as non-data.
+
+        @param timestamp The timestamp to use for a new non-data block that
+            does not line up with an earlier one
+        """
+        if self.data_chunk_list:
+            scan_pos = self.data_chunk_list[-1][1]
+        else:
+            scan_pos = self._read_pos
+
+        # a non-data tail from the last pass gets rebuilt here
+        tail = None
+        if self.nondata_chunk_list and \
+           self.nondata_chunk_list[-1][0] >= scan_pos:
+            tail = self.nondata_chunk_list.pop()
+
+        # a resumable sieve has told us how much of what it has already seen
+        # could still hold the start of a record, skip the rest
+        sieve_pos = max(scan_pos, self._resume_pos)
+        raw_data = self._to_chunk(self._buffer[sieve_pos - self._base:])
+        result = self.sieve(raw_data)
+
+        resume_point = getattr(self.sieve, 'resume_point', None)
+        if resume_point:
+            self._resume_pos = sieve_pos + resume_point(raw_data)
+
+        # assert no overlap!
+        if self.overlaps(result):
+            raise SampleException("Overlapping blocks in sieve list: %s" % result)
+        # sort to protect us from some sloppy sieve code
+        result.sort()
+
+        if not result:
+            if tail:
+                timestamp = tail[2]
+            self.nondata_chunk_list.append((scan_pos,
+                                            self._base + len(self._buffer),
+                                            timestamp))
+            return
+
+        timestamps = self._timestamp_lookup(scan_pos)
+        previous_end = scan_pos
+        for (s, e) in result:
+            s += sieve_pos
+            e += sieve_pos
+            if s > previous_end:
+                if tail and previous_end == scan_pos:
+                    nondata_time = tail[2]
+                else:
+                    nondata_time = timestamps(previous_end)
+                self.nondata_chunk_list.append((previous_end, s, nondata_time))
+            self.data_chunk_list.append((s, e, timestamps(s)))
+            previous_end = e
+
+        log.trace("Added chunk, data_chunk_list: %s, nondata_chunk_list: %s",
+                  self.data_chunk_list, self.nondata_chunk_list)
+
+    def _timestamp_lookup(self, start_index):
+        """
+        Build a lookup function that returns the timestamp of the raw chunk
+        holding a buffer position. Positions must be requested in ascending
+        order, starting at or after start_index, so a whole sieve pass only
+        walks the raw chunk list once.
+
+        @param start_index The lowest position that will be looked up
+        @retval A function taking an absolute position and returning the
+            timestamp of the raw chunk it arrived in
+        """
+        # The raw chunks we need are at the end of the list, walk back to
+        # the one holding start_index
+        raw_list = []
+        for raw_chunk in reversed(self.raw_chunk_list):
+            raw_list.append(raw_chunk)
+            if raw_chunk[0] <= start_index:
+                break
+        raw_list.reverse()
+
+        state = {'index': 0}
+
+        def lookup(position):
+            index = state['index']
+            while index < len(raw_list) - 1 and position >= raw_list[index][1]:
+                index += 1
+            state['index'] = index
+            return raw_list[index][2]
+
+        return lookup
+
+    def _consume(self, end_index, drop_data_fragments=False):
+        """
+        Mark everything up to end_index (absolute) as consumed and trim the
+        chunk lists to match. A chunk that straddles end_index is cut down
+        to the part that remains.
+
+        @param end_index The absolute position to consume up to
+        @param drop_data_fragments If True, a data chunk that straddles
+            end_index is moved over to the non-data list because it can no
+            longer be returned whole.
+        """
+        if end_index <= self._read_pos:
+            return
+        self._read_pos = end_index
+
+        self._trim_chunk_list(self.raw_chunk_list, end_index)
+        self._trim_chunk_list(self.nondata_chunk_list, end_index)
+        fragment = self._trim_chunk_list(self.data_chunk_list, end_index,
+                                         drop_data_fragments)
+        if fragment:
+            self.nondata_chunk_list.appendleft(fragment)
+
+        self._compact()
+
+    @staticmethod
+    def _trim_chunk_list(chunk_list, end_index, drop_fragment=False):
+        """
+        Pop everything that ends at or before end_index off the front of a
+        chunk list and cut down a chunk that straddles it.
+
+        @retval The cut down chunk if it was dropped from the list, else None
+        """
+        while chunk_list and chunk_list[0][1] <= end_index:
+            chunk_list.popleft()
+
+        if chunk_list and chunk_list[0][0] < end_index:
+            (s, e, t) = chunk_list.popleft()
+            if drop_fragment:
+                return (end_index, e, t)
+            chunk_list.appendleft((end_index, e, t))
+
+        return None
+
+    def _compact(self):
+        """
+        Drop consumed bytes off the front of the buffer once they are worth
+        the copy.
+        """
+        consumed = self._read_pos - self._base
+        if consumed == len(self._buffer):
+            self._buffer = bytearray()
+            self._base = self._read_pos
+        elif consumed >= self.COMPACT_THRESHOLD and \
+             consumed * 2 >= len(self._buffer):
+            del self._buffer[:consumed]
+            self._base = self._read_pos
+
+    def _clean_buffer(self, end_index):
+        """
+        Consume the buffer up to end_index, relative to the start of the
+        unconsumed data.
+        @param end_index the last index used...clean up to here
+        """
+        self._consume(self._read_pos + end_index, drop_data_fragments=True)
+
+    def _get_next(self, chunk_list, clean, drop_data_fragments=False):
+        """
+        Common code for getting the next chunk off one of the chunk lists.
+        @retval (timestamp, chunk, start, end) with start and end relative
+            to the unconsumed data, or all None if the list is empty
+        """
+        if not chunk_list:
+            return (None, None, None, None)
+
+        (next_start, next_end, timestamp) = chunk_list[0]
+        next_block = self._to_chunk(
+            self._buffer[next_start - self._base:next_end - self._base])
+        start = next_start - self._read_pos
+        end = next_end - self._read_pos
+
+        if clean:
+            self._consume(next_end, drop_data_fragments)
+
+        return (timestamp, next_block, start, end)
+
+    def get_next_data_with_index(self, clean=True):
+        """
+        Get the next chunk of data from the buffer. By default, it clears all
+        that comes before it. This method returns the start and end indices in
+        the resulting tuple.
+
+        @param clean If set to false, do not clear the buffer when fetching the
+            data, but simply return the data block and make no further changes.
+        @return A tuple of (timestamp, data_chunk, start_index, end_index)
+            where timestamp is in NTP4 float format and data chunk is a
+            section of buffer with indices between (start, end). If no data,
+            returns (None, None, None, None)
+        """
+        return self._get_next(self.data_chunk_list, clean)
+
+    def get_next_non_data_with_index(self, clean=True):
+        """
+        Get the next chunk of non-data from the buffer, clearing all that comes
+        before it. Default behavior is to clear the buffer before and including
+        this data.
+
+        @param clean Remove the buffer contents before and including this data
+        @return A tuple of (timestamp, data_chunk, next_start, next_end)
+            where timestamp is in NTP4 float format, (None, None, None, None)
+            if no data
+        """
+        return self._get_next(self.nondata_chunk_list, clean)
+
+    def get_next_raw(self, clean=True):
+        """
+        Get the next chunk of raw characters from the buffer, clearing all
+        that comes before it. A data block that is only partly consumed
+        this way is moved to the non-data list.
+
+        @param clean Remove the buffer contents before and including this data
+        @return A tuple of (timestamp, data_chunk) where timestamp is in NTP4
+            float format, (None, None) if empty list
+        """
+        (timestamp, result, start, end) = self._get_next(self.raw_chunk_list,
+                                                         clean, True)
+        return (timestamp, result)
+
+    def clean_all_chunks(self):
+        """
+        Clean all data out of the non_data, raw, and data lists
+        """
+        self._consume(self._base + len(self._buffer), drop_data_fragments=True)
+
+
+class BufferedStringChunker(BufferedChunker):
+    """
+    A buffered chunker that hands strings to the sieve and back to the
+    caller, a drop in replacement for StringChunker.
+    """
+    def _to_chunk(self, data):
+        return str(data)
+
+
+class BufferedBinaryChunker(BufferedChunker):
+    """
+    A buffered chunker that hands bytearrays to the sieve and back to the
+    caller, a drop in replacement for BinaryChunker.
+    """
+
+
+class ResumableSieve(object):
+    """
+    Wraps a sieve function with enough knowledge about the records it finds
+    to let a BufferedChunker skip data it has already sieved. Without this the
+    chunker has to re-sieve everything after the last data block on every
+    add_chunk, which gets expensive when there are long stretches of non-data
+    or records much larger than the chunks coming in.
+
+    After each pass the chunker asks the sieve for its resume point, the
+    first index of the data just sieved that could still be the start of a
+    record that has not been found yet. The next pass starts scanning there.
+    The sieve is still called like a plain sieve function, so it can be used
+    with any chunker.
+    """
+    def __init__(self, sieve_fn, max_record_length=None, record_terminator=None):
+        """
+        @param sieve_fn The sieve function to wrap
+        @param max_record_length The longest record the sieve can match, a
+            record that was not found can only start within this many bytes
+            of the end of the data.
+        @param record_terminator A string that every record ends with and
+            that never shows up anywhere else in a record (like a newline),
+            a record that was not found can only start after the last one.
+        """
+        self.sieve_fn = sieve_fn
+        self.max_record_length = max_record_length
+        self.record_terminator = record_terminator
+
+    def __call__(self, raw_data):
+        # every record ends with the terminator, no terminator means there is
+        # nothing to find
+        if self.record_terminator is not None and \
+           raw_data.find(self.record_terminator) < 0:
+            return []
+
+        return self.sieve_fn(raw_data)
+
+    def resume_point(self, raw_data):
+        """
+        Find where the next sieve pass needs to start
+
+        @param raw_data The data that was just passed through the sieve
+        @retval The index in raw_data to resume scanning from
+        """
+        resume = 0
+
+        if self.max_record_length is not None:
+            resume = max(resume, len(raw_data) - self.max_record_length + 1)
+
+        if self.record_terminator is not None:
+            index = raw_data.rfind(self.record_terminator, resume)
+            if index >= 0:
+                resume = index + len(self.record_terminator)
+
+        return resume
+
+
+class MultiPatternSieve(object):
+    """
+    A sieve over a list of regexes that is compiled once and finds the
+    matches of all of them in a single left to right pass. Patterns that
+    share the same flags are joined into one alternation, so the usual case
+    of a handful of sample, status and configuration patterns only scans the
+    data once or twice instead of once per pattern.
+
+    The matches come back in order and without overlap. Where two patterns
+    match at the same place the one earlier in the list wins, and a match
+    that starts inside an earlier one is dropped. Build it once per protocol
+    and use it anywhere a sieve function is expected:
+    StringChunker(MultiPatternSieve([SAMPLE_MATCHER, STATUS_MATCHER]))
+    """
+    # numbered back references can not survive being joined with other
+    # patterns, the group numbers shift
+    NUMBERED_BACKREF = re.compile(r'\\[1-9]')
+
+    def __init__(self, regex_list):
+        """
+        @param regex_list A list of pre-compiled regexes, in order of
+            precedence
+        """
+        self.regex_list = regex_list
+        self.matchers = self._combine(regex_list)
+
+    @classmethod
+    def _combine(cls, regex_list):
+        """
+        Join the regexes that can be joined
+        @retval A list of compiled regexes to scan with
+        """
+        flag_groups = OrderedDict()
+        for regex in regex_list:
+            flag_groups.setdefault(regex.flags, []).append(regex)
+
+        matchers = []
+        for (flags, regexes) in flag_groups.items():
+            if len(regexes) == 1 or \
+               any(cls.NUMBERED_BACKREF.search(r.pattern) for r in regexes):
+                matchers.extend(regexes)
+                continue
+
+            try:
+                matchers.append(re.compile(
+                    '|'.join(['(?:%s)' % r.pattern for r in regexes]), flags))
+            except re.error:
+                # most likely the same group name in two patterns
+                matchers.extend(regexes)
+
+        return matchers
+
+    def __call__(self, raw_data):
+        """
+        @param raw_data The raw data to run through the sieve
+        @retval A list of (start, end) tuples for each match, in order
+        """
+        if len(self.matchers) == 1:
+            return [match.span() for match in self.matchers[0].finditer(raw_data)]
+
+        return_list = []
+        next_matches = [matcher.search(raw_data) for matcher in self.matchers]
+        position = 0
+
+        while True:
+            best = None
+            for index, match in enumerate(next_matches):
+                # this one overlaps what we already have, look again past it
+                if match is not None and match.start() < position:
+                    match = self.matchers[index].search(raw_data, position)
+                    next_matches[index] = match
+                if match is not None and (best is None or match.start() < best.start()):
+                    best = match
+
+            if best is None:
+                break
+
+            return_list.append(best.span())
+            position = max(best.end(), best.start() + 1)
+
+        return return_list
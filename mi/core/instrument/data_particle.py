@@ -22,6 +22,10 @@ try:
 except ImportError:
     warn("Failed to import simplejson; particle generation will be slower.")
     import json
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 from mi.core.common import BaseEnum
 from mi.core.exceptions import SampleException, ReadOnlyException, NotImplementedException, InstrumentParameterException
@@ -48,9 +52,12 @@ class DataParticleKey(BaseEnum):
     VALUE = "value"
     BINARY = "binary"
     NEW_SEQUENCE = "new_sequence"
+    VALUE_IDS = "value_ids"
+    VALUE_EXTRAS = "value_extras"
 
 class DataParticleValue(BaseEnum):
     JSON_DATA = "JSON_Data"
+    MSGPACK_DATA = "MsgPack_Data"
     ENG = "eng"
     OK = "ok"
     CHECKSUM_FAILED = "checksum_failed"
@@ -75,25 +82,43 @@ class DataParticle(object):
     # data_particle_type()
     _data_particle_type = None
 
+    # packet format generate() produces. Drivers can set this to
+    # DataParticleValue.MSGPACK_DATA on their particle classes to publish the
+    # compact encoding, consumers read either with decode_particle().
+    _pkt_format_id = DataParticleValue.JSON_DATA
+
+    # memoized _build_parsed_values() result and the raw data it came from
+    _parsed_values = None
+    _parsed_raw_data = None
+    # memoized encodings keyed by sort order: (raw_data, contents, json)
+    _encoded = None
+
     def __init__(self, raw_data,
                  port_timestamp=None,
                  internal_timestamp=None,
                  preferred_timestamp=DataParticleKey.PORT_TIMESTAMP,
                  quality_flag=DataParticleValue.OK,
-                 new_sequence=None):
+                 new_sequence=None,
+                 driver_timestamp=None):
         """ Build a particle seeded with appropriate information
         
         @param raw_data The raw data used in the particle
+        @param driver_timestamp NTP driver timestamp; defaults to now. Callers
+            building a batch of particles can read the clock once and pass it
+            to each of them.
         """
         if new_sequence is not None and not isinstance(new_sequence, bool):
             raise TypeError("new_sequence is not a bool")
 
+        if driver_timestamp is None:
+            driver_timestamp = ntplib.system_to_ntp_time(time.time())
+
         self.contents = {
-            DataParticleKey.PKT_FORMAT_ID: DataParticleValue.JSON_DATA,
+            DataParticleKey.PKT_FORMAT_ID: self._pkt_format_id,
             DataParticleKey.PKT_VERSION: 1,
             DataParticleKey.PORT_TIMESTAMP: port_timestamp,
             DataParticleKey.INTERNAL_TIMESTAMP: internal_timestamp,
-            DataParticleKey.DRIVER_TIMESTAMP: ntplib.system_to_ntp_time(time.time()),
+            DataParticleKey.DRIVER_TIMESTAMP: driver_timestamp,
             DataParticleKey.PREFERRED_TIMESTAMP: preferred_timestamp,
             DataParticleKey.QUALITY_FLAG: quality_flag,
         }
@@ -172,6 +197,9 @@ class DataParticle(object):
         going to JSON. This is useful for the times when JSON is not needed to
         go across an interface. There are times when particles are used
         internally to a component/process/module/etc.
+
+        The parsed values are only built once per raw_data, so the values
+        list in the result is shared between calls and should not be modified.
         @retval A python dictionary with the proper timestamps and data values
         @throws InstrumentDriverException if there is a problem wtih the inputs
         """
@@ -187,7 +215,7 @@ class DataParticle(object):
             raise SampleException("Preferred timestamp not in particle!")
         
         # build response structure
-        values = self._build_parsed_values()
+        values = self._get_parsed_values()
         result = self._build_base_structure()
         result[DataParticleKey.STREAM_NAME] = self.data_particle_type()
         result[DataParticleKey.VALUES] = values
@@ -198,7 +226,8 @@ class DataParticle(object):
     def generate(self, sorted=False):
         """
         Generates a JSON_parsed packet from a sample dictionary of sensor data and
-        associates a timestamp with it
+        associates a timestamp with it. Particles with a MSGPACK_DATA format id
+        are encoded with encode_msgpack_particle() instead.
         
         @param portagent_time The timestamp from the instrument in NTP binary format 
         @param data The actual data being sent in raw byte[] format
@@ -208,9 +237,45 @@ class DataParticle(object):
            and driver timestamp
         @throws InstrumentDriverException If there is a problem with the inputs
         """
+        if self._encoded is None:
+            self._encoded = {}
+
+        cached = self._encoded.get(sorted)
+        if cached is not None and cached[0] is self.raw_data and cached[1] == self.contents:
+            return cached[2]
+
         result = self.generate_dict()
-        json_result = json.dumps(result, sort_keys=sorted)
-        return json_result
+        if result[DataParticleKey.PKT_FORMAT_ID] == DataParticleValue.MSGPACK_DATA:
+            encoded = encode_msgpack_particle(result)
+        else:
+            encoded = json.dumps(result, sort_keys=sorted)
+        self._encoded[sorted] = (self.raw_data, dict(self.contents), encoded)
+        return encoded
+
+    def generate_bytes(self, sorted=False):
+        """
+        Generate the encoded particle as a byte string, ready to be handed to
+        any number of publishers. The encoding is cached, so a particle is
+        only parsed and serialized once no matter how often it is published.
+
+        @param sorted Sort the keys of the encoded dict
+        @retval encoded particle as a str
+        """
+        encoded = self.generate(sorted=sorted)
+        if isinstance(encoded, unicode):
+            encoded = encoded.encode('utf-8')
+        return encoded
+
+    def _get_parsed_values(self):
+        """
+        Return the parsed values, only calling _build_parsed_values the first
+        time or after raw_data has been replaced.
+        @retval the values tag for this data structure
+        """
+        if self._parsed_values is None or self._parsed_raw_data is not self.raw_data:
+            self._parsed_values = self._build_parsed_values()
+            self._parsed_raw_data = self.raw_data
+        return self._parsed_values
         
     def _build_parsed_values(self):
         """
@@ -278,6 +343,72 @@ class DataParticle(object):
         
         return True
 
+def encode_msgpack_particle(particle):
+    """
+    Encode a particle dict, as returned by generate_dict, in the compact
+    MSGPACK_DATA format. The values list of {value_id, value} dicts becomes
+    a value_ids list and a parallel values list, any other keys of a value
+    (such as binary) are kept in value_extras by position.
+
+    @param particle particle dict
+    @retval msgpack encoded str
+    @throws NotImplementedException if msgpack is not installed
+    """
+    if msgpack is None:
+        raise NotImplementedException("msgpack is required for %s particles" %
+                                      DataParticleValue.MSGPACK_DATA)
+
+    result = dict(particle)
+    value_ids = []
+    values = []
+    extras = {}
+    for index, value in enumerate(particle[DataParticleKey.VALUES]):
+        value_ids.append(value[DataParticleKey.VALUE_ID])
+        values.append(value[DataParticleKey.VALUE])
+        if len(value) > 2:
+            extras[index] = dict((k, v) for (k, v) in value.iteritems()
+                                 if k != DataParticleKey.VALUE_ID and k != DataParticleKey.VALUE)
+
+    result[DataParticleKey.VALUE_IDS] = value_ids
+    result[DataParticleKey.VALUES] = values
+    if extras:
+        result[DataParticleKey.VALUE_EXTRAS] = extras
+
+    return msgpack.packb(result)
+
+def decode_particle(encoded):
+    """
+    Decode a particle produced by DataParticle.generate in any of the
+    supported packet formats back to the generate_dict structure.
+
+    @param encoded encoded particle, a dict is passed through unchanged
+    @retval particle dict
+    @throws NotImplementedException if msgpack is needed but not installed
+    """
+    if isinstance(encoded, dict):
+        return encoded
+
+    # JSON_Data particles are always an object
+    if isinstance(encoded, unicode) or encoded[:1] == '{':
+        return json.loads(encoded)
+
+    if msgpack is None:
+        raise NotImplementedException("msgpack is required for %s particles" %
+                                      DataParticleValue.MSGPACK_DATA)
+
+    result = msgpack.unpackb(encoded)
+    extras = result.pop(DataParticleKey.VALUE_EXTRAS, {})
+    values = []
+    for (index, (value_id, value)) in enumerate(zip(result.pop(DataParticleKey.VALUE_IDS),
+                                                    result[DataParticleKey.VALUES])):
+        entry = {DataParticleKey.VALUE_ID: value_id, DataParticleKey.VALUE: value}
+        if index in extras:
+            entry.update(extras[index])
+        values.append(entry)
+
+    result[DataParticleKey.VALUES] = values
+    return result
+
 class RawDataParticleKey(BaseEnum):
     PAYLOAD = "raw"
     LENGTH = "length"
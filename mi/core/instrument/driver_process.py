@@ -19,6 +19,7 @@ import os
 import sys
 import time
 import traceback
+import Queue
 from mi.core.exceptions import InstrumentException, InstrumentCommandException
 from mi.core.instrument.instrument_driver import DriverAsyncEvent
 
@@ -56,7 +57,7 @@ class DriverProcess(object):
         self.driver_class = driver_class
         self.ppid = ppid
         self.driver = None
-        self.events = []
+        self.events = Queue.Queue()
         self.messaging_started = False
         
     def construct_driver(self):
@@ -145,7 +146,8 @@ class DriverProcess(object):
             return'stop_driver_process'
         elif cmd == 'test_events':
             events = kwargs['events']
-            self.events += events
+            for evt in events:
+                self.events.put(evt)
             reply = 'test_events'
         elif cmd == 'process_echo':
             reply = 'ping from resource ppid:%s, resource:%s' % (str(self.ppid), str(self.driver))
@@ -187,9 +189,9 @@ class DriverProcess(object):
             
     def send_event(self, evt):
         """
-        Append an event to the list to be sent by the event threaed.
+        Queue an event to be sent by the event thread.
         """
-        self.events.append(evt)
+        self.events.put(evt)
             
     def run(self):
         """
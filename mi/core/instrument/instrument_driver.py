@@ -174,6 +174,7 @@ class DriverAsyncEvent(BaseEnum):
     STATE_CHANGE = 'DRIVER_ASYNC_EVENT_STATE_CHANGE'
     CONFIG_CHANGE = 'DRIVER_ASYNC_EVENT_CONFIG_CHANGE'
     SAMPLE = 'DRIVER_ASYNC_EVENT_SAMPLE'
+    SAMPLE_BATCH = 'DRIVER_ASYNC_EVENT_SAMPLE_BATCH'
     ERROR = 'DRIVER_ASYNC_EVENT_ERROR'
     RESULT = 'DRIVER_ASYNC_RESULT'
     DIRECT_ACCESS = 'DRIVER_ASYNC_EVENT_DIRECT_ACCESS'
@@ -350,7 +351,8 @@ class InstrumentDriver(object):
         """
         Construct and send an asynchronous driver event.
         @param type a DriverAsyncEvent type specifier.
-        @param val event value for sample and test result events.
+        @param val event value for sample and test result events. For
+        SAMPLE_BATCH events this is a list of samples.
         """
         event = {
             'type' : type,
@@ -370,6 +372,10 @@ class InstrumentDriver(object):
         elif type == DriverAsyncEvent.SAMPLE:
             event['value'] = val
             self._send_event(event)
+
+        elif type == DriverAsyncEvent.SAMPLE_BATCH:
+            event['value'] = val
+            self._send_event(event)
             
         elif type == DriverAsyncEvent.ERROR:
             event['value'] = val
@@ -15,16 +15,20 @@ __license__ = 'Apache 2.0'
 
 import re
 import time
-import json
 from functools import partial
 
 from mi.core.log import get_logger ; log = get_logger()
 
 from threading import Thread
+from threading import Condition
 
 from mi.core.instrument.protocol_param_dict import ParameterDictVisibility
 from mi.core.common import BaseEnum, InstErrorCode
 from mi.core.instrument.data_particle import RawDataParticle
+from mi.core.instrument.data_particle import decode_particle
+from mi.core.instrument.sample_batcher import SampleBatcher
+from mi.core.instrument.ring_buffer import RingBuffer
+from mi.core.instrument.ring_buffer import DEFAULT_MAX_SIZE
 from mi.core.instrument.instrument_driver import DriverConfigKey
 from mi.core.driver_scheduler import DriverScheduler
 from mi.core.driver_scheduler import DriverSchedulerConfigKey
@@ -48,6 +52,25 @@ DEFAULT_CMD_TIMEOUT=20
 DEFAULT_WRITE_DELAY=0
 RE_PATTERN = type(re.compile(""))
 
+# Longest time to wait between looking in the buffers for a response when no
+# new data is signaled, for drivers that fill the buffers themselves.
+BUFFER_WAIT_INTERVAL = .1
+
+# Compiled regexes matching any of a list of prompts, by prompt list.
+_prompt_matchers = {}
+
+def _prompt_matcher(prompt_list):
+    """
+    Get a compiled regex that finds any of the prompts in a list.
+    @param prompt_list The prompts to look for.
+    @retval compiled regex
+    """
+    key = tuple(prompt_list)
+    matcher = _prompt_matchers.get(key)
+    if matcher is None:
+        matcher = _prompt_matchers[key] = re.compile('|'.join([re.escape(item) for item in prompt_list]))
+    return matcher
+
 class InterfaceType(BaseEnum):
     """The methods of connecting to a device"""
     ETHERNET = 'ethernet'
@@ -99,6 +122,10 @@ class InstrumentProtocol(object):
         # are applied at the first opertunity.
         self._init_type = InitializationType.STARTUP
 
+        # Accumulates samples when batching is enabled, see
+        # _enable_sample_batching
+        self._sample_batcher = None
+
     ########################################################################
     # Common handlers
     ########################################################################
@@ -254,12 +281,65 @@ class InstrumentProtocol(object):
             parsed_sample = particle.generate()
 
             if publish and self._driver_event:
-                self._driver_event(DriverAsyncEvent.SAMPLE, parsed_sample)
+                self._publish_sample(parsed_sample)
     
-            sample = json.loads(parsed_sample)
+            sample = decode_particle(parsed_sample)
 
         return sample
 
+    def _enable_sample_batching(self, max_count=None, max_latency=None):
+        """
+        Publish samples in SAMPLE_BATCH events rather than one SAMPLE event
+        each. A batch is sent once max_count samples are waiting or
+        max_latency seconds after its first sample, whichever comes first.
+        Meant for fast instruments where the per event cost dominates.
+
+        @param max_count maximum number of samples per batch
+        @param max_latency maximum seconds a sample is held back
+        """
+        kwargs = {}
+        if max_count is not None:
+            kwargs['max_count'] = max_count
+        if max_latency is not None:
+            kwargs['max_latency'] = max_latency
+
+        self._flush_samples()
+        self._sample_batcher = SampleBatcher(self._publish_sample_batch, **kwargs)
+
+    def _disable_sample_batching(self):
+        """
+        Send any batched samples and go back to one SAMPLE event per sample.
+        """
+        self._flush_samples()
+        self._sample_batcher = None
+
+    def _flush_samples(self):
+        """
+        Send any samples waiting in the current batch.
+        """
+        if self._sample_batcher is not None:
+            self._sample_batcher.flush()
+
+    def _publish_sample(self, sample):
+        """
+        Publish an encoded sample, batching it if batching is enabled.
+        @param sample encoded data particle
+        """
+        if self._sample_batcher is not None:
+            self._sample_batcher.add(sample)
+        else:
+            self._driver_event(DriverAsyncEvent.SAMPLE, sample)
+
+    def _publish_sample_batch(self, samples):
+        """
+        SampleBatcher callback, a lone sample is still sent as a SAMPLE event.
+        @param samples list of encoded data particles
+        """
+        if len(samples) == 1:
+            self._driver_event(DriverAsyncEvent.SAMPLE, samples[0])
+        else:
+            self._driver_event(DriverAsyncEvent.SAMPLE_BATCH, samples)
+
     def get_current_state(self):
         """
         Return current state of the protocol FSM.
@@ -784,13 +864,14 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
     Base class for text-based command-response instruments.
     """
     
-    def __init__(self, prompts, newline, driver_event):
+    def __init__(self, prompts, newline, driver_event, buffer_size=DEFAULT_MAX_SIZE):
         """
         Constructor.
         @param prompts Enum class containing possible device prompts used for
         command response logic.
         @param newline The device newline.
         @driver_event The callback for asynchronous driver events.
+        @param buffer_size The most data kept in the line and prompt buffers.
         """
         
         # Construct superclass.
@@ -802,12 +883,19 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
         # Class of prompts used by device.
         self._prompts = prompts
     
-        # Line buffer for input from device.
-        self._linebuf = ''
+        # Line buffer for input from device, read and assigned as a string
+        # through _linebuf.
+        self._line_buffer = RingBuffer(buffer_size)
         
         # Short buffer to look for prompts from device in command-response
-        # mode.
-        self._promptbuf = ''
+        # mode, read and assigned as a string through _promptbuf.
+        self._prompt_buffer = RingBuffer(buffer_size)
+
+        # Signaled when data is added to the line and prompt buffers. The
+        # buffers are only read or changed while holding it, the listener
+        # thread appends to them. Its lock is reentrant so the _linebuf and
+        # _promptbuf properties can be used by code already holding it.
+        self._buffer_condition = Condition()
         
         # Lines of data awaiting further processing.
         self._datalines = []
@@ -820,6 +908,26 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
 
         self._last_data_receive_timestamp = None
 
+    @property
+    def _linebuf(self):
+        with self._buffer_condition:
+            return self._line_buffer.getvalue()
+
+    @_linebuf.setter
+    def _linebuf(self, value):
+        with self._buffer_condition:
+            self._line_buffer.set(value)
+
+    @property
+    def _promptbuf(self):
+        with self._buffer_condition:
+            return self._prompt_buffer.getvalue()
+
+    @_promptbuf.setter
+    def _promptbuf(self, value):
+        with self._buffer_condition:
+            self._prompt_buffer.set(value)
+
     def _get_prompts(self):
         """
         Return a list of prompts order from longest to shortest.  The
@@ -880,24 +988,45 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
 
         log.debug('_get_response: timeout=%s, prompt_list=%s, expected_prompt=%s, response_regex=%s, promptbuf=%s',
                   timeout, prompt_list, expected_prompt, response_regex, self._promptbuf)
-        while True:
-            if response_regex:
-                match = response_regex.search(self._linebuf)
-                if match:
-                    return match.groups()
-                else:
-                    time.sleep(.1)
-            else:
-                for item in prompt_list:
-                    index = self._promptbuf.find(item)
-                    if index >= 0:
-                        result = self._promptbuf[0:index+len(item)]
-                        return (item, result)
-                    else:
-                        time.sleep(.1)
 
-            if time.time() > starttime + timeout:
-                raise InstrumentTimeoutException("in InstrumentProtocol._get_response()")
+        if not response_regex:
+            matcher = _prompt_matcher(prompt_list)
+            # a prompt may straddle the data already searched and new data
+            overlap = max([len(item) for item in prompt_list] or [0]) - 1
+
+        # The buffer as it was last searched and the stream position it was
+        # searched up to. Only data appended since then is searched for a
+        # prompt, and the buffer is only searched again when it changes.
+        searched = None
+        searched_end = None
+
+        with self._buffer_condition:
+            while True:
+                if response_regex:
+                    if self._linebuf is not searched:
+                        searched = self._linebuf
+                        match = response_regex.search(searched)
+                        if match:
+                            return match.groups()
+                else:
+                    buf = self._prompt_buffer.getvalue()
+                    if buf is not searched:
+                        start = 0
+                        if searched is not None:
+                            start = max(0, searched_end - overlap - self._prompt_buffer.start)
+                        searched = buf
+                        searched_end = self._prompt_buffer.end
+
+                        # Prompts earlier in the list take precedence, so
+                        # once one is seen look for them in order.
+                        if matcher.search(buf, start):
+                            for item in prompt_list:
+                                index = buf.find(item)
+                                if index >= 0:
+                                    result = buf[0:index+len(item)]
+                                    return (item, result)
+
+                self._wait_for_buffer(starttime, timeout, "in InstrumentProtocol._get_response()")
 
     def _get_raw_response(self, timeout=10, expected_prompt=None):
         """
@@ -921,15 +1050,33 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
             else:
                 prompt_list = expected_prompt
 
-        while True:
-            for item in prompt_list:
-                if self._promptbuf.rstrip(strip_chars).endswith(item.rstrip(strip_chars)):
-                    return (item, self._linebuf)
-                else:
-                    time.sleep(.1)
+        searched = None
 
-            if time.time() > starttime + timeout:
-                raise InstrumentTimeoutException("in InstrumentProtocol._get_raw_response()")
+        with self._buffer_condition:
+            while True:
+                if self._promptbuf is not searched:
+                    searched = self._promptbuf
+                    stripped = searched.rstrip(strip_chars)
+                    for item in prompt_list:
+                        if stripped.endswith(item.rstrip(strip_chars)):
+                            return (item, self._linebuf)
+
+                self._wait_for_buffer(starttime, timeout, "in InstrumentProtocol._get_raw_response()")
+
+    def _wait_for_buffer(self, starttime, timeout, message):
+        """
+        Wait for data to be added to the line and prompt buffers. Must be
+        called holding the buffer condition.
+        @param starttime The time the wait for a response started.
+        @param timeout The timeout in seconds
+        @param message Message for the timeout exception
+        @throw InstrumentTimeoutException on timeout
+        """
+        remaining = starttime + timeout - time.time()
+        if remaining < 0:
+            raise InstrumentTimeoutException(message)
+
+        self._buffer_condition.wait(min(remaining, BUFFER_WAIT_INTERVAL))
 
     def _do_cmd_resp(self, cmd, *args, **kwargs):
         """
@@ -978,9 +1125,11 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
 
         prompt = self._wakeup(timeout)
         
-        # Clear line and prompt buffers for result.
-        self._linebuf = ''
-        self._promptbuf = ''
+        # Clear line and prompt buffers for result, holding the buffer
+        # condition so data being added by the listener is not half cleared.
+        with self._buffer_condition:
+            self._line_buffer.clear()
+            self._prompt_buffer.clear()
 
         # Send command.
         log.debug('_do_cmd_resp: %s, timeout=%s, write_delay=%s, expected_prompt=%s, response_regex=%s',
@@ -1036,10 +1185,11 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
         # Wakeup the device, timeout exception as needed
         prompt = self._wakeup(timeout)
 
-        # Clear line and prompt buffers for result.
-
-        self._linebuf = ''
-        self._promptbuf = ''
+        # Clear line and prompt buffers for result, holding the buffer
+        # condition so data being added by the listener is not half cleared.
+        with self._buffer_condition:
+            self._line_buffer.clear()
+            self._prompt_buffer.clear()
 
         # Send command.
         log.debug('_do_cmd_no_resp: %s, timeout=%s' % (repr(cmd_line), timeout))
@@ -1112,20 +1262,23 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
                                    port_timestamp=port_agent_packet.get_timestamp())
 
         if self._driver_event:
-            self._driver_event(DriverAsyncEvent.SAMPLE, particle.generate())
+            self._publish_sample(particle.generate())
 
     def add_to_buffer(self, data):
         '''
         Add a chunk of data to the internal data buffers
         @param data: bytes to add to the buffer
         '''
-        # Update the line and prompt buffers.
-        self._linebuf += data
-        self._promptbuf += data
-        self._last_data_timestamp = time.time()
+        # Update the line and prompt buffers and wake up anything waiting
+        # for a response.
+        with self._buffer_condition:
+            self._line_buffer.append(data)
+            self._prompt_buffer.append(data)
+            self._last_data_timestamp = time.time()
+            self._buffer_condition.notify_all()
 
-        log.debug("LINE BUF: %s", self._linebuf)
-        log.debug("PROMPT BUF: %s", self._promptbuf)
+        log.debug("Added %d bytes to line and prompt buffers, now %d and %d bytes",
+                  len(data), len(self._line_buffer), len(self._prompt_buffer))
 
     ########################################################################
     # Wakeup helpers.
@@ -1147,7 +1300,8 @@ class CommandResponseInstrumentProtocol(InstrumentProtocol):
         """
         # Clear the prompt buffer.
         log.debug("clearing promptbuf: %s", self._promptbuf)
-        self._promptbuf = ''
+        with self._buffer_condition:
+            self._prompt_buffer.clear()
         
         # Grab time for timeout.
         starttime = time.time()
@@ -1314,11 +1468,14 @@ class MenuInstrumentProtocol(CommandResponseInstrumentProtocol):
         @param driver_event The callback for asynchronous driver events.
         @param read_delay optional kwarg specifying amount of time to delay before
                attempting to read response from instrument (in _get_response).
+        @param buffer_size optional kwarg, the most data kept in the line and
+               prompt buffers.
 
         """
         
         # Construct superclass.
-        CommandResponseInstrumentProtocol.__init__(self, prompts, newline, driver_event)
+        CommandResponseInstrumentProtocol.__init__(self, prompts, newline, driver_event,
+                                                   kwargs.get('buffer_size', DEFAULT_MAX_SIZE))
         self._menu = menu
 
         # The end of line delimiter.                
@@ -12,6 +12,7 @@ __author__ = 'David Everett'
 __license__ = 'Apache 2.0'
 
 import socket
+import select
 import errno
 import threading
 import time
@@ -19,18 +20,44 @@ import datetime
 import struct
 import array
 import binascii
-import ctypes
 import subprocess
 
+import numpy as np
+
 from mi.core.log import get_logger ; log = get_logger()
 from mi.core.exceptions import InstrumentConnectionException
 
 HEADER_SIZE = 16 # BBBBHHLL = 1 + 1 + 1 + 1 + 2 + 2 + 4 + 4 = 16
 
+# B = unsigned char size 1 bytes
+# H = unsigned short size 2 bytes
+# I = unsigned int size 4 bytes
+# d = float size 8 bytes
+HEADER_STRUCT = struct.Struct('>BBBBHHII')
+# the header sent in test, with the timestamp as a double
+PACK_HEADER_STRUCT = struct.Struct('>BBBBHHd')
 
 OFFSET_P_CHECKSUM_LOW = 6
 OFFSET_P_CHECKSUM_HIGH = 7
 
+def xor_checksum(header, data, length):
+    """
+    XOR of the header bytes, except the checksum itself, and the first length
+    bytes of the data.
+    @param header packet header, any buffer of HEADER_SIZE bytes
+    @param data packet data, any buffer
+    @param length number of data bytes to include
+    @retval checksum
+    """
+    header_bytes = np.frombuffer(header, dtype=np.uint8, count=HEADER_SIZE)
+    checksum = int(np.bitwise_xor.reduce(header_bytes[:OFFSET_P_CHECKSUM_LOW])) ^ \
+        int(np.bitwise_xor.reduce(header_bytes[OFFSET_P_CHECKSUM_HIGH + 1:]))
+
+    if length > 0:
+        checksum ^= int(np.bitwise_xor.reduce(np.frombuffer(data, dtype=np.uint8, count=length)))
+
+    return checksum
+
 """
 Offsets into the unpacked header fields
 """
@@ -58,6 +85,10 @@ MIN_RETRY_WINDOW = 2 # 2 seconds
 
 MAX_SEND_ATTEMPTS = 15              # Max number of times we can get EAGAIN
 
+READ_BUFFER_SIZE = 65536    # initial size of the listener's read buffer
+MIN_READ_SIZE = 4096        # compact the read buffer when less room is left
+READ_WAIT_TIMEOUT = .1      # seconds to wait for data before checking if done
+
 
 class SocketClosed(Exception): pass
 
@@ -95,11 +126,7 @@ class PortAgentPacket():
     def unpack_header(self, header):
         self.__header = header
         #@TODO may want to switch from big endian to network order '!' instead of '>' note network order is big endian.
-        # B = unsigned char size 1 bytes
-        # H = unsigned short size 2 bytes
-        # L = unsigned long size 4 bytes
-        # d = float size8 bytes
-        variable_tuple = struct.unpack_from('>BBBBHHII', header)
+        variable_tuple = HEADER_STRUCT.unpack_from(header)
         # change offset to index.
         self.__type = variable_tuple[TYPE_INDEX]
         self.__length = int(variable_tuple[LENGTH_INDEX]) - HEADER_SIZE
@@ -132,15 +159,7 @@ class PortAgentPacket():
                               self.__length + HEADER_SIZE, 0x0000, 
                               self.__port_agent_timestamp)
 
-            # B = unsigned char size 1 bytes
-            # H = unsigned short size 2 bytes
-            # L = unsigned long size 4 bytes
-            # d = float size 8 bytes
-            format = '>BBBBHHd'
-            size = struct.calcsize(format)
-            temp_header = ctypes.create_string_buffer(size)
-            struct.pack_into(format, temp_header, 0, *variable_tuple)
-            self.__header = temp_header.raw
+            self.__header = PACK_HEADER_STRUCT.pack(*variable_tuple)
             #print "here it is: ", binascii.hexlify(self.__header)
             
             """
@@ -165,26 +184,11 @@ class PortAgentPacket():
         self.__data = data
 
     def calculate_checksum(self):
-        checksum = 0
-        for i in range(HEADER_SIZE):
-            if i < OFFSET_P_CHECKSUM_LOW or i > OFFSET_P_CHECKSUM_HIGH:
-                checksum ^= struct.unpack_from('B', str(self.__header[i]))[0]
-                
-        for i in range(self.__length):
-            checksum ^= struct.unpack_from('B', str(self.__data[i]))[0]
-            
-        return checksum
-            
+        return xor_checksum(self.__header, self.__data, self.__length)
                                 
     def verify_checksum(self):
-        checksum = 0
-        for i in range(HEADER_SIZE):
-            if i < OFFSET_P_CHECKSUM_LOW or i > OFFSET_P_CHECKSUM_HIGH:
-                checksum ^= struct.unpack_from('B', self.__header[i])[0]
-                
-        for i in range(self.__length):
-            checksum ^= struct.unpack_from('B', self.__data[i])[0]
-            
+        checksum = xor_checksum(self.__header, self.__data, self.__length)
+
         if checksum == self.__recv_checksum:
             self.__isValid = True
         else:
@@ -245,6 +249,100 @@ class PortAgentPacket():
         return self.__isValid
                     
 
+class PacketFramer(object):
+    """
+    Buffers bytes read from the port agent socket and slices complete port
+    agent packets out of them. The buffer is reused: consumed bytes are
+    dropped by moving the unconsumed tail to the front when room runs out,
+    and it only grows for packets bigger than itself.
+    """
+    def __init__(self, size=READ_BUFFER_SIZE):
+        self._buffer = bytearray(size)
+        self._start = 0     # first byte not yet framed
+        self._end = 0       # end of the bytes read
+
+    def __len__(self):
+        return self._end - self._start
+
+    def _make_room(self, needed):
+        """
+        Make sure at least needed bytes can be read after the buffered ones.
+        """
+        if len(self._buffer) - self._end >= needed:
+            return
+
+        buffered = self._end - self._start
+        if self._start:
+            self._buffer[0:buffered] = self._buffer[self._start:self._end]
+            self._start = 0
+            self._end = buffered
+
+        if len(self._buffer) - self._end < needed:
+            self._buffer.extend(bytearray(needed - (len(self._buffer) - self._end)))
+
+    def recv_from(self, sock):
+        """
+        Read whatever the socket has, up to the room in the buffer.
+        @param sock nonblocking socket to read
+        @retval number of bytes read
+        @throws SocketClosed if the port agent closed the socket
+        @throws socket.error EWOULDBLOCK if there was nothing to read
+        """
+        self._make_room(MIN_READ_SIZE)
+        bytesrx = sock.recv_into(memoryview(self._buffer)[self._end:])
+        if bytesrx <= 0:
+            raise SocketClosed()
+        self._end += bytesrx
+        return bytesrx
+
+    def feed(self, data):
+        """
+        Add bytes to the buffer as if they were read from the socket.
+        @param data bytes to add
+        """
+        self._make_room(len(data))
+        self._buffer[self._end:self._end + len(data)] = data
+        self._end += len(data)
+
+    def get_packets(self):
+        """
+        Slice all the complete packets out of the buffer.
+        @retval list of PortAgentPacket, in the order received
+        @throws InstrumentConnectionException if the next header has a length
+        shorter than the header, the header is dropped. Packets framed
+        before it are returned first.
+        """
+        packets = []
+        buf = self._buffer
+        while self._end - self._start >= HEADER_SIZE:
+            header = str(buf[self._start:self._start + HEADER_SIZE])
+            packet = PortAgentPacket()
+            packet.unpack_header(header)
+            data_size = packet.get_data_length()
+
+            if data_size < 0:
+                if packets:
+                    break
+                self._start += HEADER_SIZE
+                raise InstrumentConnectionException(
+                    'Invalid port agent packet length %d' % (data_size + HEADER_SIZE))
+
+            data_start = self._start + HEADER_SIZE
+            if self._end - data_start < data_size:
+                # wait for the rest of the packet, with room for all of it
+                self._make_room(HEADER_SIZE + data_size - (self._end - self._start))
+                break
+
+            packet.attach_data(str(buf[data_start:data_start + data_size]))
+            self._start = data_start + data_size
+            packets.append(packet)
+
+        if self._start == self._end:
+            self._start = self._end = 0
+
+        return packets
+
+
 class PortAgentClient(object):
     """
     A port agent process client class to abstract the TCP interface to the 
@@ -615,6 +713,7 @@ class Listener(threading.Thread):
         self.recovery_attempt = recovery_attempt
         self._done = False
         self.linebuf = ''
+        self.framer = PacketFramer()
         self.delim = delim
         self.heartbeat_timer = None
         self.thread_name = None
@@ -738,6 +837,18 @@ class Listener(threading.Thread):
         """
         self._done = True
 
+    def handle_packets(self, packets):
+        """
+        Handle the packets framed from one read, in order. A failure handling
+        one packet does not stop the rest from being handled.
+        @param packets list of PortAgentPacket
+        """
+        for paPacket in packets:
+            try:
+                self.handle_packet(paPacket)
+            except Exception as e:
+                self.default_callback_error(e)
+
     def handle_packet(self, paPacket):
         packet_type = paPacket.get_header_type()
         
@@ -773,10 +884,10 @@ class Listener(threading.Thread):
 
     def run(self):
         """
-        Listener thread processing loop. Block on receive from port agent.
-        Receive HEADER_SIZE bytes to receive the entire header.  From that,
-        get the length of the whole packet (including header); compute the
-        length of the remaining data and read that.  
+        Listener thread processing loop. Wait for data from the port agent
+        and read as much as is available into the framer, then handle every
+        complete packet it holds. Partial packets stay buffered until the
+        rest arrives.
         """
         self.thread_name = str(threading.current_thread().name)
         log.info('PortAgentClient listener thread: %s started.', self.thread_name)
@@ -786,58 +897,16 @@ class Listener(threading.Thread):
 
         while not self._done:
             try:
-                log.debug('RX NEW PACKET')
-                header = bytearray(HEADER_SIZE)
-                headerview = memoryview(header)
-                bytes_left = HEADER_SIZE
-                while bytes_left and not self._done:
-                    try:
-                        bytesrx = self.sock.recv_into(headerview[HEADER_SIZE - bytes_left:], bytes_left)
-                        log.debug('RX HEADER BYTES %d LEFT %d SOCK %r' % (
-                                                    bytesrx, bytes_left, self.sock,))
-                        if bytesrx <= 0:
-                            raise SocketClosed()
-                        bytes_left -= bytesrx
-                    except socket.error as e:
-                        if e.errno == errno.EWOULDBLOCK:
-                            time.sleep(.1)
-                        else:
-                            raise
-
-                """
-                Only do this if we've received the whole header, otherwise (ex. during shutdown)
-                we can have a completely invalid header, resulting in negative count exceptions.
-                """
-                if (bytes_left == 0):
-                    paPacket = PortAgentPacket()
-                    paPacket.unpack_header(str(header))
-                    data_size = paPacket.get_data_length()
-                    bytes_left = data_size
-                    data = bytearray(data_size)
-                    dataview = memoryview(data)
-                    log.debug('Expecting DATA BYTES %d' % data_size)
-                    
-                while bytes_left and not self._done:
-                    try:
-                        bytesrx = self.sock.recv_into(dataview[data_size - bytes_left:], bytes_left)
-                        log.debug('RX DATA BYTES %d LEFT %d SOCK %r' % (
-                                                    bytesrx, bytes_left, self.sock,))
-                        if bytesrx <= 0:
-                            raise SocketClosed()
-                        bytes_left -= bytesrx
-                    except socket.error as e:
-                        if e.errno == errno.EWOULDBLOCK:
-                            time.sleep(.1)
-                        else:
-                            raise
+                try:
+                    self.framer.recv_from(self.sock)
+                except socket.error as e:
+                    if e.errno == errno.EWOULDBLOCK:
+                        select.select([self.sock], [], [], READ_WAIT_TIMEOUT)
+                        continue
+                    raise
 
                 if not self._done:
-                    """
-                    Should have complete port agent packet.
-                    """
-                    paPacket.attach_data(str(data))
-                    log.debug("HANDLE PACKET")
-                    self.handle_packet(paPacket)
+                    self.handle_packets(self.framer.get_packets())
 
             except SocketClosed:
                 errorString = 'Listener thread: %s SocketClosed exception from port_agent socket' \
@@ -12,6 +12,8 @@ __author__ = 'Edward Hunter'
 __license__ = 'Apache 2.0'
 
 import re
+import sre_parse
+import sre_constants
 import ntplib
 import time
 import yaml
@@ -27,6 +29,14 @@ from mi.core.log import get_logger ; log = get_logger()
 EGG_PATH = "resource"
 DEFAULT_FILENAME = "strings.yml"
 
+# Parameter definitions are the same for every instance of a driver, so what
+# is derived from them is cached for the whole process and shared by all
+# parameter dictionaries. Compiled regexes and required literals are cached
+# by (pattern, flags), dispatch indexes by the literals of the parameters.
+_compiled_regexes = {}
+_required_literals = {}
+_indexes = {}
+
 class ParameterDictType(BaseEnum):
     BOOL = "bool"
     INT = "int"
@@ -281,9 +291,9 @@ class RegexParameter(Parameter):
 
         self.pattern = pattern
         if regex_flags == None:
-            self.regex = re.compile(pattern)
+            self.regex = compile_regex(pattern)
         else:
-            self.regex = re.compile(pattern, regex_flags)
+            self.regex = compile_regex(pattern, regex_flags)
             
         self.f_getval = f_getval
 
@@ -384,6 +394,106 @@ class FunctionParameter(Parameter):
         else:
             return False
 
+def compile_regex(pattern, flags=0):
+    """
+    Compile a parameter regex, or get it from the process wide cache. Unlike
+    the re module cache this one is never purged.
+    @param pattern The regex pattern.
+    @param flags Flags for re.compile().
+    @retval compiled regex
+    @throws TypeError if the flags are bad
+    """
+    key = (pattern, flags)
+    regex = _compiled_regexes.get(key)
+    if regex is None:
+        regex = _compiled_regexes[key] = re.compile(pattern, flags)
+    return regex
+
+def _flatten(items):
+    """
+    Flatten a parsed regex sequence, replacing groups with their contents.
+    @param items a sequence of (opcode, argument) from sre_parse
+    @retval generator of (opcode, argument)
+    """
+    for (op, av) in items:
+        if op == sre_constants.SUBPATTERN:
+            for item in _flatten(av[1]):
+                yield item
+        else:
+            yield (op, av)
+
+def required_literal(regex):
+    """
+    Find a string that every match of a compiled regex contains, the longest
+    run of literal characters the regex must match.
+    @param regex compiled regex
+    @retval the string, or None if there is none that can be found
+    """
+    key = (regex.pattern, regex.flags)
+    if key not in _required_literals:
+        _required_literals[key] = _find_required_literal(regex)
+    return _required_literals[key]
+
+def _find_required_literal(regex):
+    """
+    @see required_literal
+    """
+    if regex.flags & re.IGNORECASE:
+        return None
+
+    try:
+        items = sre_parse.parse(regex.pattern, regex.flags)
+    except (sre_constants.error, TypeError):
+        return None
+
+    longest = ''
+    run = ''
+    for (op, av) in _flatten(items):
+        if op == sre_constants.LITERAL and av < 256:
+            run += chr(av)
+        else:
+            if len(run) > len(longest):
+                longest = run
+            run = ''
+    if len(run) > len(longest):
+        longest = run
+
+    return longest or None
+
+def _make_index(param_literals):
+    """
+    Build the dispatch index of a parameter dictionary.
+    @param param_literals The literal each parameter needs, None for parameters
+    tried on every input, in dictionary order.
+    @retval tuple of (positions of the parameters tried on every input, a
+    regex finding the literals in an input, dict of each literal to the
+    positions of the parameters needing it or any literal it starts with)
+    """
+    always = []
+    literal_positions = {}
+    for (position, literal) in enumerate(param_literals):
+        if literal is None:
+            always.append(position)
+        else:
+            literal_positions.setdefault(literal, []).append(position)
+
+    # The finder looks at every position for the longest literal found
+    # there, and any literal that is a prefix of that one is there too.
+    literals = sorted(literal_positions.keys(), key=len, reverse=True)
+    dispatch = {}
+    for literal in literals:
+        positions = []
+        for prefix in literals:
+            if literal.startswith(prefix):
+                positions.extend(literal_positions[prefix])
+        dispatch[literal] = positions
+
+    finder = None
+    if literals:
+        finder = re.compile('(?=(%s))' % '|'.join([re.escape(literal) for literal in literals]))
+
+    return (always, finder, dispatch)
+
 class ProtocolParameterDict(InstrumentDict):
     """
     Protocol parameter dictionary. Manages, matches and formats device
@@ -394,6 +504,10 @@ class ProtocolParameterDict(InstrumentDict):
         Constructor.        
         """
         self._param_dict = {}
+
+        # Index routing input to the parameters that can match it, built when
+        # first needed after parameters are added.
+        self._index = None
         
     def add(self,
             name,
@@ -480,6 +594,7 @@ class ProtocolParameterDict(InstrumentDict):
                              value_description=value_description)
 
         self._param_dict[name] = val
+        self._index = None
 
     def add_parameter(self, parameter):
         """
@@ -494,6 +609,7 @@ class ProtocolParameterDict(InstrumentDict):
             raise InstrumentParameterException(
                 "Invalid Parameter added! Attempting to add: %s" % parameter)
         self._param_dict[parameter.name] = parameter
+        self._index = None
         
     def get(self, name, timestamp=None):
         """
@@ -663,6 +779,52 @@ class ProtocolParameterDict(InstrumentDict):
 
         return self._param_dict[name].description.submenu_write
 
+    def _build_index(self):
+        """
+        Index the parameters by the literal string each regex parameter
+        needs in its input. Other parameters, and regex parameters with no
+        such string, are tried on every input.
+        @retval tuple of (parameter names in dictionary order, positions of
+        the parameters tried on every input, a regex finding the literals in
+        an input, dict of each literal to the positions of the parameters
+        needing it or any literal it starts with)
+        """
+        names = self._param_dict.keys()
+        literals = []
+        for name in names:
+            val = self._param_dict[name]
+            literal = None
+            if getattr(type(val).update, 'im_func', None) is RegexParameter.update.im_func:
+                literal = required_literal(val.regex)
+            literals.append(literal)
+
+        key = tuple(literals)
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = _make_index(literals)
+        (always, finder, dispatch) = index
+
+        return (names, always, finder, dispatch)
+
+    def _candidates(self, input):
+        """
+        Find the parameters that can match an input.
+        @param input The input to be passed to the parameters' update
+        @retval list of (name, parameter) in dictionary order
+        """
+        if self._index is None or len(self._index[0]) != len(self._param_dict):
+            self._index = self._build_index()
+        (names, always, finder, dispatch) = self._index
+
+        if not isinstance(input, str) or finder is None:
+            return [(name, self._param_dict[name]) for name in names]
+
+        positions = set(always)
+        for literal in set(finder.findall(input)):
+            positions.update(dispatch[literal])
+
+        return [(names[position], self._param_dict[names[position]]) for position in sorted(positions)]
+
     # RAU Added
     def multi_match_update(self, input):
         """
@@ -673,7 +835,7 @@ class ProtocolParameterDict(InstrumentDict):
         """
         hit_count = 0
         multi_mode = False
-        for (name, val) in self._param_dict.iteritems():
+        for (name, val) in self._candidates(input):
             if multi_mode == True and val.description.multi_match == False:
                 continue
             if val.update(input):
@@ -694,7 +856,7 @@ class ProtocolParameterDict(InstrumentDict):
         @retval A dict with the names and values that were updated
         """
         result = {}
-        for (name, val) in self._param_dict.iteritems():
+        for (name, val) in self._candidates(input):
             update_result = val.update(input)
             if update_result:
                 result[name] = update_result 
@@ -722,13 +884,17 @@ class ProtocolParameterDict(InstrumentDict):
         elif(target_params and isinstance(target_params, list)):
             params = target_params
         elif(target_params == None):
-            params = self._param_dict.keys()
+            params = None
         else:
             raise InstrumentParameterException("invalid target_params, must be name or list")
 
-        for name in params:
+        if params is None:
+            candidates = self._candidates(input)
+        else:
+            candidates = [(name, self._param_dict[name]) for name in params]
+
+        for (name, val) in candidates:
             log.trace("update param dict name: %s", name)
-            val = self._param_dict[name]
             if val.update(input):
                 found = True
         return found
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.ring_buffer
+@file mi/core/instrument/ring_buffer.py
+@brief Bounded buffer of the most recent data received from an instrument.
+"""
+
+__license__ = 'Apache 2.0'
+
+from collections import deque
+
+# bytes kept by default, well over the longest command response
+DEFAULT_MAX_SIZE = 256 * 1024
+
+class RingBuffer(object):
+    """
+    Keeps the last max_size bytes appended to it. Data is held as the list
+    of appended pieces and only joined into a string when the contents are
+    asked for, so appending costs the same however much is buffered and an
+    instrument streaming data that nobody reads does not grow the buffer
+    without bound.
+
+    Positions are absolute stream positions, counted from the first byte
+    ever appended, so a reader can tell what has been appended since it
+    last looked even after old data has been dropped.
+
+    A RingBuffer is not thread safe, even getvalue changes it. Callers
+    sharing one between threads must hold a lock around every use.
+    """
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        """
+        @param max_size maximum number of bytes kept
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self._max_size = max_size
+        self._pieces = deque()
+        self._length = 0
+        # absolute stream position of the first byte kept
+        self._start = 0
+        # the contents joined into a string, None when out of date
+        self._value = ''
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def start(self):
+        """
+        Absolute stream position of the first byte in the buffer
+        """
+        return self._start
+
+    @property
+    def end(self):
+        """
+        Absolute stream position after the last byte in the buffer
+        """
+        return self._start + self._length
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        return self.getvalue()
+
+    def append(self, data):
+        """
+        Add data to the end of the buffer, dropping the oldest data if the
+        buffer is then over its maximum size.
+        @param data string of bytes
+        """
+        if not data:
+            return
+
+        self._pieces.append(data)
+        self._length += len(data)
+        self._value = None
+
+        excess = self._length - self._max_size
+        while excess > 0:
+            piece = self._pieces[0]
+            if len(piece) <= excess:
+                self._pieces.popleft()
+                dropped = len(piece)
+            else:
+                self._pieces[0] = piece[excess:]
+                dropped = excess
+            self._start += dropped
+            self._length -= dropped
+            excess -= dropped
+
+    def clear(self):
+        """
+        Drop the contents. Stream positions carry on from where they were.
+        """
+        self._pieces.clear()
+        self._start += self._length
+        self._length = 0
+        self._value = ''
+
+    def set(self, data):
+        """
+        Replace the contents. If the new contents start with the current
+        contents only the rest is appended, so stream positions of the data
+        already buffered are kept.
+        @param data string of bytes
+        """
+        value = self.getvalue()
+        if self._length and data.startswith(value):
+            self.append(data[self._length:])
+        else:
+            self.clear()
+            self.append(data)
+
+    def getvalue(self):
+        """
+        @retval the contents as a string. The same string object is returned
+        until the contents change.
+        """
+        if self._value is None:
+            self._value = ''.join(self._pieces)
+            self._pieces.clear()
+            self._pieces.append(self._value)
+        return self._value
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.sample_batcher
+@file mi/core/instrument/sample_batcher.py
+@brief Accumulate encoded samples and hand them on in batches, so fast
+instruments do not pay an event send per sample.
+"""
+
+__license__ = 'Apache 2.0'
+
+from threading import Lock
+from threading import Timer
+
+from mi.core.log import get_logger ; log = get_logger()
+
+# flush when this many samples are waiting
+DEFAULT_MAX_COUNT = 50
+# flush when the oldest waiting sample is this many seconds old
+DEFAULT_MAX_LATENCY = 0.5
+
+class SampleBatcher(object):
+    """
+    Collects samples and passes them to a callback as a list, either when
+    max_count samples are waiting or max_latency seconds after the first
+    sample of the batch arrived, whichever comes first. Batches are
+    delivered in order and never concurrently.
+
+    If the callback raises, the samples of the batch are logged as lost and
+    the exception is passed on to whoever added or flushed the last sample,
+    as it would have been without batching.
+    """
+    def __init__(self, callback, max_count=DEFAULT_MAX_COUNT, max_latency=DEFAULT_MAX_LATENCY):
+        """
+        @param callback called with a list of samples for each batch
+        @param max_count maximum number of samples per batch
+        @param max_latency maximum seconds a sample waits before it is sent
+        """
+        if max_count < 1:
+            raise ValueError("max_count must be at least 1")
+
+        self._callback = callback
+        self._max_count = max_count
+        self._max_latency = max_latency
+        self._samples = []
+        self._timer = None
+        self._lock = Lock()
+
+    def add(self, sample):
+        """
+        Add a sample to the current batch, sending the batch if it is full.
+        @param sample the encoded sample
+        """
+        with self._lock:
+            self._samples.append(sample)
+            if len(self._samples) >= self._max_count:
+                self._send()
+            elif self._timer is None:
+                self._timer = Timer(self._max_latency, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """
+        Send whatever is waiting now.
+        """
+        with self._lock:
+            self._send()
+
+    def _flush_on_timer(self):
+        """
+        Timer callback. A failed batch has already been logged by _send and
+        there is nobody to pass the exception on to.
+        """
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def __len__(self):
+        return len(self._samples)
+
+    def _send(self):
+        """
+        Hand the waiting samples to the callback. Called with the lock held.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._samples:
+            return
+
+        batch = self._samples
+        self._samples = []
+        try:
+            self._callback(batch)
+        except Exception as e:
+            log.error("Failed to send sample batch of %d: %s", len(batch), e)
+            for sample in batch:
+                log.error("Lost sample: %s", sample)
+            raise
@@ -20,6 +20,9 @@ from ooi.logging import log
 
 from mi.core.exceptions import SampleException
 from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.chunker import BufferedStringChunker
+from mi.core.instrument.chunker import ResumableSieve
+from mi.core.instrument.chunker import MultiPatternSieve
 
 @attr('UNIT', group='mi')
 class UnitTestStringChunker(MiUnitTestCase):
@@ -42,6 +45,8 @@ class UnitTestStringChunker(MiUnitTestCase):
     TIMESTAMP_1 = 3569168821.102485
     TIMESTAMP_2 = 3569168822.202485
     TIMESTAMP_3 = 3569168823.302485
+
+    chunker_class = StringChunker
     
     @staticmethod
     def sieve_function(raw_data):
@@ -61,7 +66,7 @@ class UnitTestStringChunker(MiUnitTestCase):
     
     def setUp(self):
         """ Setup a chunker for use in tests """
-        self._chunker = StringChunker(UnitTestStringChunker.sieve_function)
+        self._chunker = self.chunker_class(UnitTestStringChunker.sieve_function)
         
     def _display_chunk_list(self, data, chunk_list):
         """ Display the data as viewed through the chunk list """
@@ -308,7 +313,7 @@ class UnitTestStringChunker(MiUnitTestCase):
         def funky_sieve(data):
             return [(3,6),(0,3)]
 
-        self._chunker = StringChunker(funky_sieve)
+        self._chunker = self.chunker_class(funky_sieve)
         self._chunker.add_chunk("BarFoo", self.TIMESTAMP_1)
         (time, result) = self._chunker.get_next_data()
         self.assertEquals(result, "Bar")
@@ -327,10 +332,234 @@ class UnitTestStringChunker(MiUnitTestCase):
         def overlap_sieve(data):
             return [(0,3),(2,6)]
 
-        self._chunker = StringChunker(overlap_sieve)
+        self._chunker = self.chunker_class(overlap_sieve)
         self.assertRaises(SampleException,
                           self._chunker.add_chunk, "foobar", self.TIMESTAMP_1)
 
+@attr('UNIT', group='mi')
+class UnitTestBufferedStringChunker(UnitTestStringChunker):
+    """
+    Run the string chunker tests against the buffered chunker engine, plus
+    a few that poke at its indexing.
+    """
+    chunker_class = BufferedStringChunker
+
+    def test_generate_data_lists(self):
+        """
+        The buffered chunker sieves as it goes, check the lists directly
+        """
+        sample_string = "Foo%sBar%sBat" % (self.SAMPLE_1, self.SAMPLE_2)
+        self._chunker.add_chunk(sample_string, self.TIMESTAMP_1)
+
+        self.assertEquals(list(self._chunker.data_chunk_list),
+                          [(3, 34, self.TIMESTAMP_1),
+                           (37, 68, self.TIMESTAMP_1)])
+        # the trailing "Bat" could be the start of a sample, it is not
+        # non-data yet
+        self.assertEquals(list(self._chunker.nondata_chunk_list),
+                          [(0, 3, self.TIMESTAMP_1),
+                           (34, 37, self.TIMESTAMP_1)])
+
+    def test_clean_chunk_list(self):
+        """
+        Consuming the buffer trims the chunk lists in place
+        """
+        self._chunker.add_chunk("Foo", self.TIMESTAMP_1)
+        self._chunker.add_chunk(self.SAMPLE_1, self.TIMESTAMP_2)
+        self._chunker.add_chunk("Bar", self.TIMESTAMP_3)
+
+        self._chunker._clean_buffer(10)
+        self.assertEquals(list(self._chunker.raw_chunk_list),
+                          [(10, 34, self.TIMESTAMP_2),
+                           (34, 37, self.TIMESTAMP_3)])
+        self.assertEquals(list(self._chunker.data_chunk_list), [])
+        self.assertEquals(list(self._chunker.nondata_chunk_list),
+                          [(10, 34, self.TIMESTAMP_2),
+                           (34, 37, self.TIMESTAMP_3)])
+        self.assertEquals(self._chunker.buffer, self.SAMPLE_1[7:] + "Bar")
+
+    def test_get_next_data_with_indices_after_clean(self):
+        """
+        Indices are relative to the unconsumed part of the buffer
+        """
+        self._chunker.add_chunk("Foo%sBar%s" % (self.SAMPLE_1, self.SAMPLE_2),
+                                self.TIMESTAMP_1)
+
+        (time, result, start, end) = self._chunker.get_next_data_with_index()
+        self.assertEquals(result, self.SAMPLE_1)
+        self.assertEquals((start, end), (3, 34))
+
+        (time, result, start, end) = self._chunker.get_next_data_with_index()
+        self.assertEquals(result, self.SAMPLE_2)
+        self.assertEquals((start, end), (3, 34))
+
+    def test_drain_many(self):
+        """
+        Fill the buffer with lots of samples in small pieces, then drain it
+        and make sure everything comes out in order and the buffer gets
+        compacted along the way.
+        """
+        count = 5000
+        sample_string = "%s\r\n" % self.SAMPLE_1 * count
+        # break it up between samples, the sieve regex is greedy about the
+        # checksum length
+        for index in range(0, len(sample_string), 990):
+            self._chunker.add_chunk(sample_string[index:index+990],
+                                    self.TIMESTAMP_1)
+
+        self.assertEquals(len(self._chunker.data_chunk_list), count)
+
+        for index in range(count):
+            (time, result) = self._chunker.get_next_data()
+            self.assertEquals(result, self.SAMPLE_1)
+            self.assertEquals(time, self.TIMESTAMP_1)
+
+        self.assertLess(len(self._chunker._buffer), len(sample_string))
+        (time, result) = self._chunker.get_next_data()
+        self.assertEquals(result, None)
+        self.assertEquals(self._chunker.buffer, "\r\n")
+
+        self._chunker.clean_all_chunks()
+        self.assertEquals(len(self._chunker._buffer), 0)
+
+    def test_clean_all_chunks(self):
+        """
+        Clear everything out then keep going
+        """
+        self._chunker.add_chunk("Foo%s%s" % (self.SAMPLE_1, self.FRAGMENT_1),
+                                self.TIMESTAMP_1)
+        self._chunker.clean_all_chunks()
+        self.assertEquals(self._chunker.buffer, "")
+
+        (time, result) = self._chunker.get_next_data()
+        self.assertEquals(result, None)
+        (time, result) = self._chunker.get_next_non_data()
+        self.assertEquals(result, None)
+
+        self._chunker.add_chunk(self.SAMPLE_2, self.TIMESTAMP_2)
+        (time, result) = self._chunker.get_next_data()
+        self.assertEquals(result, self.SAMPLE_2)
+        self.assertEquals(time, self.TIMESTAMP_2)
+
+    def test_resume_point(self):
+        """
+        Check where a resumable sieve says to pick up scanning
+        """
+        sieve = ResumableSieve(self.sieve_function, max_record_length=31)
+        self.assertEquals(sieve(self.SAMPLE_1), [(0, 31)])
+        self.assertEquals(sieve.resume_point("Foo"), 0)
+        self.assertEquals(sieve.resume_point("Foo" + self.SAMPLE_1), 4)
+
+        sieve = ResumableSieve(self.sieve_function, record_terminator="\r\n")
+        self.assertEquals(sieve.resume_point(self.SAMPLE_1), 0)
+        self.assertEquals(sieve.resume_point(self.MULTI_SAMPLE_1), 33)
+
+        sieve = ResumableSieve(self.sieve_function, max_record_length=31,
+                               record_terminator="\r\n")
+        self.assertEquals(sieve.resume_point("Foo\r\n" + self.SAMPLE_1), 6)
+        self.assertEquals(sieve.resume_point("\r\n" + self.SAMPLE_1 + "Foo"), 6)
+
+    def test_resumable_sieve(self):
+        """
+        Feed a long stretch of non-data through the chunker one byte at a
+        time, a resumable sieve should only ever see a bounded tail.
+        """
+        sieved = []
+        def sieve_function(raw_data):
+            sieved.append(len(raw_data))
+            return self.sieve_function(raw_data)
+
+        self._chunker = self.chunker_class(
+            ResumableSieve(sieve_function, max_record_length=31))
+
+        for char in "Foo" * 100 + self.FRAGMENT_1:
+            self._chunker.add_chunk(char, self.TIMESTAMP_1)
+        self.assertLessEqual(max(sieved), 31)
+
+        self._chunker.add_chunk(self.FRAGMENT_2, self.TIMESTAMP_2)
+        self._chunker.add_chunk(self.SAMPLE_2, self.TIMESTAMP_3)
+
+        (time, result) = self._chunker.get_next_non_data()
+        self.assertEquals(result, "Foo" * 100)
+        self.assertEquals(time, self.TIMESTAMP_1)
+        (time, result) = self._chunker.get_next_data()
+        self.assertEquals(result, self.FRAGMENT_SAMPLE)
+        self.assertEquals(time, self.TIMESTAMP_1)
+        (time, result) = self._chunker.get_next_data()
+        self.assertEquals(result, self.SAMPLE_2)
+        self.assertEquals(time, self.TIMESTAMP_3)
+
+@attr('UNIT', group='mi')
+class UnitTestMultiPatternSieve(MiUnitTestCase):
+    """
+    Test the combined regex sieve
+    """
+    SAMPLE_MATCHER = re.compile(r'SATPAR(?P<sernum>\d{4}),(?P<timer>\d{1,7}.\d\d),(?P<counts>\d{10}),(?P<checksum>\d{1,3})')
+    STATUS_MATCHER = re.compile(r'Status:(?P<sernum>\d{4}).*?end', re.DOTALL)
+    PROMPT_MATCHER = re.compile(r'S>')
+
+    SAMPLE_1 = "SATPAR0229,10.01,2206748111,111"
+    SAMPLE_2 = "SATPAR0229,10.02,2206748222,222"
+    STATUS = "Status:0229\r\nfoo\r\nend"
+
+    def test_combine(self):
+        """
+        Patterns sharing flags get joined, unless they can't be
+        """
+        sieve = MultiPatternSieve([self.SAMPLE_MATCHER, self.PROMPT_MATCHER])
+        self.assertEquals(len(sieve.matchers), 1)
+
+        # different flags
+        sieve = MultiPatternSieve([self.SAMPLE_MATCHER, self.STATUS_MATCHER,
+                                   self.PROMPT_MATCHER])
+        self.assertEquals(len(sieve.matchers), 2)
+
+        # same group names
+        sieve = MultiPatternSieve([self.SAMPLE_MATCHER,
+                                   re.compile(r'PAR(?P<sernum>\d{4})')])
+        self.assertEquals(len(sieve.matchers), 2)
+
+        # numbered back reference
+        sieve = MultiPatternSieve([self.PROMPT_MATCHER,
+                                   re.compile(r'(\d)\1')])
+        self.assertEquals(len(sieve.matchers), 2)
+
+    def test_sieve(self):
+        """
+        Matches come back in order whatever order the patterns are in
+        """
+        raw_data = "%s\r\n%sS>%s\r\n%s" % (self.SAMPLE_1, self.STATUS,
+                                           self.SAMPLE_2, self.SAMPLE_1)
+        expected = [(0, 31), (33, 54), (54, 56), (56, 87), (89, 120)]
+
+        sieve = MultiPatternSieve([self.PROMPT_MATCHER, self.STATUS_MATCHER,
+                                   self.SAMPLE_MATCHER])
+        self.assertEquals(sieve(raw_data), expected)
+        self.assertEquals(sieve(self.SAMPLE_1[:20]), [])
+
+        regex_list = [self.SAMPLE_MATCHER, self.STATUS_MATCHER, self.PROMPT_MATCHER]
+        self.assertEquals(sorted(StringChunker.regex_sieve_function(raw_data, regex_list)),
+                          MultiPatternSieve(regex_list)(raw_data))
+
+    def test_overlap(self):
+        """
+        Overlapping matches are dropped instead of handed to the chunker
+        """
+        raw_data = "Status:0229\r\n%s\r\nend%s" % (self.SAMPLE_1, self.SAMPLE_2)
+        sieve = MultiPatternSieve([self.SAMPLE_MATCHER, self.STATUS_MATCHER])
+        self.assertEquals(sieve(raw_data), [(0, 49), (49, 80)])
+
+        # same start, the first pattern wins
+        sieve = MultiPatternSieve([re.compile(r'S>'), re.compile(r'S>>')])
+        self.assertEquals(sieve("S>>"), [(0, 2)])
+
+        chunker = StringChunker(sieve)
+        chunker.add_chunk("S>>S>", 3569168821.102485)
+        (time, result) = chunker.get_next_data()
+        self.assertEquals(result, "S>")
+        (time, result) = chunker.get_next_data()
+        self.assertEquals(result, "S>")
+
 @unittest.skip("Write this when a binary chunker is needed")
 @attr('UNIT', group='mi')
 class UnitTestBinaryChunker(MiUnitTestCase):
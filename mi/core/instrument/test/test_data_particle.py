@@ -23,6 +23,7 @@ from mi.core.log import get_logger ; log = get_logger()
 from mi.core.exceptions import SampleException, ReadOnlyException, NotImplementedException, InstrumentParameterException
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey, DataParticleValue
 from mi.core.instrument.data_particle import RawDataParticle, CommonDataParticleType
+from mi.core.instrument.data_particle import decode_particle
 from mi.core.instrument.port_agent_client import PortAgentPacket
 
 TEST_PARTICLE_VERSION = 1
@@ -212,6 +213,67 @@ class TestUnitDataParticle(MiUnitTestCase):
 
         self.assertEqual(raw_result, standard)
         
+    def test_generate_cached(self):
+        """
+        Test that the parsed values and encoding are built once and rebuilt
+        when the particle changes
+        """
+        calls = []
+        class CountingParticle(self.TestDataParticle):
+            def _build_parsed_values(self):
+                calls.append(self.raw_data)
+                return super(CountingParticle, self)._build_parsed_values()
+
+        particle = CountingParticle(self.sample_raw_data,
+                                    port_timestamp=self.sample_port_timestamp,
+                                    driver_timestamp=self.sample_driver_timestamp)
+        self.assertEqual(particle.get_value(DataParticleKey.DRIVER_TIMESTAMP),
+                         self.sample_driver_timestamp)
+
+        result = particle.generate()
+        self.assertIs(particle.generate(), result)
+        self.assertEqual(particle.generate_bytes(), result)
+        self.assertIsInstance(particle.generate_bytes(), str)
+        self.assertEqual(particle.generate_dict(), json.loads(result))
+        self.assertEqual(len(calls), 1)
+
+        # changing the header re-encodes without re-parsing
+        particle.set_internal_timestamp(self.sample_internal_timestamp)
+        result = particle.generate()
+        self.assertEqual(json.loads(result)[DataParticleKey.INTERNAL_TIMESTAMP],
+                         self.sample_internal_timestamp)
+        self.assertEqual(len(calls), 1)
+
+        # new raw data is parsed again
+        particle.raw_data = "SATPAR0229,10.02,2206748544,234"
+        particle.generate()
+        self.assertEqual(len(calls), 2)
+
+    def test_msgpack_generate(self):
+        """
+        Test the compact msgpack packet format decodes to the same particle
+        """
+        class MsgPackRawParticle(RawDataParticle):
+            _pkt_format_id = DataParticleValue.MSGPACK_DATA
+
+        particle = MsgPackRawParticle(self.port_agent_packet.get_as_dict(),
+                                      port_timestamp=self.sample_port_timestamp,
+                                      internal_timestamp=self.sample_internal_timestamp)
+        encoded = particle.generate()
+        self.assertIsInstance(encoded, str)
+
+        decoded = decode_particle(encoded)
+        self.assertEqual(decoded, particle.generate_dict())
+        self.assertEqual(decoded[DataParticleKey.PKT_FORMAT_ID], DataParticleValue.MSGPACK_DATA)
+
+        # the binary flag on the payload survives
+        self.assertTrue(decoded[DataParticleKey.VALUES][0][DataParticleKey.BINARY])
+
+        # JSON particles and dicts decode too
+        self.assertEqual(decode_particle(self.raw_test_particle.generate()),
+                         self.raw_test_particle.generate_dict())
+        self.assertIs(decode_particle(decoded), decoded)
+
     def test_timestamps(self):
         """
         Test bad timestamp configurations
@@ -14,11 +14,13 @@ import re
 import time
 import ntplib
 import datetime
+import threading
 from mock import Mock
 from nose.plugins.attrib import attr
 from mi.core.log import get_logger ; log = get_logger()
 from mi.core.instrument.instrument_fsm import ThreadSafeFSM
 from mi.core.instrument.instrument_driver import DriverParameter
+from mi.core.instrument.instrument_driver import DriverAsyncEvent
 from mi.core.instrument.instrument_protocol import InstrumentProtocol
 from mi.core.instrument.instrument_protocol import MenuInstrumentProtocol
 from mi.core.instrument.instrument_protocol import CommandResponseInstrumentProtocol
@@ -114,6 +116,30 @@ class TestUnitInstrumentProtocol(MiUnitTestCase):
         # Test the format of the result in the individual driver tests. Here,
         # just tests that the result is there.
 
+    def test_sample_batching(self):
+        """
+        Verify samples are published one at a time by default and in
+        SAMPLE_BATCH events once batching is enabled.
+        """
+        events = []
+        def callback(event, value=None):
+            events.append((event, value))
+
+        protocol = InstrumentProtocol(callback)
+        protocol._publish_sample('one')
+        self.assertEqual(events, [(DriverAsyncEvent.SAMPLE, 'one')])
+
+        events[:] = []
+        protocol._enable_sample_batching(max_count=2, max_latency=60)
+        for sample in ['a', 'b', 'c']:
+            protocol._publish_sample(sample)
+        self.assertEqual(events, [(DriverAsyncEvent.SAMPLE_BATCH, ['a', 'b'])])
+
+        # a lone sample goes out as a plain sample
+        protocol._disable_sample_batching()
+        self.assertEqual(events, [(DriverAsyncEvent.SAMPLE_BATCH, ['a', 'b']),
+                                  (DriverAsyncEvent.SAMPLE, 'c')])
+
     def test_get_param_list(self):
         """
         verify get_param_list returns correct parameter lists.
@@ -571,6 +597,99 @@ class TestUnitCommandInstrumentProtocol(MiUnitTestCase):
                           self.protocol._do_cmd_resp,
                           self.TestEvent.TEST, expected_prompt=">", response_regex=regex1)
 
+    def test_get_response_wait(self):
+        """
+        Test waiting for a response that arrives after the wait has started,
+        in pieces.
+        """
+        self.protocol._get_prompts = lambda: ["MAIN -->", "-->"]
+
+        def respond(*pieces):
+            for piece in pieces:
+                time.sleep(.05)
+                self.protocol.add_to_buffer(piece)
+
+        # the prompt is split between data added at different times
+        thread = threading.Thread(target=respond, args=("response MA", "IN -", "->"))
+        thread.start()
+        starttime = time.time()
+        result = self.protocol._get_response(timeout=5)
+        thread.join()
+        self.assertEqual(result, ("MAIN -->", "response MAIN -->"))
+        self.assertLess(time.time() - starttime, 1)
+
+        # earlier prompts in the list are matched first
+        self.protocol._promptbuf = ''
+        thread = threading.Thread(target=respond, args=("a --> b MAIN -->",))
+        thread.start()
+        result = self.protocol._get_response(timeout=5)
+        thread.join()
+        self.assertEqual(result, ("MAIN -->", "a --> b MAIN -->"))
+
+        # buffer cleared while waiting
+        self.protocol._promptbuf = 'MAIN -'
+        thread = threading.Thread(target=respond, args=("", "->"))
+        thread.start()
+        self.protocol._promptbuf = ''
+        self.assertRaises(InstrumentTimeoutException,
+                          self.protocol._get_response, timeout=.5, expected_prompt="MAIN -->")
+        thread.join()
+
+        # raw responses
+        self.protocol._linebuf = ''
+        self.protocol._promptbuf = ''
+        thread = threading.Thread(target=respond, args=("line\r\n", "--> "))
+        thread.start()
+        result = self.protocol._get_raw_response(timeout=5)
+        thread.join()
+        self.assertEqual(result, ("-->", "line\r\n--> "))
+
+    def test_clear_waits_for_buffer(self):
+        """
+        Test a command does not clear the buffers while data is being added
+        to them.
+        """
+        self.protocol._promptbuf = 'old data'
+        self.protocol._buffer_condition.acquire()
+        try:
+            thread = threading.Thread(target=self.protocol._do_cmd_no_resp, args=(self.TestEvent.TEST,))
+            thread.start()
+            time.sleep(.2)
+            self.assertTrue(thread.is_alive())
+            self.assertEqual(self.protocol._prompt_buffer.getvalue(), 'old data')
+        finally:
+            self.protocol._buffer_condition.release()
+        thread.join()
+        self.assertEqual(self.protocol._promptbuf, "cmd...do it! >->")
+
+    def test_buffers_shared_with_listener(self):
+        """
+        Test the buffers stay consistent when they are set and read while
+        the listener thread adds data to them.
+        """
+        protocol = CommandResponseInstrumentProtocol(self.prompts, self.newline,
+                                                     self.event_callback, buffer_size=64)
+        errors = []
+
+        def listen():
+            try:
+                for i in xrange(20000):
+                    protocol.add_to_buffer("data %d\n" % i)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=listen)
+        thread.start()
+        while thread.is_alive():
+            protocol._linebuf = ''
+            protocol._promptbuf = protocol._promptbuf + 'x'
+        thread.join()
+
+        self.assertEqual(errors, [])
+        for buf in (protocol._line_buffer, protocol._prompt_buffer):
+            self.assertEqual(len(buf), len(buf.getvalue()))
+            self.assertLessEqual(len(buf), 64)
+
 
 @attr('UNIT', group='mi')
 class TestUnitMenuInstrumentProtocol(MiUnitTestCase):
@@ -39,6 +39,7 @@ from mi.idk.unit_test import InstrumentDriverUnitTestCase
 from mi.idk.unit_test import InstrumentDriverIntegrationTestCase
 
 from mi.core.instrument.port_agent_client import PortAgentClient, PortAgentPacket, Listener
+from mi.core.instrument.port_agent_client import PacketFramer
 from mi.core.instrument.port_agent_client import HEADER_SIZE
 from mi.core.instrument.instrument_driver import DriverConnectionState
 from mi.core.instrument.instrument_driver import DriverProtocolState
@@ -420,6 +421,45 @@ class PAClientTestPortAgentPacket(MiUnitTest):
         #self.assertEqual(got_timestamp, 1105890970.110589)
         self.assertEqual(self.pap.get_header_recv_checksum(), 3729) 
 
+@attr('UNIT', group='mi')
+class PAClientTestPacketFramer(MiUnitTest):
+
+    @staticmethod
+    def make_packet(data, packet_type=PortAgentPacket.DATA_FROM_INSTRUMENT):
+        return struct.pack('>BBBBHHII', 0xa3, 0x9d, 0x7a, packet_type,
+                           len(data) + HEADER_SIZE, 0, 1, 2) + data
+
+    def test_framing(self):
+        """
+        Complete packets are framed however the bytes arrive, partial packets
+        wait for the rest.
+        """
+        payloads = ['first', 'second packet', '', 'x' * 5000, 'last']
+        stream = ''.join(self.make_packet(data) for data in payloads)
+
+        for read_size in (1, 7, 16, 100, len(stream)):
+            framer = PacketFramer(size=64)
+            received = []
+            for i in range(0, len(stream), read_size):
+                framer.feed(stream[i:i + read_size])
+                received.extend(packet.get_data() for packet in framer.get_packets())
+
+            self.assertEqual(received, payloads)
+            self.assertEqual(len(framer), 0)
+
+    def test_bad_length(self):
+        """
+        A header with a length shorter than the header is dropped after the
+        packets before it are returned.
+        """
+        framer = PacketFramer()
+        bad_header = struct.pack('>BBBBHHII', 0xa3, 0x9d, 0x7a, 1, 3, 0, 1, 2)
+        framer.feed(self.make_packet('good') + bad_header + self.make_packet('next'))
+
+        self.assertEqual([p.get_data() for p in framer.get_packets()], ['good'])
+        self.assertRaises(InstrumentConnectionException, framer.get_packets)
+        self.assertEqual([p.get_data() for p in framer.get_packets()], ['next'])
+
 @attr('INT', group='mi')
 class PAClientIntTestCase(InstrumentDriverTestCase):
     def initialize(cls, *args, **kwargs):
@@ -23,6 +23,7 @@ from mi.core.instrument.protocol_param_dict import ParameterDictVisibility
 from mi.core.instrument.protocol_param_dict import ParameterDictType
 from mi.core.instrument.protocol_param_dict import ParameterDictKey
 from mi.core.instrument.protocol_param_dict import Parameter, FunctionParameter, RegexParameter
+from mi.core.instrument.protocol_param_dict import required_literal
 
 @attr('UNIT', group='mi')
 class TestUnitProtocolParameterDict(TestUnitStringsDict):
@@ -321,6 +322,83 @@ bar=200, baz=300
         with self.assertRaises(InstrumentParameterException):
             self.param_dict.update(sample_input, {'bad': "key_does_not_exist"})
 
+    def test_required_literal(self):
+        """
+        Test finding the literal string a parameter regex needs
+        """
+        self.assertEqual(required_literal(re.compile(r' +PA1 = (-?\d.\d+e[-+]\d\d)')), 'PA1 = ')
+        self.assertEqual(required_literal(re.compile(r'(do not )?store time with each sample')),
+                         'store time with each sample')
+        self.assertEqual(required_literal(re.compile(r'rtc:( +(\d+))')), 'rtc:')
+        self.assertEqual(required_literal(re.compile(r'(?:sample) (interval) = (\d+)')), 'sample interval = ')
+        self.assertEqual(required_literal(re.compile(r'.*foo=(\d+).*', re.DOTALL)), 'foo=')
+        self.assertEqual(required_literal(re.compile(r'ab|cd')), None)
+        self.assertEqual(required_literal(re.compile(r'\d+')), None)
+        self.assertEqual(required_literal(re.compile(r'foo=(\d+)', re.IGNORECASE)), None)
+        self.assertEqual(required_literal(re.compile(r'(?i)foo=(\d+)')), None)
+
+    def test_update_routing(self):
+        """
+        Parameters whose regex needs a string the input does not have are
+        skipped, others are always tried, and parameters added later are
+        included.
+        """
+        self.param_dict.add("foobar", r'foobar=(\d+)',
+                            lambda match : int(match.group(1)),
+                            lambda x : str(x))
+        self.param_dict.add("nocase", r'NOCASE=(\d+)',
+                            lambda match : int(match.group(1)),
+                            lambda x : str(x),
+                            regex_flags=re.IGNORECASE)
+
+        self.assertTrue(self.param_dict.update("foobar=5, bar=6"))
+        self.assertEqual(self.param_dict.get("foobar"), 5)
+        self.assertEqual(self.param_dict.get("bar"), 6)
+        self.assertNotEqual(self.param_dict.get("foo"), 5)
+
+        # a literal that is a prefix of another found at the same place
+        self.param_dict.add("foob", r'foob(\d+)',
+                            lambda match : int(match.group(1)),
+                            lambda x : str(x))
+        self.assertEqual(self.param_dict.update_many("foob1 foobar=7 nocase=8 foo=9"),
+                         {"foob": True, "foobar": True, "bar": True, "nocase": True, "foo": True})
+        self.assertEqual(self.param_dict.get("foob"), 1)
+        self.assertEqual(self.param_dict.get("foobar"), 7)
+        self.assertEqual(self.param_dict.get("bar"), 7)
+        self.assertEqual(self.param_dict.get("nocase"), 8)
+        self.assertEqual(self.param_dict.get("foo"), 9)
+
+        self.assertFalse(self.param_dict.update("nothing here"))
+        self.assertEqual(self.param_dict.multi_match_update("foob10"), 1)
+        self.assertEqual(self.param_dict.get("foob"), 10)
+
+    def test_shared_definitions(self):
+        """
+        Dictionaries built with the same parameters share compiled regexes
+        and dispatch indexes
+        """
+        def build():
+            param_dict = ProtocolParameterDict()
+            param_dict.add("foo", r'foo=(\d+)',
+                           lambda match : int(match.group(1)),
+                           lambda x : str(x))
+            param_dict.add("bar", r'bar=(\d+)',
+                           lambda match : int(match.group(1)),
+                           lambda x : str(x),
+                           regex_flags=re.DOTALL)
+            return param_dict
+
+        dict1 = build()
+        dict2 = build()
+        self.assertIs(dict1._param_dict["foo"].regex, dict2._param_dict["foo"].regex)
+        self.assertIs(dict1._param_dict["bar"].regex, dict2._param_dict["bar"].regex)
+
+        dict1.update("foo=1")
+        dict2.update("foo=2")
+        self.assertIs(dict1._index[2], dict2._index[2])
+        self.assertEqual(dict1.get("foo"), 1)
+        self.assertEqual(dict2.get("foo"), 2)
+
     def test_visibility_list(self):
         lst = self.param_dict.get_visibility_list(ParameterDictVisibility.READ_WRITE)
         lst.sort()
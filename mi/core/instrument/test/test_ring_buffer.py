@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_ring_buffer
+@file mi/core/instrument/test/test_ring_buffer.py
+@brief Test cases for the bounded instrument data buffer
+"""
+
+__license__ = 'Apache 2.0'
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTestCase
+
+from mi.core.instrument.ring_buffer import RingBuffer
+from mi.core.instrument.instrument_protocol import CommandResponseInstrumentProtocol
+
+@attr('UNIT', group='mi')
+class UnitTestRingBuffer(MiUnitTestCase):
+    """
+    Test the RingBuffer
+    """
+    def test_append(self):
+        buf = RingBuffer(10)
+        self.assertEqual(buf.getvalue(), '')
+
+        buf.append('abc')
+        buf.append('')
+        buf.append('def')
+        self.assertEqual(buf.getvalue(), 'abcdef')
+        self.assertEqual(len(buf), 6)
+        self.assertEqual((buf.start, buf.end), (0, 6))
+
+        # unchanged contents are the same string
+        self.assertIs(buf.getvalue(), buf.getvalue())
+
+    def test_bounded(self):
+        """
+        The oldest data is dropped, whole pieces and part of one
+        """
+        buf = RingBuffer(10)
+        buf.append('0123')
+        buf.append('4567')
+        buf.append('89ab')
+        self.assertEqual(buf.getvalue(), '23456789ab')
+        self.assertEqual((buf.start, buf.end), (2, 12))
+
+        buf.append('cdefghijklmn')
+        self.assertEqual(buf.getvalue(), 'efghijklmn')
+        self.assertEqual((buf.start, buf.end), (14, 24))
+
+        buf = RingBuffer(10)
+        stream = ''
+        for i in range(1000):
+            data = str(i) * (i % 7)
+            stream += data
+            buf.append(data)
+            self.assertEqual(buf.getvalue(), stream[-10:])
+            self.assertEqual(buf.end, len(stream))
+
+    def test_clear_and_set(self):
+        buf = RingBuffer(10)
+        buf.append('abc')
+        buf.clear()
+        self.assertEqual(buf.getvalue(), '')
+        self.assertEqual((buf.start, buf.end), (3, 3))
+
+        # extending the contents keeps the stream positions
+        buf.set('de')
+        buf.set('defg')
+        self.assertEqual(buf.getvalue(), 'defg')
+        self.assertEqual((buf.start, buf.end), (3, 7))
+
+        # anything else replaces them
+        buf.set('xyz')
+        self.assertEqual(buf.getvalue(), 'xyz')
+        self.assertEqual((buf.start, buf.end), (7, 10))
+
+        buf.set('')
+        self.assertEqual(buf.getvalue(), '')
+        self.assertEqual((buf.start, buf.end), (10, 10))
+
+    def test_protocol_buffers(self):
+        """
+        The protocol line and prompt buffers read and assign as strings
+        """
+        protocol = CommandResponseInstrumentProtocol(['>'], '\r\n', None, buffer_size=8)
+        protocol.add_to_buffer('abc')
+        self.assertEqual(protocol._linebuf, 'abc')
+        self.assertEqual(protocol._promptbuf, 'abc')
+
+        protocol._linebuf += 'def'
+        protocol._promptbuf = ''
+        self.assertEqual(protocol._linebuf, 'abcdef')
+        self.assertEqual(protocol._promptbuf, '')
+
+        protocol.add_to_buffer('ghi>')
+        self.assertEqual(protocol._linebuf, 'cdefghi>')
+        self.assertEqual(protocol._promptbuf, 'ghi>')
+        self.assertEqual(protocol._get_response(timeout=1), ('>', 'ghi>'))
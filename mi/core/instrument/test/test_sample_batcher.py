@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_sample_batcher
+@file mi/core/instrument/test/test_sample_batcher.py
+@brief Test cases for the sample batcher
+"""
+
+__license__ = 'Apache 2.0'
+
+import time
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTestCase
+
+from mi.core.instrument.sample_batcher import SampleBatcher
+
+@attr('UNIT', group='mi')
+class UnitTestSampleBatcher(MiUnitTestCase):
+    """
+    Test the SampleBatcher
+    """
+    def setUp(self):
+        self.batches = []
+
+    def _callback(self, batch):
+        self.batches.append(batch)
+
+    def test_max_count(self):
+        """
+        A batch is sent as soon as it is full
+        """
+        batcher = SampleBatcher(self._callback, max_count=3, max_latency=60)
+        for i in range(7):
+            batcher.add(i)
+
+        self.assertEqual(self.batches, [[0, 1, 2], [3, 4, 5]])
+        self.assertEqual(len(batcher), 1)
+
+        batcher.flush()
+        self.assertEqual(self.batches, [[0, 1, 2], [3, 4, 5], [6]])
+
+        # nothing waiting, nothing sent
+        batcher.flush()
+        self.assertEqual(len(self.batches), 3)
+
+    def test_max_latency(self):
+        """
+        A partial batch is sent once its first sample is max_latency old
+        """
+        batcher = SampleBatcher(self._callback, max_count=100, max_latency=0.1)
+        batcher.add('a')
+        batcher.add('b')
+        self.assertEqual(self.batches, [])
+
+        for i in range(50):
+            if self.batches:
+                break
+            time.sleep(0.05)
+
+        self.assertEqual(self.batches, [['a', 'b']])
+        self.assertEqual(len(batcher), 0)
+
+    def test_bad_count(self):
+        """
+        max_count must allow at least one sample
+        """
+        with self.assertRaises(ValueError):
+            SampleBatcher(self._callback, max_count=0)
+
+    def test_callback_error(self):
+        """
+        A failed batch is not kept and the error reaches the caller, the
+        next batch is sent as usual
+        """
+        def callback(batch):
+            if 'bad' in batch:
+                raise ValueError('bad batch')
+            self.batches.append(batch)
+
+        batcher = SampleBatcher(callback, max_count=2, max_latency=60)
+        batcher.add('bad')
+        with self.assertRaises(ValueError):
+            batcher.add('x')
+        self.assertEqual(len(batcher), 0)
+
+        batcher.add('a')
+        batcher.add('b')
+        self.assertEqual(self.batches, [['a', 'b']])
+
+        batcher.add('bad')
+        with self.assertRaises(ValueError):
+            batcher.flush()
+        self.assertEqual(len(batcher), 0)
+
+    def test_callback_error_on_timer(self):
+        """
+        A batch failing when sent by the timer does not stop later batches
+        """
+        def callback(batch):
+            if 'bad' in batch:
+                raise ValueError('bad batch')
+            self.batches.append(batch)
+
+        batcher = SampleBatcher(callback, max_count=100, max_latency=0.05)
+        batcher.add('bad')
+        for i in range(50):
+            if not len(batcher):
+                break
+            time.sleep(0.02)
+        self.assertEqual(len(batcher), 0)
+
+        batcher.add('a')
+        for i in range(50):
+            if self.batches:
+                break
+            time.sleep(0.02)
+        self.assertEqual(self.batches, [['a']])
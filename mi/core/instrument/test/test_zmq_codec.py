@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_zmq_codec
+@file mi/core/instrument/test/test_zmq_codec.py
+@brief Test code for the ZMQ driver messaging codecs
+"""
+
+__license__ = 'Apache 2.0'
+
+import zmq
+from nose.plugins.attrib import attr
+
+from mi.core.unit_test import MiUnitTestCase
+from mi.core.exceptions import ConfigurationException
+from mi.core.instrument import zmq_codec
+from mi.core.instrument.zmq_codec import CodecName
+
+SAMPLE_EVENT = {'type': 'DRIVER_ASYNC_EVENT_SAMPLE',
+                'value': '{"stream_name": "raw", "values": []}',
+                'time': 1234.5}
+
+@attr('UNIT', group='mi')
+class TestZmqCodec(MiUnitTestCase):
+
+    def setUp(self):
+        self.context = zmq.Context()
+        self.sender = self.context.socket(zmq.PAIR)
+        self.sender.bind('inproc://test_zmq_codec')
+        self.receiver = self.context.socket(zmq.PAIR)
+        self.receiver.connect('inproc://test_zmq_codec')
+
+    def tearDown(self):
+        self.sender.close()
+        self.receiver.close()
+        self.context.term()
+
+    def round_trip(self, obj, codec_name):
+        zmq_codec.send(self.sender, obj, zmq_codec.get_codec(codec_name))
+        return zmq_codec.recv(self.receiver)
+
+    def test_pickle(self):
+        """
+        The pickle codec is the send_pyobj format
+        """
+        command = {'cmd': 'execute_resource', 'args': ('arg',), 'kwargs': {}}
+        self.assertEqual(self.round_trip(command, CodecName.PICKLE), command)
+
+        self.sender.send_pyobj(command)
+        self.assertEqual(zmq_codec.recv(self.receiver), command)
+
+        zmq_codec.send(self.sender, command)
+        self.assertEqual(self.receiver.recv_pyobj(), command)
+
+    def test_sample_passthrough(self):
+        """
+        Sample values are sent as they are, in a frame of their own
+        """
+        for codec_name in (CodecName.MSGPACK, CodecName.JSON):
+            frames = zmq_codec.get_codec(codec_name).encode(SAMPLE_EVENT)
+            self.assertEqual(frames[0], codec_name)
+            self.assertEqual(frames[2], SAMPLE_EVENT['value'])
+
+            evt = self.round_trip(SAMPLE_EVENT, codec_name)
+            self.assertEqual(evt, SAMPLE_EVENT)
+            self.assertTrue(isinstance(evt['value'], str))
+
+    def test_msgpack(self):
+        """
+        Objects msgpack can not encode are pickled
+        """
+        reply = {'result': set(['a', 'b']), 'state': 'COMMAND'}
+        self.assertEqual(self.round_trip(reply, CodecName.MSGPACK), reply)
+
+        self.assertEqual(self.round_trip(('a', 1), CodecName.MSGPACK), ['a', 1])
+
+    def test_json(self):
+        """
+        Messages JSON can not encode fall back to pickle
+        """
+        self.assertEqual(self.round_trip({'cmd': 'get', 'args': [1.5]}, CodecName.JSON),
+                         {'cmd': 'get', 'args': [1.5]})
+
+        reply = ('a', set(['b']))
+        self.assertEqual(len(zmq_codec.get_codec(CodecName.JSON).encode(reply)), 1)
+        self.assertEqual(self.round_trip(reply, CodecName.JSON), reply)
+
+    def test_unknown_codec(self):
+        self.assertRaises(ConfigurationException, zmq_codec.get_codec, 'xml')
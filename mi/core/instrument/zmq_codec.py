@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.zmq_codec
+@file mi/core/instrument/zmq_codec.py
+@brief Wire codecs for the ZMQ driver process command and event sockets.
+
+The pickle codec sends one frame holding the pickled message, the same as
+send_pyobj, so it talks to peers that still use send_pyobj/recv_pyobj. The
+other codecs send multipart messages: the codec name, the encoded message
+and, for events whose value is a string, the value as its own frame. Sample
+values are already encoded by DataParticle.generate, so they are passed
+through as they are instead of being encoded again. Every message says how
+it is encoded, so either end can read any codec and only the sender's
+choice matters.
+"""
+
+__license__ = 'Apache 2.0'
+
+import cPickle as pickle
+from warnings import warn
+try:
+    import simplejson as json
+except ImportError:
+    warn("Failed to import simplejson; JSON driver messaging will be slower.")
+    import json
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from mi.core.common import BaseEnum
+from mi.core.exceptions import ConfigurationException
+
+# msgpack extension type holding a pickled object msgpack can not encode
+PICKLE_EXT_TYPE = 1
+
+class CodecName(BaseEnum):
+    PICKLE = 'pickle'
+    MSGPACK = 'msgpack'
+    JSON = 'json'
+
+class PickleCodec(object):
+    """
+    Pickle in a single frame, the send_pyobj format.
+    """
+    name = CodecName.PICKLE
+
+    def encode(self, obj):
+        """
+        @param obj message to encode
+        @retval list of frames
+        """
+        return [pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)]
+
+    def decode(self, frames):
+        """
+        @param frames message frames, without the codec name
+        @retval the message
+        """
+        return pickle.loads(frames[0])
+
+class PassthroughCodec(object):
+    """
+    Base class for the multipart codecs. Messages that are dicts with a string
+    'value' have the value sent in a frame of its own, untouched.
+    """
+    name = None
+
+    def dumps(self, obj):
+        raise NotImplementedError()
+
+    def loads(self, data):
+        raise NotImplementedError()
+
+    def encode(self, obj):
+        if isinstance(obj, dict) and isinstance(obj.get('value'), str):
+            header = dict(obj)
+            value = header.pop('value')
+            return [self.name, self.dumps(header), value]
+
+        return [self.name, self.dumps(obj)]
+
+    def decode(self, frames):
+        obj = self.loads(frames[0])
+        if len(frames) > 1:
+            obj['value'] = frames[1]
+        return obj
+
+class MsgpackCodec(PassthroughCodec):
+    """
+    msgpack, with objects msgpack can not encode, such as exceptions, pickled
+    in an extension type. Tuples are received as lists.
+    """
+    name = CodecName.MSGPACK
+
+    def __init__(self):
+        if msgpack is None:
+            raise ConfigurationException("msgpack codec requested but msgpack is not installed")
+
+    @staticmethod
+    def _default(obj):
+        return msgpack.ExtType(PICKLE_EXT_TYPE, pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _ext_hook(code, data):
+        if code == PICKLE_EXT_TYPE:
+            return pickle.loads(data)
+        return msgpack.ExtType(code, data)
+
+    def dumps(self, obj):
+        return msgpack.packb(obj, default=self._default, use_bin_type=False)
+
+    def loads(self, data):
+        return msgpack.unpackb(data, ext_hook=self._ext_hook)
+
+class JsonCodec(PassthroughCodec):
+    """
+    JSON. Tuples are received as lists and strings as unicode. Messages JSON
+    can not encode are sent pickled instead.
+    """
+    name = CodecName.JSON
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def encode(self, obj):
+        try:
+            return super(JsonCodec, self).encode(obj)
+        except (TypeError, ValueError):
+            return _PICKLE_CODEC.encode(obj)
+
+_CODEC_CLASSES = {
+    CodecName.PICKLE: PickleCodec,
+    CodecName.MSGPACK: MsgpackCodec,
+    CodecName.JSON: JsonCodec,
+}
+
+# codecs are stateless, one of each is shared
+_codecs = {}
+
+_PICKLE_CODEC = PickleCodec()
+
+def get_codec(name):
+    """
+    @param name one of CodecName
+    @retval the codec
+    @throws ConfigurationException if the codec is unknown or not available
+    """
+    codec = _codecs.get(name)
+    if codec is None:
+        if name not in _CODEC_CLASSES:
+            raise ConfigurationException("unknown driver messaging codec: %s" % name)
+        codec = _codecs[name] = _CODEC_CLASSES[name]()
+    return codec
+
+def send(sock, obj, codec=_PICKLE_CODEC, flags=0):
+    """
+    Send a message on a ZMQ socket.
+    @param sock the socket
+    @param obj the message
+    @param codec the codec to encode the message with
+    @param flags ZMQ send flags
+    """
+    sock.send_multipart(codec.encode(obj), flags=flags)
+
+def recv(sock, flags=0):
+    """
+    Receive a message sent with any codec from a ZMQ socket.
+    @param sock the socket
+    @param flags ZMQ receive flags
+    @retval the message
+    """
+    frames = sock.recv_multipart(flags=flags)
+    if len(frames) == 1:
+        return _PICKLE_CODEC.decode(frames)
+    return get_codec(frames[0]).decode(frames[1:])
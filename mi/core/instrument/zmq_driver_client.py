@@ -27,8 +27,27 @@ import time
 import zmq
 
 from mi.core.instrument.driver_client import DriverClient
+from mi.core.instrument.instrument_driver import DriverAsyncEvent
+from mi.core.instrument import zmq_codec
+from mi.core.instrument.zmq_codec import CodecName
 from mi.core.log import get_logger ; log = get_logger()
 
+# The client runs in gevent patched processes, where blocking in zmq would
+# block every greenlet, so sockets are read nonblocking with a cooperative
+# sleep between tries. The sleep starts short and doubles up to the maximum
+# while nothing arrives, so replies and bursts of events are picked up
+# within milliseconds without spinning while idle.
+MIN_RETRY_DELAY = .001
+MAX_RETRY_DELAY = .05
+
+
+def _next_retry_delay(delay):
+    """
+    @param delay the last retry delay
+    @retval the delay before the next try
+    """
+    return min(delay * 2, MAX_RETRY_DELAY)
+
  
 class ZmqDriverClient(DriverClient):
     """
@@ -36,12 +55,18 @@ class ZmqDriverClient(DriverClient):
     thread for catching asynchronous driver events.
     """
     
-    def __init__(self, host, cmd_port, event_port):
+    def __init__(self, host, cmd_port, event_port, expand_sample_batches=True,
+                 codec=CodecName.PICKLE):
         """
         Initialize members.
         @param host Host string address of the driver process.
         @param cmd_port Port number for the driver process command port.
         @param event_port Port number for the driver process event port.
+        @param expand_sample_batches If True SAMPLE_BATCH events are handed
+        to the event callback as individual SAMPLE events.
+        @param codec The CodecName commands are sent with, normally the one
+        the driver process was launched with. Replies and events are read
+        whatever codec they were sent with.
         """
         DriverClient.__init__(self)
         self.host = host
@@ -53,6 +78,8 @@ class ZmqDriverClient(DriverClient):
         self.zmq_cmd_socket = None
         self.event_thread = None
         self.stop_event_thread = True
+        self.expand_sample_batches = expand_sample_batches
+        self.codec = zmq_codec.get_codec(codec)
         
     def start_messaging(self, evt_callback=None):
         """
@@ -83,14 +110,24 @@ class ZmqDriverClient(DriverClient):
 
             driver_client.stop_event_thread = False
             #last_time = time.time()
+            delay = MIN_RETRY_DELAY
             while not driver_client.stop_event_thread:
                 try:
-                    evt = sock.recv_pyobj(flags=zmq.NOBLOCK)
+                    evt = zmq_codec.recv(sock, flags=zmq.NOBLOCK)
+                    delay = MIN_RETRY_DELAY
                     log.debug('got event: %s' % str(evt))
                     if driver_client.evt_callback:
-                        driver_client.evt_callback(evt)
+                        if driver_client.expand_sample_batches and isinstance(evt, dict) and \
+                           evt.get('type') == DriverAsyncEvent.SAMPLE_BATCH:
+                            for sample in evt['value']:
+                                driver_client.evt_callback({'type': DriverAsyncEvent.SAMPLE,
+                                                            'value': sample,
+                                                            'time': evt['time']})
+                        else:
+                            driver_client.evt_callback(evt)
                 except zmq.ZMQError:
-                    time.sleep(.5)
+                    time.sleep(delay)
+                    delay = _next_retry_delay(delay)
                 #cur_time = time.time()
                 #if cur_time - last_time > 5:
                 #    log.info('event thread listening')
@@ -136,7 +173,7 @@ class ZmqDriverClient(DriverClient):
         while True:
             try:
                 # Attempt command send. Retry if necessary.
-                self.zmq_cmd_socket.send_pyobj(msg)
+                zmq_codec.send(self.zmq_cmd_socket, msg, self.codec)
                 if msg == 'stop_driver_process':
                     return 'driver stopping'
 
@@ -148,16 +185,18 @@ class ZmqDriverClient(DriverClient):
                 time.sleep(.5)
             
         log.debug('Awaiting reply.')
+        delay = MIN_RETRY_DELAY
         while True:
             try:
                 # Attempt reply recv. Retry if necessary.
-                reply = self.zmq_cmd_socket.recv_pyobj(flags=zmq.NOBLOCK)
+                reply = zmq_codec.recv(self.zmq_cmd_socket, flags=zmq.NOBLOCK)
                 # Reply recieved, break and return.
                 break
 
             except zmq.ZMQError:
                 # Socket not ready with the reply. Sleep and retry later.
-                time.sleep(.5)
+                time.sleep(delay)
+                delay = _next_retry_delay(delay)
                 
         log.debug('Reply: %s.' % str(reply))
         
@@ -24,6 +24,7 @@ import time
 import logging
 import sys
 import uuid
+import Queue
 
 import zmq
 
@@ -31,9 +32,15 @@ from ooi.exception import ApplicationException
 from mi.core.exceptions import InstrumentException, UnexpectedError
 
 import mi.core.instrument.driver_process as driver_process
+from mi.core.instrument import zmq_codec
+from mi.core.instrument.zmq_codec import CodecName
 from mi.core.log import get_logger
 log = get_logger()
 
+# seconds the command and event threads wait for a message before checking
+# if they have been stopped
+MESSAGING_POLL_TIMEOUT = .1
+
 def _encode_exception(reply):
     if isinstance(reply, InstrumentException):
         # InstrumentExceptions have corresponding IonException error code built-in
@@ -52,7 +59,8 @@ class ZmqDriverProcess(driver_process.DriverProcess):
     """
     
     @classmethod
-    def launch_process(cls, driver_module, driver_class, workdir='/tmp/', ppid=None):
+    def launch_process(cls, driver_module, driver_class, workdir='/tmp/', ppid=None,
+                       codec=CodecName.PICKLE):
         """
         Class method constructor to launch ZmqDriverProcess as a
         separate OS process. Creates command string for this
@@ -62,6 +70,9 @@ class ZmqDriverProcess(driver_process.DriverProcess):
         @param workdir The work directory when temporary port files are written.
         @param ppid ID of the parent process, used to self destruct when
         parent dies in test cases.
+        @param codec The CodecName the process sends replies and events
+        with. Clients read any codec, they should be created with the same
+        codec so commands are sent with it too.
         @retval Tuple containing (Popen object for the process, cmd port,
             evt_port)
         """
@@ -72,9 +83,9 @@ class ZmqDriverProcess(driver_process.DriverProcess):
         cmd_port_fname = workdir + cmd_port_fname
         evt_port_fname = 'dvr_evt_port_%s.txt' % tag
         evt_port_fname = workdir + evt_port_fname
-        cmd_str = 'from %s import %s; dp = %s("%s", "%s", "%s", "%s", %s);dp.run()' \
+        cmd_str = 'from %s import %s; dp = %s("%s", "%s", "%s", "%s", %s, "%s");dp.run()' \
             % (__name__, cls.__name__, cls.__name__, driver_module,
-               driver_class, cmd_port_fname, evt_port_fname, str(ppid))
+               driver_class, cmd_port_fname, evt_port_fname, str(ppid), codec)
                 
         # Call base class launch method.
         dvr_proc = driver_process.DriverProcess.launch_process(cmd_str)
@@ -101,7 +112,8 @@ class ZmqDriverProcess(driver_process.DriverProcess):
 
         return (dvr_proc, dvr_cmd_port, dvr_evt_port)
         
-    def __init__(self, driver_module, driver_class, cmd_port_fname, evt_port_fname, ppid):
+    def __init__(self, driver_module, driver_class, cmd_port_fname, evt_port_fname, ppid,
+                 codec=CodecName.PICKLE):
         """
         Zmq driver process constructor.
         @param driver_module The python module containing the driver code.
@@ -110,6 +122,7 @@ class ZmqDriverProcess(driver_process.DriverProcess):
         @param evt_port_fname Filename for temp evt port file.
         @param ppid ID of the parent process, used to self destruct when
         parent dies in test cases.        
+        @param codec The CodecName replies and events are sent with.
         """
         driver_process.DriverProcess.__init__(self, driver_module, driver_class, ppid)
         self.cmd_port = None
@@ -122,14 +135,16 @@ class ZmqDriverProcess(driver_process.DriverProcess):
         self.stop_evt_thread = True
         self.cmd_thread = None
         self.stop_cmd_thread = True
+        self.codec = zmq_codec.get_codec(codec)
         
     def start_messaging(self):
         """
         Initialize and start messaging resources for the driver, blocking
         until messaging terminates. This ZMQ implementation starts and
-        joins command and event threads, managing nonblocking send/recv calls
-        on REP and PUB sockets, respectively. Terminate loops and close
-        sockets when stop flag is set in driver process.
+        joins command and event threads. The command thread waits on a poller
+        for requests on the REP socket, the event thread waits on the event
+        queue, so both react as soon as there is something to do. Terminate
+        loops and close sockets when stop flag is set in driver process.
         """
         def recv_cmd_msg(zmq_driver_process):
             """
@@ -143,10 +158,16 @@ class ZmqDriverProcess(driver_process.DriverProcess):
                            zmq_driver_process.cmd_port)
             file(zmq_driver_process.cmd_port_fname,'w+').write(str(zmq_driver_process.cmd_port)+'\n')
 
+            poller = zmq.Poller()
+            poller.register(sock, zmq.POLLIN)
+
             zmq_driver_process.stop_cmd_thread = False
             while not zmq_driver_process.stop_cmd_thread:
+                if not poller.poll(MESSAGING_POLL_TIMEOUT * 1000):
+                    continue
+
                 try:
-                    msg = sock.recv_pyobj(flags=zmq.NOBLOCK)
+                    msg = zmq_codec.recv(sock, flags=zmq.NOBLOCK)
                     #log.trace('Processing message %s', msg)
                     reply = zmq_driver_process.cmd_driver(msg)
                     # if operation raised exception, encode as triple
@@ -155,7 +176,7 @@ class ZmqDriverProcess(driver_process.DriverProcess):
                     # send, send, and resend
                     while True:
                         try:
-                            sock.send_pyobj(reply, flags=zmq.NOBLOCK)
+                            zmq_codec.send(sock, reply, zmq_driver_process.codec, flags=zmq.NOBLOCK)
                             break
                         except zmq.ZMQError:
                             time.sleep(.1)
@@ -182,21 +203,21 @@ class ZmqDriverProcess(driver_process.DriverProcess):
             zmq_driver_process.stop_evt_thread = False
             while not zmq_driver_process.stop_evt_thread:
                 try:
-                    evt = zmq_driver_process.events.pop(0)
+                    evt = zmq_driver_process.events.get(timeout=MESSAGING_POLL_TIMEOUT)
                     #log.trace('Event thread sending event %s',evt)
                     while evt:
                         try:
                             if isinstance(evt, Exception):
                                 evt = _encode_exception(evt)
-                            sock.send_pyobj(evt, flags=zmq.NOBLOCK)
+                            zmq_codec.send(sock, evt, zmq_driver_process.codec, flags=zmq.NOBLOCK)
                             evt = None
                             log.trace('Event sent!')
                         except zmq.ZMQError:
                             time.sleep(.1)
                             if zmq_driver_process.stop_evt_thread:
                                 break
-                except IndexError:
-                    time.sleep(.1)
+                except Queue.Empty:
+                    pass
 
             sock.close()
             context.term()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+__license__ = 'Apache 2.0'
+
+from mi.core.log import get_logger ; log = get_logger()
+
+from mi.core.common import BaseEnum
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTest
+
+class TestEnum(BaseEnum):
+    VALUE1 = 'value 1'
+    VALUE2 = 'value 2'
+    LIST = ['a', 'list']
+
+class DerivedTestEnum(TestEnum):
+    VALUE3 = 'value 3'
+
+@attr('UNIT', group='mi')
+class TestBaseEnum(MiUnitTest):
+    """
+    Test the BaseEnum class methods
+    """
+    def test_list(self):
+        self.assertEqual(TestEnum.list(), [['a', 'list'], 'value 1', 'value 2'])
+        self.assertEqual(DerivedTestEnum.list(), [['a', 'list'], 'value 1', 'value 2', 'value 3'])
+
+        # the returned list is a copy
+        TestEnum.list().append('value 4')
+        self.assertEqual(len(TestEnum.list()), 3)
+
+    def test_dict(self):
+        self.assertEqual(TestEnum.dict(), {'VALUE1': 'value 1',
+                                           'VALUE2': 'value 2',
+                                           'LIST': ['a', 'list']})
+
+    def test_has(self):
+        self.assertTrue(TestEnum.has('value 1'))
+        self.assertTrue(TestEnum.has(['a', 'list']))
+        self.assertFalse(TestEnum.has('value 3'))
+        self.assertFalse(TestEnum.has(['value 1']))
+        self.assertFalse(TestEnum.has(None))
+        self.assertTrue(DerivedTestEnum.has('value 1'))
+        self.assertTrue(DerivedTestEnum.has('value 3'))
+
+    def test_set_attribute(self):
+        """
+        Values assigned after the class is created are found too
+        """
+        class MutableEnum(BaseEnum):
+            VALUE1 = 'value 1'
+
+        MutableEnum.VALUE2 = 'value 2'
+        self.assertTrue(MutableEnum.has('value 2'))
+        self.assertEqual(MutableEnum.list(), ['value 1', 'value 2'])
+
+        del MutableEnum.VALUE1
+        self.assertFalse(MutableEnum.has('value 1'))
+        self.assertEqual(MutableEnum.dict(), {'VALUE2': 'value 2'})
@@ -65,3 +65,55 @@ class TestTime(MiUnitTest):
             now = datetime.datetime.utcnow()
             self.assertLess(now.microsecond, 100)
             system_time.sleep(0.1)
+
+    def test_fields_to_unix_time(self):
+        """
+        Test converting date and time fields, which is done in UTC
+        """
+        self.assertEqual(date_to_unix_time(1970, 1, 1), 0)
+        self.assertEqual(date_to_unix_time(2000, 1, 1), UNIX_TIME_2000)
+        self.assertEqual(date_to_unix_time(1904, 1, 1), UNIX_TIME_1904)
+        self.assertEqual(date_to_unix_time(2012, 2, 29), 1330473600)
+
+        self.assertEqual(fields_to_unix_time(2013, 4, 5, 6, 7, 8), 1365142028.0)
+        self.assertEqual(fields_to_unix_time(2013, 4, 5, 6, 7, 8, 250000), 1365142028.25)
+        self.assertEqual(fields_to_ntp_date_time(2013, 4, 5, 6, 7, 8),
+                         ntplib.system_to_ntp_time(1365142028.0))
+
+        self.assertRaises(ValueError, date_to_unix_time, 2013, 2, 29)
+        self.assertRaises(ValueError, fields_to_unix_time, 2013, 13, 1)
+        self.assertRaises(ValueError, fields_to_unix_time, 2013, 1, 1, 24)
+        self.assertRaises(ValueError, fields_to_unix_time, 2013, 1, 1, 0, 60)
+        self.assertRaises(ValueError, fields_to_unix_time, 2013, 1, 1, 0, 0, 60)
+        self.assertRaises(ValueError, fields_to_unix_time, 2013, 1, 1, 0, 0, 0, 1000000)
+
+        self.assertEqual(seconds_to_microseconds('5'), 500000)
+        self.assertEqual(seconds_to_microseconds('123'), 123000)
+        self.assertEqual(seconds_to_microseconds('1234567'), 123456)
+
+    def test_string_to_ntp_date_time(self):
+        """
+        Test converting ISO8601 strings
+        """
+        base = ntplib.system_to_ntp_time(1365142028)
+        self.assertEqual(string_to_ntp_date_time('2013-04-05T06:07:08Z'), base)
+        self.assertEqual(string_to_ntp_date_time('2013-04-05T06:07:08'), base)
+        self.assertEqual(string_to_ntp_date_time('2013-04-05T06:07:08.5Z'), base + .5)
+        self.assertEqual(string_to_ntp_date_time('2013-04-05T06:07:08.25'), base + .25)
+
+        self.assertRaises(IOError, string_to_ntp_date_time, 1365142028)
+        self.assertRaises(ValueError, string_to_ntp_date_time, '04/05/2013 06:07:08')
+        self.assertRaises(ValueError, string_to_ntp_date_time, '2013-02-30T06:07:08Z')
+
+    def test_ntp_arrays(self):
+        """
+        Test converting single times and arrays of times to and from ntp
+        """
+        self.assertEqual(unix_to_ntp_time(0), NTP_UNIX_DELTA)
+        self.assertEqual(ntp_to_unix_time(NTP_UNIX_DELTA + 1.5), 1.5)
+
+        ntp = unix_to_ntp_time([0, 1.5, 1365142028])
+        self.assertEqual(ntp.dtype, np.float64)
+        self.assertEqual(list(ntp), [NTP_UNIX_DELTA, NTP_UNIX_DELTA + 1.5,
+                                     ntplib.system_to_ntp_time(1365142028)])
+        self.assertEqual(list(ntp_to_unix_time(ntp)), [0, 1.5, 1365142028])
@@ -19,11 +19,22 @@ import datetime
 import ntplib
 import time
 import re
-from dateutil import parser
+import numpy as np
 
 DATE_PATTERN = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?Z?$'
 DATE_MATCHER = re.compile(DATE_PATTERN)
 
+# seconds from the NTP epoch (1900-01-01) to the unix epoch (1970-01-01)
+NTP_UNIX_DELTA = ntplib.NTP.NTP_DELTA
+
+# unix time of 2000-01-01T00:00:00Z
+UNIX_TIME_2000 = 946684800
+# unix time of 1904-01-01T00:00:00Z
+UNIX_TIME_1904 = -2082844800
+
+UNIX_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+SECONDS_PER_DAY = 86400
+
 def get_timestamp_delayed(format):
     '''
     Return a formatted date string of the current utc time,
@@ -71,6 +82,78 @@ def get_timestamp(format):
 
     return time.strftime(format, time.gmtime())
 
+def date_to_unix_time(year, month, day):
+    """
+    Get the unix time of the start of a UTC date.
+    @param year four digit year
+    @param month month, 1 - 12
+    @param day day of the month
+    @retval seconds since 1970-01-01 as an integer
+    @throws ValueError if the date is not valid
+    """
+    return (datetime.date(year, month, day).toordinal() - UNIX_EPOCH_ORDINAL) * SECONDS_PER_DAY
+
+def fields_to_unix_time(year, month, day, hour=0, minute=0, second=0, microsecond=0):
+    """
+    Convert the fields of a UTC date and time to unix time.
+    @param year four digit year
+    @param month month, 1 - 12
+    @param day day of the month
+    @param hour hour, 0 - 23
+    @param minute minute, 0 - 59
+    @param second whole seconds, 0 - 59
+    @param microsecond microseconds, 0 - 999999
+    @retval seconds since 1970-01-01 as a float
+    @throws ValueError if the date or time is not valid
+    """
+    if not (0 <= hour < 24 and 0 <= minute < 60 and 0 <= second < 60 and 0 <= microsecond < 1000000):
+        raise ValueError("time out of range: %s:%s:%s.%s" % (hour, minute, second, microsecond))
+
+    seconds = date_to_unix_time(year, month, day) + hour * 3600 + minute * 60 + second
+    if microsecond:
+        return (seconds * 1000000 + microsecond) / 1e6
+    return float(seconds)
+
+def fields_to_ntp_date_time(year, month, day, hour=0, minute=0, second=0, microsecond=0):
+    """
+    Convert the fields of a UTC date and time to an ntp date.
+    @see fields_to_unix_time
+    @retval an ntp date number (seconds since jan 1 1900)
+    @throws ValueError if the date or time is not valid
+    """
+    return fields_to_unix_time(year, month, day, hour, minute, second, microsecond) + NTP_UNIX_DELTA
+
+def seconds_to_microseconds(fraction):
+    """
+    Convert the digits after the decimal point of a seconds value to whole
+    microseconds, ignoring digits past the sixth.
+    @param fraction string of digits
+    @retval microseconds as an integer
+    """
+    return int((fraction + '00000')[:6])
+
+def unix_to_ntp_time(unix_time):
+    """
+    Convert unix time to ntp time.
+    @param unix_time seconds since 1970-01-01, a number or a sequence or
+    numpy array of numbers
+    @retval seconds since 1900-01-01, a float or a numpy float64 array
+    """
+    if isinstance(unix_time, (list, tuple, np.ndarray)):
+        return np.asarray(unix_time, dtype=np.float64) + NTP_UNIX_DELTA
+    return float(unix_time) + NTP_UNIX_DELTA
+
+def ntp_to_unix_time(ntp_time):
+    """
+    Convert ntp time to unix time.
+    @param ntp_time seconds since 1900-01-01, a number or a sequence or
+    numpy array of numbers
+    @retval seconds since 1970-01-01, a float or a numpy float64 array
+    """
+    if isinstance(ntp_time, (list, tuple, np.ndarray)):
+        return np.asarray(ntp_time, dtype=np.float64) - NTP_UNIX_DELTA
+    return float(ntp_time) - NTP_UNIX_DELTA
+
 def string_to_ntp_date_time(datestr):
         """
         Extract an ntp date from a ISO8601 formatted date string.
@@ -89,14 +172,16 @@ def string_to_ntp_date_time(datestr):
             if datestr[-1:] != 'Z':
                 datestr += 'Z'
 
-            # the parsed date time represents a GMT time, but strftime
-            # does not take timezone into account, so these are seconds from the
-            # local start of 1970
-            local_sec = float(parser.parse(datestr).strftime("%s.%f"))
-            # remove the local time zone to convert to gmt (seconds since gmt jan 1 1970)
-            gmt_sec = local_sec - time.timezone
+            # the format is fixed by the regex, YYYY-MM-DDTHH:MM:SS[.S+]Z
+            microsecond = 0
+            if datestr[19] == '.':
+                microsecond = seconds_to_microseconds(datestr[20:-1])
+
+            gmt_sec = fields_to_unix_time(int(datestr[0:4]), int(datestr[5:7]), int(datestr[8:10]),
+                                          int(datestr[11:13]), int(datestr[14:16]), int(datestr[17:19]),
+                                          microsecond)
             # convert to ntp (seconds since gmt jan 1 1900)
-            timestamp = ntplib.system_to_ntp_time(gmt_sec)
+            timestamp = gmt_sec + NTP_UNIX_DELTA
 
         except ValueError as e:
             raise ValueError('Value %s could not be formatted to a date. %s' % (str(datestr), e))
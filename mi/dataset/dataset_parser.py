@@ -12,7 +12,7 @@ __author__ = 'Steve Foley'
 __license__ = 'Apache 2.0'
 
 from mi.core.log import get_logger ; log = get_logger()
-from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.chunker import BufferedStringChunker
 from mi.core.instrument.data_particle import DataParticleKey
 from mi.core.exceptions import SampleException, NotImplementedException
 
@@ -38,7 +38,7 @@ class Parser(object):
            ultimately from the agent) where we send our error events to
            be published into ION
         """
-        self._chunker = StringChunker(sieve_fn)
+        self._chunker = BufferedStringChunker(sieve_fn)
         self._stream_handle = stream_handle
         self._state = state
         self._state_callback = state_callback
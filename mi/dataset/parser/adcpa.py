@@ -24,35 +24,31 @@ import copy
 import datetime as dt
 import re
 from calendar import timegm
-from functools import partial
-from struct import unpack
+from struct import Struct, unpack
 
 from mi.core.log import get_logger
 from mi.core.common import BaseEnum
 from mi.core.exceptions import SampleException, DatasetParserException
-from mi.core.instrument.chunker import StringChunker
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey
 from mi.dataset.dataset_parser import BufferLoadingParser
+from mi.instrument.teledyne import pd0
 
 # start the logger
 log = get_logger()
 
-# Regex set to find each ensemble in the PD0 packet. It starts by specifying the
-# first 6 bytes of the header data (this is more explicit than just the 0x7f7f
-# marker the manual specifies, helping to avoid cases where the marker could
-# actually be in the data string, thus giving a false positive data record
-# marker), followed by the remaining N bytes in the ensemble. It stops, without
-# consuming bytes, at the beginning of the next ensemble (again using the first
-# 6 bytes of the header) or the end of the file. This dynamic regex is required
-# since the ensemble sizes will vary during the course of a deployment as
-# bottom-tracking is automatically turned on and off. This also allows the
-# glider pilots the flexibility to change the sampling characteristics of the
-# ADCPA without impacting the parser code.
-ADCPA_PD0_PARSED_REGEX = (
-    b'(\x7f\x7f[\x00-\xFF]{2}\x00[\x06|\x07]{1}[\x00-\xFF]+?)' +  # header bytes plus rest of ensemble
-    '(?=(\x7f\x7f[\x00-\xFF]{2}\x00[\x06|\x07]{1})|\Z)'  # start of the next ensemble, or EOF
-)
-ADCPA_PD0_PARSED_MATCHER = re.compile(ADCPA_PD0_PARSED_REGEX, re.DOTALL)
+# Ensembles are framed by pd0.find_ensembles, using the length and checksum
+# in each ensemble. An ensemble is only turned into a particle if it also
+# starts with the first 6 bytes of the ExplorerDVL header, the 0x7f7f marker,
+# the two byte ensemble length, a spare byte and 6 or 7 data types. The
+# number of data types changes during the course of a deployment as
+# bottom-tracking is automatically turned on and off.
+ADCPA_PD0_HEADER_REGEX = b'\x7f\x7f[\x00-\xFF]{2}\x00[\x06\x07]'
+ADCPA_PD0_HEADER_MATCHER = re.compile(ADCPA_PD0_HEADER_REGEX, re.DOTALL)
+
+# ExplorerDVL data type layouts
+FIXED_LEADER = Struct('<HBBHBBBBHHHBBBBHBBBBhhBBHHBBBBHQHBBI')
+VARIABLE_LEADER = Struct('<HHBBBBBBBBBBHHHhhHhBBBBBBBBBBBBBBBBBBHIII')
+BOTTOM_TRACK = Struct('<HHHBBBBHLHHHHhhhhBBBBBBBBBBBBHHHhhhhBBBBBBBBBBBBHBBBBBBBBB')
 
 
 ###############################################################################
@@ -281,27 +277,14 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
         """
         self.final_result = []
 
-        length = unpack("<H", self.raw_data[2:4])[0]
-        data = str(self.raw_data)
-
-        # Calculate the checksum
-        total = int(0)
-        for i in range(0, length):
-            total += int(ord(data[i]))
-
-        checksum = total & 65535    # bitwise and with 65535 or mod vs 65536
-
-        if checksum != unpack("<H", self.raw_data[length: length+2])[0]:
-            log.debug("Checksum mismatch " + str(checksum) + " != "
-                      + str(unpack("<H", self.raw_data[length: length+2])[0]))
-            raise SampleException("Checksum mismatch")
+        (length, checksum) = pd0.verify_checksum(self.raw_data)
 
         # save the checksum and process the remainder of the ensemble
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.CHECKSUM,
                                   DataParticleKey.VALUE: checksum})
 
         (header_id, data_source_id, num_bytes, spare, num_data_types) = \
-            unpack('<BBHBB', self.raw_data[0:6])
+            pd0.HEADER.unpack_from(self.raw_data)
 
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.HEADER_ID,
                                   DataParticleKey.VALUE: header_id})
@@ -312,72 +295,21 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.NUM_DATA_TYPES,
                                   DataParticleKey.VALUE: num_data_types})
 
-        offsets = []    # create list for offsets
-        strt = 6        # offsets start at byte 6 (using 0 indexing)
-        nDT = 1         # counter for n data types
-        while nDT <= num_data_types:
-            value = unpack('<H', self.raw_data[strt:strt+2])[0]
-            offsets.append(value)
-            strt += 2
-            nDT += 1
+        offsets = pd0.data_type_offsets(self.raw_data, num_data_types)
 
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.OFFSET_DATA_TYPES,
                                   DataParticleKey.VALUE: offsets})
 
-        for offset in offsets:
-            # for each offset, using the starting byte, determine the data type
-            # and then parse accordingly.
-            data_type = unpack('<H', self.raw_data[offset:offset+2])[0]
-
-            # fixed leader data (x00x00)
-            if data_type == 0:
-                chunk = self.raw_data[offset:offset+58]
-                self.parse_fixed_chunk(chunk)
-                iCells = self.num_depth_cells   # grab the # of depth cells
-                                                # obtained from the fixed leader
-                                                # data type
-
-            # variable leader data (x80x00)
-            if data_type == 128:
-                chunk = self.raw_data[offset:offset+60]
-                self.parse_variable_chunk(chunk)
-
-            # velocity data (x00x01)
-            if data_type == 256:
-                # number of bytes is a function of the user selectable number of
-                # depth cells (WN command), calculated above
-                nBytes = 2 + 8 * iCells
-                chunk = self.raw_data[offset:offset+nBytes]
-                self.parse_velocity_chunk(chunk)
-
-            # correlation magnitude data (x00x02)
-            if data_type == 512:
-                # number of bytes is a function of the user selectable number of
-                # depth cells (WN command), calculated above
-                nBytes = 2 + 4 * iCells
-                chunk = self.raw_data[offset:offset+nBytes]
-                self.parse_corelation_magnitude_chunk(chunk)
-
-            # echo intensity data (x00x03)
-            if data_type == 768:
-                # number of bytes is a function of the user selectable number of
-                # depth cells (WN command), calculated above
-                nBytes = 2 + 4 * iCells
-                chunk = self.raw_data[offset:offset+nBytes]
-                self.parse_echo_intensity_chunk(chunk)
-
-            # percent-good data (x00x04)
-            if data_type == 1024:
-                # number of bytes is a function of the user selectable number of
-                # depth cells (WN command), calculated above
-                nBytes = 2 + 4 * iCells
-                chunk = self.raw_data[offset:offset+nBytes]
-                self.parse_percent_good_chunk(chunk)
-
-            # bottom track data (x00x06)
-            if data_type == 1536:
-                chunk = self.raw_data[offset:offset+81]
-                self.parse_bottom_track_chunk(chunk)
+        # for each data type, using the id it starts with, parse accordingly.
+        for (data_type_id, start, _) in pd0.data_types(self.raw_data, offsets,
+                                                        length - pd0.RESERVED_SIZE):
+            if data_type_id in self._data_type_parsers:
+                (parser, size, depth_cell_size) = self._data_type_parsers[data_type_id]
+                if depth_cell_size:
+                    # number of bytes is a function of the user selectable
+                    # number of depth cells (WN command), from the fixed leader
+                    size += depth_cell_size * self.num_depth_cells
+                parser(self, self.raw_data[start:start + size])
 
         return self.final_result
 
@@ -398,7 +330,7 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
          reference_layer_stop, false_target_threshold, SPARE1,
          transmit_lag_distance, SPARE2, system_bandwidth,
          SPARE3, SPARE4, serial_number) = \
-            unpack('<HBBHBBBBHHHBBBBHBBBBhhBBHHBBBBHQHBBI', chunk)
+            FIXED_LEADER.unpack(chunk)
 
         if 0 != fixed_leader_id:
             raise SampleException("fixed_leader_id was not equal to 0")
@@ -540,7 +472,7 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
          adc_attitiude, adc_contamination_sensor, error_status_word_1,
          error_status_word_2, error_status_word_3, error_status_word_4,
          SPARE1, pressure, pressure_variance, SPARE2) = \
-            unpack('<HHBBBBBBBBBBHHHhhHhBBBBBBBBBBBBBBBBBBHIII', chunk)
+            VARIABLE_LEADER.unpack(chunk)
 
         if 128 != variable_leader_id:
             raise SampleException("variable_leader_id was not equal to 128")
@@ -666,9 +598,6 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
 
         @throws SampleException If there is a problem with sample creation
         """
-        N = (len(chunk) - 2) / 2 / 4
-        offset = 0
-
         velocity_data_id = unpack("<H", chunk[0:2])[0]
         if 256 != velocity_data_id:
             raise SampleException("velocity_data_id was not equal to 256")
@@ -676,17 +605,8 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.VELOCITY_DATA_ID,
                                   DataParticleKey.VALUE: velocity_data_id})
 
-        water_velocity_east = []
-        water_velocity_north = []
-        water_velocity_up = []
-        error_velocity = []
-        for row in range(0, N):
-            (a, b, c, d) = unpack('<hhhh', chunk[offset + 2: offset + 10])
-            water_velocity_east.append(a)
-            water_velocity_north.append(b)
-            water_velocity_up.append(c)
-            error_velocity.append(d)
-            offset += 4 * 2
+        (water_velocity_east, water_velocity_north, water_velocity_up,
+         error_velocity) = pd0.beam_lists(chunk, '<i2')
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.WATER_VELOCITY_EAST,
                                   DataParticleKey.VALUE: water_velocity_east})
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.WATER_VELOCITY_NORTH,
@@ -702,9 +622,6 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
 
         @throws SampleException If there is a problem with sample creation
         """
-        N = (len(chunk) - 2) / 4
-        offset = 0
-
         correlation_magnitude_id = unpack("<H", chunk[0:2])[0]
         if 512 != correlation_magnitude_id:
             raise SampleException("correlation_magnitude_id was not equal to 512")
@@ -712,17 +629,8 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.CORRELATION_MAGNITUDE_ID,
                                   DataParticleKey.VALUE: correlation_magnitude_id})
 
-        correlation_magnitude_beam1 = []
-        correlation_magnitude_beam2 = []
-        correlation_magnitude_beam3 = []
-        correlation_magnitude_beam4 = []
-        for row in range(0, N):
-            (a, b, c, d) = unpack('<BBBB', chunk[offset + 2: offset + 6])
-            correlation_magnitude_beam1.append(a)
-            correlation_magnitude_beam2.append(b)
-            correlation_magnitude_beam3.append(c)
-            correlation_magnitude_beam4.append(d)
-            offset += 4
+        (correlation_magnitude_beam1, correlation_magnitude_beam2,
+         correlation_magnitude_beam3, correlation_magnitude_beam4) = pd0.beam_lists(chunk, 'u1')
 
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.CORRELATION_MAGNITUDE_BEAM1,
                                   DataParticleKey.VALUE: correlation_magnitude_beam1})
@@ -739,26 +647,14 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
 
         @throws SampleException If there is a problem with sample creation
         """
-        N = (len(chunk) - 2) / 4
-        offset = 0
-
         echo_intensity_id = unpack("<H", chunk[0:2])[0]
         if 768 != echo_intensity_id:
             raise SampleException("echo_intensity_id was not equal to 768")
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.ECHO_INTENSITY_ID,
                                   DataParticleKey.VALUE: echo_intensity_id})
 
-        echo_intesity_beam1 = []
-        echo_intesity_beam2 = []
-        echo_intesity_beam3 = []
-        echo_intesity_beam4 = []
-        for row in range(0, N):
-            (a, b, c, d) = unpack('<BBBB', chunk[offset + 2: offset + 6])
-            echo_intesity_beam1.append(a)
-            echo_intesity_beam2.append(b)
-            echo_intesity_beam3.append(c)
-            echo_intesity_beam4.append(d)
-            offset += 4
+        (echo_intesity_beam1, echo_intesity_beam2,
+         echo_intesity_beam3, echo_intesity_beam4) = pd0.beam_lists(chunk, 'u1')
 
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.ECHO_INTENSITY_BEAM1,
                                   DataParticleKey.VALUE: echo_intesity_beam1})
@@ -775,9 +671,6 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
 
         @throws SampleException If there is a problem with sample creation
         """
-        N = (len(chunk) - 2) / 4
-        offset = 0
-
         percent_good_id = unpack("<H", chunk[0:2])[0]
         if 1024 != percent_good_id:
             raise SampleException("percent_good_id was not equal to 1024")
@@ -785,17 +678,8 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.PERCENT_GOOD_ID,
                                   DataParticleKey.VALUE: percent_good_id})
 
-        percent_good_3beam = []
-        percent_transforms_reject = []
-        percent_bad_beams = []
-        percent_good_4beam = []
-        for row in range(0, N):
-            (a, b, c, d) = unpack('<BBBB', chunk[offset + 2: offset + 6])
-            percent_good_3beam.append(a)
-            percent_transforms_reject.append(b)
-            percent_bad_beams.append(c)
-            percent_good_4beam.append(d)
-            offset += 4
+        (percent_good_3beam, percent_transforms_reject,
+         percent_bad_beams, percent_good_4beam) = pd0.beam_lists(chunk, 'u1')
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.PERCENT_GOOD_3BEAM,
                                   DataParticleKey.VALUE: percent_good_3beam})
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.PERCENT_TRANSFORMS_REJECT,
@@ -830,7 +714,7 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
          beam2_rssi_amplitude, beam3_rssi_amplitude, beam4_rssi_amplitude,
          bt_gain, beam1_bt_range_msb, beam2_bt_range_msb, beam3_bt_range_msb,
          beam4_bt_range_msb) = \
-            unpack('<HHHBBBBHLHHHHhhhhBBBBBBBBBBBBHHHhhhhBBBBBBBBBBBBHBBBBBBBBB', chunk)
+            BOTTOM_TRACK.unpack(chunk)
 
         if 1536 != bottom_track_id:
             raise SampleException("bottom_track_id was not equal to 1536")
@@ -950,6 +834,17 @@ class ADCPA_PD0_PARSED_DataParticle(DataParticle):
         self.final_result.append({DataParticleKey.VALUE_ID: ADCPA_PD0_PARSED_KEY.BEAM4_BT_RANGE_MSB,
                                   DataParticleKey.VALUE: beam4_bt_range_msb})
 
+    # parser, bytes and bytes per depth cell of each data type, by id
+    _data_type_parsers = {
+        pd0.FIXED_LEADER_ID: (parse_fixed_chunk, FIXED_LEADER.size, 0),
+        pd0.VARIABLE_LEADER_ID: (parse_variable_chunk, VARIABLE_LEADER.size, 0),
+        pd0.VELOCITY_ID: (parse_velocity_chunk, pd0.DATA_TYPE_ID_SIZE, 8),
+        pd0.CORRELATION_MAGNITUDE_ID: (parse_corelation_magnitude_chunk, pd0.DATA_TYPE_ID_SIZE, 4),
+        pd0.ECHO_INTENSITY_ID: (parse_echo_intensity_chunk, pd0.DATA_TYPE_ID_SIZE, 4),
+        pd0.PERCENT_GOOD_ID: (parse_percent_good_chunk, pd0.DATA_TYPE_ID_SIZE, 4),
+        pd0.BOTTOM_TRACK_ID: (parse_bottom_track_chunk, BOTTOM_TRACK.size, 0),
+    }
+
 
 class AdcpaParser(BufferLoadingParser):
     """
@@ -966,8 +861,7 @@ class AdcpaParser(BufferLoadingParser):
         super(AdcpaParser, self).__init__(config,
                                           stream_handle,
                                           state,
-                                          partial(StringChunker.regex_sieve_function,
-                                                  regex_list=[ADCPA_PD0_PARSED_MATCHER]),
+                                          pd0.find_ensembles,
                                           state_callback,
                                           publish_callback,
                                           *args,
@@ -1041,7 +935,7 @@ class AdcpaParser(BufferLoadingParser):
         (timestamp, chunk, start, end) = self._chunker.get_next_data_with_index(True)
         while chunk is not None:
             # particleize the data block received.
-            particle = self._extract_sample(self._particle_class, ADCPA_PD0_PARSED_MATCHER,
+            particle = self._extract_sample(self._particle_class, ADCPA_PD0_HEADER_MATCHER,
                                             chunk, self._timestamp)
 
             # if the particle is good, set the state and append particle
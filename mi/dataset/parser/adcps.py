@@ -12,10 +12,7 @@ __license__ = 'Apache 2.0'
 
 import re
 import struct
-import ntplib
-import time
 import datetime
-from dateutil import parser
 
 from mi.core.log import get_logger; log = get_logger()
 from mi.dataset.parser.mflm import MflmParser, SIO_HEADER_MATCHER
@@ -291,12 +288,10 @@ class AdcpsParser(MflmParser):
                         # pull out the date string from the data
                         date_str = AdcpsParserDataParticle.unpack_date(data_match.group(0)[11:19])
                         # convert to ntp
-                        converted_time = float(parser.parse(date_str).strftime("%s.%f"))
-                        adjusted_time = converted_time - time.timezone
-                        self._timestamp = ntplib.system_to_ntp_time(adjusted_time)
+                        self._timestamp = string_to_ntp_date_time(date_str)
                         # round to ensure the timestamps match
                         self._timestamp = round(self._timestamp*100)/100
-                        log.debug("Converted time \"%s\" (unix: %10.9f) into %10.9f", date_str, adjusted_time, self._timestamp)
+                        log.debug("Converted time \"%s\" into %10.9f", date_str, self._timestamp)
                         # particle-ize the data block received, return the record
                         sample = self._extract_sample(AdcpsParserDataParticle,
                                                       DATA_MATCHER,
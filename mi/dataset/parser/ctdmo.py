@@ -14,15 +14,13 @@ import binascii
 import array
 import string
 import re
-import time
-import ntplib
-from dateutil import parser
 from mi.core.log import get_logger ; log = get_logger()
 
 from mi.dataset.parser.mflm import MflmParser, SIO_HEADER_MATCHER
 from mi.core.common import BaseEnum
 from mi.core.exceptions import SampleException, DatasetParserException
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey
+from mi.core.time import unix_to_ntp_time, UNIX_TIME_2000
 
 class DataParticleType(BaseEnum):
     SAMPLE = 'ctdmo_parsed'
@@ -140,20 +138,13 @@ class CtdmoParser(MflmParser):
     @staticmethod
     def _convert_time_to_timestamp(sec_since_2000):
         """
-        Converts the given string in matched format into an NTP timestamp.
-        @param ts_str The timestamp string in the format "mm/dd/yyyy hh:mm:ss"
+        Converts the given seconds since jan 1 2000 into an NTP timestamp.
+        @param sec_since_2000 seconds since 2000-01-01 (gmt timezone)
         @retval The NTP4 timestamp
         """
-        log.debug("Convert seconds since 2000: %d", sec_since_2000)
-
-        # get seconds since jan 1 2000 (gmt timezone)
-        gmt_dt_2000 = parser.parse("2000-01-01T00:00:00.00Z")
-        elapse_2000 = float(gmt_dt_2000.strftime("%s.%f"))
-        log.debug("elapse since 2000: %s", elapse_2000)
-
         # convert from epoch in 2000 to epoch in 1970, GMT
-        sec_since_1970 = sec_since_2000 + elapse_2000 - time.timezone
-        ntptime = ntplib.system_to_ntp_time(sec_since_1970)
+        sec_since_1970 = sec_since_2000 + UNIX_TIME_2000
+        ntptime = unix_to_ntp_time(sec_since_1970)
         log.debug("seconds since 1970 %d, ntptime %s", sec_since_1970, ntptime)
         return ntptime
 
@@ -14,8 +14,6 @@ __license__ = 'Apache 2.0'
 
 import copy
 import re
-import time
-import ntplib
 from functools import partial
 from dateutil import parser
 from dateutil import tz
@@ -27,6 +25,7 @@ from mi.core.exceptions import SampleException, DatasetParserException
 from mi.core.instrument.chunker import StringChunker
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey
 from mi.dataset.dataset_parser import BufferLoadingParser
+from mi.core.time import fields_to_ntp_date_time
 
 TIME_REGEX = r'\d{1,2}/\d{1,2}/\d{4}\s*\d{1,2}:\d{1,2}:\d{1,2}'
 TIME_MATCHER = re.compile(TIME_REGEX, re.DOTALL)
@@ -172,18 +171,12 @@ class CtdpfParser(BufferLoadingParser):
         if not match:
             raise ValueError("Invalid time format: %s" % ts_str)
 
-        zulu_ts = "%04d-%02d-%02dT%02d:%02d:%02dZ" % (
+        ntptime = fields_to_ntp_date_time(
             int(match.group(3)), int(match.group(1)), int(match.group(2)),
             int(match.group(4)), int(match.group(5)), int(match.group(6))
         )
-        log.trace("converted ts '%s' to '%s'", ts_str, zulu_ts)
 
-        localtime_offset = float(parser.parse("1970-01-01T00:00:00.00Z").strftime("%s.%f"))
-        converted_time = float(parser.parse(zulu_ts).strftime("%s.%f"))
-        adjusted_time = round(converted_time - localtime_offset)
-        ntptime = ntplib.system_to_ntp_time(adjusted_time)
-
-        log.trace("Converted time \"%s\" (unix: %s) into %s", ts_str, adjusted_time, ntptime)
+        log.trace("Converted time \"%s\" into %s", ts_str, ntptime)
         return ntptime
 
     def _increment_timestamp(self, increment=1):
@@ -11,16 +11,14 @@ __author__ = 'Emily Hahn'
 __license__ = 'Apache 2.0'
 
 import re
-import ntplib
 from time import strftime, strptime
 
 from mi.core.log import get_logger; log = get_logger()
 from mi.core.common import BaseEnum
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey
-
-from dateutil import parser
 from mi.dataset.parser.mflm import MflmParser, SIO_HEADER_MATCHER
 from mi.core.exceptions import SampleException, DatasetParserException
+from mi.core.time import string_to_ntp_date_time
 
 
 class DataParticleType(BaseEnum):
@@ -191,13 +189,8 @@ class FlortdParser(MflmParser):
                     date_zulu = self.date_str_to_zulu(data_match.group(1))
                     if date_zulu is not None:
                         # convert to ntp
-                        localtime_offset = float(parser.parse("1970-01-01T00:00:00.00Z").strftime("%s.%f"))
-                        converted_time = float(parser.parse(date_zulu).strftime("%s.%f"))
-                        # round to nearest .01
-                        adjusted_time = round((converted_time - localtime_offset)*100)/100
-                        self._timestamp = ntplib.system_to_ntp_time(adjusted_time)
-                        log.debug("Converted time \"%s\" (unix: %s) into %s", date_zulu,
-                                  adjusted_time, self._timestamp)
+                        self._timestamp = string_to_ntp_date_time(date_zulu)
+                        log.debug("Converted time \"%s\" into %s", date_zulu, self._timestamp)
 
                         # particle-ize the data block received, return the record
                         sample = self._extract_sample(FlortdParserDataParticle,
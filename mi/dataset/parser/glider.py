@@ -22,6 +22,7 @@ from mi.core.log import get_logger
 from mi.core.common import BaseEnum
 from mi.core.exceptions import SampleException, DatasetParserException
 from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.chunker import ResumableSieve
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey
 from mi.core.instrument.data_particle import DataParticleValue
 from mi.dataset.dataset_parser import BufferLoadingParser
@@ -391,13 +392,17 @@ class GliderParser(BufferLoadingParser):
         super(GliderParser, self).__init__(config,
                                            self._stream_handle,
                                            state,
-                                           partial(StringChunker.regex_sieve_function,
-                                                   regex_list=[record_regex]),
+                                           ResumableSieve(
+                                               partial(StringChunker.regex_sieve_function,
+                                                       regex_list=[record_regex]),
+                                               record_terminator='\n'),
                                            state_callback,
                                            publish_callback,
                                            exception_callback,
                                            *args,
                                            **kwargs)
+        self._read_column_schema()
+
         if state:
             self.set_state(state)
 
@@ -432,11 +437,8 @@ class GliderParser(BufferLoadingParser):
         if column_count == 0:
             raise SampleException("sensors_per_cycle is 0")
 
-        regex = r''
-        for i in range(0, column_count-1):
-            regex += r'([-\d\.e]+|NaN)\s'
-
-        regex += r'([-\d\.e]+|NaN)\s*$'
+        # no groups, the record is split rather than read from the match
+        regex = r'(?:(?:[-\d\.e]+|NaN)\s){%d}(?:[-\d\.e]+|NaN)\s*$' % (column_count - 1)
 
         log.debug("Sample Pattern: %s", regex)
         return re.compile(regex, re.MULTILINE)
@@ -503,6 +505,47 @@ class GliderParser(BufferLoadingParser):
 
         log.debug("End of header, position: %d", self._stream_handle.tell())
 
+    def _read_column_schema(self):
+        """
+        Work out once per file which columns the particle class uses and how
+        each of them is converted, so records only convert those columns.
+        Particle classes without science_parameters get every column.
+        """
+        labels = self._header_dict['labels']
+        num_bytes = self._header_dict['num_of_bytes']
+
+        particle_class = getattr(self, '_particle_class', None)
+        science_parameters = getattr(particle_class, 'science_parameters', None)
+        if science_parameters is None:
+            wanted = set(labels)
+        else:
+            wanted = set(particle_class.common_parameters) | set(science_parameters)
+
+        # (label, column index) by conversion
+        self._float_columns = []
+        self._int_columns = []
+        self._latlon_columns = []
+        # labels of the used columns holding science data, every used column
+        # for particle classes without science_parameters
+        self._science_labels = []
+
+        for (index, label) in enumerate(labels):
+            if label not in wanted:
+                continue
+
+            if science_parameters is None or label in science_parameters:
+                self._science_labels.append(label)
+
+            if ('_lat' in label) or ('_lon' in label):
+                self._latlon_columns.append((label, index))
+            elif (num_bytes[index] == 1) or (num_bytes[index] == 2):
+                self._int_columns.append((label, index))
+            else:
+                self._float_columns.append((label, index))
+
+        log.debug("Columns used, float: %s, int: %s, lat/lon: %s",
+                  self._float_columns, self._int_columns, self._latlon_columns)
+
     def set_state(self, state_obj):
         """
         Set the value of the state object for this parser @param state_obj The
@@ -537,50 +580,56 @@ class GliderParser(BufferLoadingParser):
         self._read_state[StateKey.POSITION] += increment
         # Thomas, my monkey of a son, wanted this comment inserted in the code. -CW
 
-    def _read_data(self, data_record):
+    def _read_float_columns(self, records):
         """
-        Read in the column labels, data type, number of bytes of each
-        data type, and the data from an ASCII glider data file.
+        Convert the float columns of a block of records in one go. If any
+        value in the block can not be converted, the records are left for
+        _read_data to convert one at a time, so only the records holding bad
+        values are rejected.
+        @param records list of records, each a list of column strings
+        @retval list of rows of float values, in _float_columns order, or of
+            None for records left to _read_data
         """
-        log.debug("_read_data: Data Record: %s", data_record)
+        if not records or not self._float_columns:
+            return [[] for record in records]
 
+        indices = [index for (label, index) in self._float_columns]
+        try:
+            return np.array(records)[:, indices].astype(np.float64).tolist()
+        except ValueError:
+            log.debug("Bad float value in block of %d records, converting them one at a time", len(records))
+            return [None for record in records]
+
+    def _read_data(self, record, float_values):
+        """
+        Build the data dictionary for a record from the used columns, keyed
+        by column label.
+        @param record list of column strings for the record
+        @param float_values the record's row from _read_float_columns, None
+            to convert the float columns here
+        @retval dict of {'Name': label, 'Data': value} by label
+        @throws SampleException if a float or lat/lon value can not be parsed
+        """
         data_dict = {}
-        num_columns = self._header_dict['sensors_per_cycle']
-        data_labels = self._header_dict['labels']
-        #data_units = self._header_dict['data_units']
-        num_bytes = self._header_dict['num_of_bytes']
-        data = data_record.strip().split()
-        log.trace("Split data: %s", data)
-        if num_columns != len(data):
-            raise DatasetParserException('Glider data file does not have the ' +
-                                         'same number of columns as described ' +
-                                         'in the header.\n' +
-                                         'Described: %d, Actual: %d' %
-                                         (num_columns, len(data)))
-
-        # extract record to dictionary
-        for ii in range(num_columns):
-            log.trace("_read_data: index: %d label: %s, value: %s", ii, data_labels[ii], data[ii])
-
-            if (num_bytes[ii] == 1) or (num_bytes[ii] == 2):
-                    str2data = int
-            elif (num_bytes[ii] == 4) or (num_bytes[ii] == 8):
-                    str2data = float
-
-            # check to see if this is a latitude/longitude string
-            if ('_lat' in data_labels[ii]) or ('_lon' in data_labels[ii]):
-                # convert latitiude/longitude strings to decimal degrees
-
-                value = self._string_to_ddegrees(data[ii])
-            else:
-                value = str2data(data[ii])
 
-            data_dict[data_labels[ii]] = {
-                'Name': data_labels[ii],
-                #'Units': data_units[ii],
-                #'Number_of_Bytes': int(num_bytes[ii]),
-                'Data': value
-            }
+        if float_values is None:
+            float_values = []
+            for (label, index) in self._float_columns:
+                try:
+                    float_values.append(float(record[index]))
+                except ValueError:
+                    raise SampleException("Failed to parse %s value: '%s'" % (label, record[index]))
+
+        for ((label, index), value) in zip(self._float_columns, float_values):
+            data_dict[label] = {'Name': label, 'Data': value}
+
+        for (label, index) in self._int_columns:
+            data_dict[label] = {'Name': label, 'Data': int(record[index])}
+
+        for (label, index) in self._latlon_columns:
+            # convert latitiude/longitude strings to decimal degrees
+            data_dict[label] = {'Name': label,
+                                'Data': self._string_to_ddegrees(record[index])}
 
         log.trace("Data dict parsed: %s", data_dict)
         return data_dict
@@ -623,19 +672,33 @@ class GliderParser(BufferLoadingParser):
         # set defaults
         result_particles = []
 
-        log.debug("BUFFER: %s", self._chunker.buffer)
-        # collect the data from the file
+        # collect the data records from the file, splitting the ones that
+        # match so their columns can be converted as a block
+        data_records = []
+        samples = []
         (timestamp, data_record, start, end) = self._chunker.get_next_data_with_index()
 
         while data_record is not None:
-            log.debug("data record: %s", data_record)
             if self._sample_regex.match(data_record):
+                record = data_record.split()
+                samples.append(record)
+            else:
+                record = None
+
+            data_records.append((data_record, record, end))
+            (timestamp, data_record, start, end) = self._chunker.get_next_data_with_index()
+
+        float_values = iter(self._read_float_columns(samples))
+
+        for (data_record, record, end) in data_records:
+            log.debug("data record: %s", data_record)
+            if record is not None:
                 exception_detected = False
 
                 # parse the data record into a data dictionary to pass to the
                 # particle class
                 try:
-                    data_dict = self._read_data(data_record)
+                    data_dict = self._read_data(record, next(float_values))
                 except SampleException as e:
                     exception_detected = True
                     self._exception_callback(e)
@@ -670,24 +733,19 @@ class GliderParser(BufferLoadingParser):
                 log.error("Data record did not match data pattern.  Failed parsing: '%s'", data_record)
                 self._exception_callback(SampleException("data record does not match sample pattern: '%s'" % data_record))
 
-            (timestamp, data_record, start, end) = self._chunker.get_next_data_with_index()
-
         # publish the results
         return result_particles
 
     def _has_science_data(self, data_dict):
         """
-        Examine the data_dict to see if it contains science data.
+        Examine the data_dict to see if it contains science data. Only the
+        science columns found by _read_column_schema are looked at.
         """
-        log.debug("Looking for data in science parameters: %s", self._particle_class.science_parameters)
-        for key in data_dict.keys():
-            if key in self._particle_class.science_parameters:
-                value = data_dict[key]['Data']
-                if not np.isnan(value):
-                    log.debug("Found science value for key: %s, value: %s", key, value)
-                    return True
-                else:
-                    log.debug("Science data value is nan: %s %s", key, value)
+        for key in self._science_labels:
+            value = data_dict[key]['Data']
+            if not np.isnan(value):
+                log.debug("Found science value for key: %s, value: %s", key, value)
+                return True
 
         log.debug("No science data found!")
         return False
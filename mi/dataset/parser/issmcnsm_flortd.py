@@ -15,9 +15,6 @@ __license__ = 'Apache 2.0'
 
 import copy
 import re
-import ntplib
-import time
-from dateutil import parser
 from functools import partial
 
 from mi.core.log import get_logger ; log = get_logger()
@@ -26,6 +23,7 @@ from mi.core.instrument.data_particle import DataParticle, DataParticleKey
 from mi.core.exceptions import SampleException, DatasetParserException
 from mi.dataset.dataset_parser import BufferLoadingParser
 from mi.core.instrument.chunker import StringChunker
+from mi.core.time import fields_to_ntp_date_time, seconds_to_microseconds
 
 # there are two timestamps, the log timestamp and data timestamp
 # the internal timestamp uses the regex for the log timestamp
@@ -208,17 +206,15 @@ class Issmcnsm_flortdParser(BufferLoadingParser):
         if not match:
             raise ValueError("Invalid time format: %s" % ts_str)
 
-        zulu_ts = "%04d-%02d-%02dT%02d:%02d:%fZ" % (
+        # seconds are SS.sss
+        seconds = match.group(6)
+        ntptime = fields_to_ntp_date_time(
             int(match.group(1)), int(match.group(2)), int(match.group(3)),
-            int(match.group(4)), int(match.group(5)), float(match.group(6))
+            int(match.group(4)), int(match.group(5)), int(seconds[:2]),
+            seconds_to_microseconds(seconds[3:])
         )
-        log.trace("converted ts '%s' to '%s'", ts_str[match.start(0):(match.start(0) + 24)], zulu_ts)
 
-        converted_time = float(parser.parse(zulu_ts).strftime("%s.%f"))
-        adjusted_time = converted_time - time.timezone
-        ntptime = ntplib.system_to_ntp_time(adjusted_time)
-
-        log.trace("Converted time \"%s\" (unix: %s) into %s", ts_str, adjusted_time, ntptime)
+        log.trace("Converted time \"%s\" into %s", ts_str[match.start(0):(match.start(0) + 24)], ntptime)
         return ntptime
 
     def parse_chunks(self):
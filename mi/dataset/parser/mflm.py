@@ -11,8 +11,9 @@ from the common MFLM control file.
 __author__ = 'Emily Hahn'
 __license__ = 'Apache 2.0'
 
+import os
 import re
-import struct
+import bisect
 import binascii
 
 from mi.core.common import BaseEnum
@@ -21,6 +22,7 @@ from mi.core.instrument.chunker import StringChunker
 from mi.core.exceptions import DatasetParserException
 from mi.core.instrument.data_particle import DataParticleKey
 from mi.dataset.dataset_parser import Parser
+from mi.dataset.parser import sio_crc
 
 # SIO Main controller header and data for ctdmo in binary
 # groups: ID, Number of Data Bytes, POSIX timestamp, block number, data
@@ -75,9 +77,7 @@ class MflmParser(Parser):
         self._position = [0,0] # store both the start and end point for this read of data within the file
         self._record_buffer = [] # holds list of records
         # determine the EOF index
-        self._stream_handle.seek(0)
-        all_data = self._stream_handle.read()
-        EOF = len(all_data)
+        EOF = self._get_file_size()
         self._stream_handle.seek(0)
         self._new_seq_flag = True # always start a new sequence on init
         self._chunk_sample_count = []
@@ -92,6 +92,18 @@ class MflmParser(Parser):
         if state:
             self.set_state(self._state)
 
+    def _get_file_size(self):
+        """
+        Get the size of the file without reading it, from fstat if the stream
+        is a real file, otherwise by seeking to the end.
+        @retval size of the file in bytes
+        """
+        try:
+            return os.fstat(self._stream_handle.fileno()).st_size
+        except (AttributeError, IOError, OSError):
+            self._stream_handle.seek(0, os.SEEK_END)
+            return self._stream_handle.tell()
+
     def sieve_function(self, raw_data):
         """
         Sort through the raw data to identify new blocks of data that need processing.
@@ -135,31 +147,7 @@ class MflmParser(Parser):
         """
         Calculate SIO header checksum of data
         """
-        crc = 65535
-        if len(data) == 0:
-            return '0000'
-        for iData in range(0,len(data)):
-            short = struct.unpack('H', data[iData] + '\x00')
-            point = 255 & short[0]
-            crc = crc ^ point
-            for i in range(7, -1, -1):
-                if crc & 1:
-                    crc = (crc >> 1) ^ 33800
-                else:
-                    crc >>= 1
-        crc = ~crc
-        # convert to unsigned
-        if crc < 0:
-            crc += 65536
-        # get rid of the '0x' from the hex string
-        crc = "%s" % hex(crc)[2:].upper()
-        # make sure we have the right format for comparing, must be 4 hex digits
-        if len(crc) == 3:
-            crc = '0' + crc
-        elif len(crc) == 2:
-            crc = '00' + crc
-        elif len(crc) == 1:
-            crc = '000' + crc
+        crc = sio_crc.checksum(data)
         log.trace("calculated checksum %s", crc)
         return crc
 
@@ -293,25 +281,33 @@ class MflmParser(Parser):
             combined_packets = self._combine_adjacent_packets(adj_packets)
             # loop over combined packets and remove them from unprocessed data
             for packet in combined_packets:
-                # find which unprocessed section this packet is in
-                for unproc in self._read_state[StateKey.UNPROCESSED_DATA]:
-                    if packet[0] >= unproc[0] and packet[1] <= unproc[1]:
-                        # packet is within this unprocessed data, remove it
-                        self._read_state[StateKey.UNPROCESSED_DATA].remove(unproc)
-                        # add back any data still unprocessed on either side
-                        if packet[0] > unproc[0]:
-                            self._read_state[StateKey.UNPROCESSED_DATA].append([unproc[0], packet[0]])
-                        if packet[1] < unproc[1]:
-                            self._read_state[StateKey.UNPROCESSED_DATA].append([packet[1], unproc[1]])
-                        # once we have found which unprocessed section this packet is in,
-                        # move on to next packet
-                        break;
-                self._read_state[StateKey.UNPROCESSED_DATA] = sorted(self._read_state[StateKey.UNPROCESSED_DATA])
-                self._read_state[StateKey.UNPROCESSED_DATA] = self._combine_adjacent_packets(
-                    self._read_state[StateKey.UNPROCESSED_DATA])
+                self._remove_unprocessed(packet)
 
         self._read_state[StateKey.TIMESTAMP] = timestamp
 
+    def _remove_unprocessed(self, packet):
+        """
+        Remove a processed packet from the unprocessed data, adding back any
+        data still unprocessed on either side of it. The unprocessed data is
+        kept sorted and non overlapping, so the section holding the packet is
+        found by bisection and replaced in place, which keeps it sorted.
+        @param packet The [start, end] of the processed packet
+        """
+        unprocessed = self._read_state[StateKey.UNPROCESSED_DATA]
+        # the last section starting at or before the packet is the only one that can hold it
+        idx = bisect.bisect_right(unprocessed, [packet[0], float('inf')]) - 1
+        if idx < 0 or packet[1] > unprocessed[idx][1]:
+            log.debug('Packet %s is not in unprocessed data', packet)
+            return
+
+        unproc = unprocessed[idx]
+        remaining = []
+        if packet[0] > unproc[0]:
+            remaining.append([unproc[0], packet[0]])
+        if packet[1] < unproc[1]:
+            remaining.append([packet[1], unproc[1]])
+        unprocessed[idx:idx + 1] = remaining
+
     def _clean_all_chunker(self):
         """
         Clean out the chunker of all possible data types
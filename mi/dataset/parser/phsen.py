@@ -14,16 +14,13 @@ __author__ = 'Emily Hahn'
 __license__ = 'Apache 2.0'
 
 import re
-import ntplib
-import time
-from datetime import datetime
-from dateutil import parser
 
 from mi.core.log import get_logger ; log = get_logger()
 from mi.core.common import BaseEnum
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey
 from mi.core.exceptions import SampleException, DatasetParserException
 from mi.dataset.parser.mflm import MflmParser, SIO_HEADER_MATCHER
+from mi.core.time import unix_to_ntp_time, UNIX_TIME_1904
 
 DATA_REGEX = b'\^0A\r\*([0-9A-Fa-f]{4})0A([0-9A-Fa-f]{458})\r'
 DATA_MATCHER = re.compile(DATA_REGEX)
@@ -240,12 +237,8 @@ class PhsenParser(MflmParser):
         @retval ntptime time in ntp format 
         """
         sec_since_1904 = int(hex_time, 16)
-        local_dt_1904 = parser.parse("1904-01-01T00:00:00.00Z")
-        elapse_1904 = float(local_dt_1904.strftime("%s.%f"))
-        log.debug('seconds since 1904 %d, elapsed 1904 %d', sec_since_1904, elapse_1904)
-        sec_since_1970 = sec_since_1904 + elapse_1904 - time.timezone
-        log.debug("Got time %s", datetime.utcfromtimestamp(sec_since_1970))
-        ntptime = ntplib.system_to_ntp_time(sec_since_1970)
+        sec_since_1970 = sec_since_1904 + UNIX_TIME_1904
+        ntptime = unix_to_ntp_time(sec_since_1970)
         log.debug("Converted time \"%s\" (unix: %s) into %s", hex_time,
                               sec_since_1970, ntptime)
         return ntptime
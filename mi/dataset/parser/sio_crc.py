@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.parser.sio_crc
+@file mi/dataset/parser/sio_crc.py
+@brief Checksum of the data blocks framed by SIO controller headers.
+
+The SIO checksum is the reflected CRC-16 with polynomial 0x8408, an initial
+value of 0xFFFF and the result inverted (CRC-16/X-25). A reflected CRC is
+the same as the non reflected CRC (polynomial 0x1021) of the data with the
+bits of each byte reversed, itself bit reversed. binascii.crc_hqx
+calculates the non reflected CRC from a table in C, and str.translate
+reverses the bytes with a table, so no python code runs per byte.
+"""
+
+__license__ = 'Apache 2.0'
+
+import binascii
+
+# each byte value with its bits reversed, for str.translate
+BIT_REVERSED_BYTES = ''.join(chr(int('{0:08b}'.format(i)[::-1], 2)) for i in range(256))
+
+CRC_INIT = 0xFFFF
+
+
+def reverse16(value):
+    """
+    Reverse the bits of a 16 bit value.
+    @param value 16 bit integer
+    @retval value with its bits reversed
+    """
+    return (ord(BIT_REVERSED_BYTES[value & 0xFF]) << 8) | ord(BIT_REVERSED_BYTES[value >> 8])
+
+
+def crc(data):
+    """
+    Calculate the SIO CRC of data.
+    @param data string of bytes
+    @retval CRC as an integer
+    """
+    value = binascii.crc_hqx(data.translate(BIT_REVERSED_BYTES), reverse16(CRC_INIT))
+    return ~reverse16(value) & 0xFFFF
+
+
+def checksum(data):
+    """
+    Calculate the SIO CRC of data in the form it appears in the SIO header.
+    @param data string of bytes
+    @retval CRC as 4 upper case hex digits
+    """
+    return '%04X' % crc(data)
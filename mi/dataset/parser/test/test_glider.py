@@ -305,6 +305,48 @@ class CTDGVGliderTest(GliderParserUnitTestCase):
         self.assert_generate_particle(GgldrCtdgvDelayedDataParticle, record_2, 1321)
         self.assert_no_more_data()
 
+    def test_wide_record(self):
+        """
+        Verify files with many more columns than the particle uses are parsed,
+        full glider files carry hundreds of sensors.
+        """
+        extra = 500
+        header = HEADER.replace('sensors_per_cycle: 29', 'sensors_per_cycle: %d' % (29 + extra))
+        header = header.replace(' sci_water_temp\n', ' sci_water_temp' +
+                                ''.join(' x_extra_%d' % i for i in range(extra)) + '\n')
+        header = header.replace(' bar degc\n', ' bar degc' + ' nodim' * extra + '\n')
+        header += ' 4' * extra
+        record = ''.join('\n' + line.rstrip() + ' NaN' * extra
+                         for line in CTDGR_RECORD.strip().split('\n'))
+
+        self.set_data(header, record)
+        self.reset_parser()
+
+        records = self.parser.get_records(2)
+        self.assertEqual(len(records), 2)
+        self.assert_particle_values(records[0], {CtdgvParticleKey.SCI_WATER_TEMP: 15.3683})
+        self.assert_particle_values(records[1], {CtdgvParticleKey.SCI_WATER_TEMP: 15.3703})
+
+    def test_bad_float_value(self):
+        """
+        Verify a value that matches the sample pattern but is not a number
+        only rejects the record holding it.
+        """
+        self.error_callback_values = []
+        bad_record = CTDGR_RECORD.replace('15.3683', '1.2.3')
+        self.assertNotEqual(bad_record, CTDGR_RECORD)
+
+        self.set_data(HEADER, bad_record)
+        self.reset_parser()
+
+        records = self.parser.get_records(2)
+        self.assertEqual(len(records), 1)
+        self.assert_particle_values(records[0], {CtdgvParticleKey.SCI_WATER_TEMP: 15.3703})
+
+        self.assertEqual(len(self.error_callback_values), 1)
+        self.assertIsInstance(self.error_callback_values[0], SampleException)
+        self.assertIn('1.2.3', str(self.error_callback_values[0]))
+
     def test_gps(self):
         self.set_data(HEADER, ZERO_GPS_VALUE)
         self.reset_parser()
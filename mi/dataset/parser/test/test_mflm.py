@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.parser.test.test_mflm
+@file mi/dataset/parser/test/test_mflm.py
+@brief Test code for the common MFLM parser file size and unprocessed data
+"""
+
+__license__ = 'Apache 2.0'
+
+import os
+import tempfile
+from nose.plugins.attrib import attr
+from StringIO import StringIO
+
+from mi.dataset.test.test_parser import ParserUnitTestCase
+from mi.dataset.parser.mflm import MflmParser, StateKey
+
+@attr('UNIT', group='mi')
+class MflmParserUnitTestCase(ParserUnitTestCase):
+    """
+    Test the MflmParser file size and unprocessed data bookkeeping
+    """
+    def create_parser(self, stream_handle):
+        return MflmParser({}, stream_handle, None, None,
+                          lambda state: None, lambda particles: None, 'CT')
+
+    def assert_remove(self, unprocessed, packet, expected):
+        """
+        Remove packet from the unprocessed data and check what is left
+        """
+        parser = self.create_parser(StringIO(''))
+        parser._read_state[StateKey.UNPROCESSED_DATA] = unprocessed
+        parser._remove_unprocessed(packet)
+        self.assertEqual(parser._read_state[StateKey.UNPROCESSED_DATA], expected)
+
+    def test_file_size(self):
+        """
+        The file size comes from a real file or a StringIO, and the parser
+        starts reading from the beginning of the file
+        """
+        data = 'x' * 1234
+        parser = self.create_parser(StringIO(data))
+        self.assertEqual(parser._read_state[StateKey.UNPROCESSED_DATA], [[0, 1234]])
+        self.assertEqual(parser._stream_handle.tell(), 0)
+        self.assertEqual(parser._get_file_size(), 1234)
+
+        fd, path = tempfile.mkstemp()
+        try:
+            os.write(fd, data)
+            os.close(fd)
+            with open(path, 'rb') as stream_handle:
+                parser = self.create_parser(stream_handle)
+                self.assertEqual(parser._read_state[StateKey.UNPROCESSED_DATA], [[0, 1234]])
+                self.assertEqual(stream_handle.tell(), 0)
+                # a real file is sized without reading or seeking it
+                self.assertEqual(parser._get_file_size(), 1234)
+                self.assertEqual(stream_handle.tell(), 0)
+        finally:
+            os.remove(path)
+
+    def test_remove_unprocessed(self):
+        """
+        A packet at the start, middle or end of a range leaves the rest of it
+        """
+        unprocessed = [[0, 100], [200, 300], [400, 500]]
+        self.assert_remove([list(r) for r in unprocessed], [200, 250],
+                           [[0, 100], [250, 300], [400, 500]])
+        self.assert_remove([list(r) for r in unprocessed], [220, 250],
+                           [[0, 100], [200, 220], [250, 300], [400, 500]])
+        self.assert_remove([list(r) for r in unprocessed], [250, 300],
+                           [[0, 100], [200, 250], [400, 500]])
+        self.assert_remove([list(r) for r in unprocessed], [0, 10],
+                           [[10, 100], [200, 300], [400, 500]])
+        self.assert_remove([list(r) for r in unprocessed], [490, 500],
+                           [[0, 100], [200, 300], [400, 490]])
+
+    def test_remove_whole_range(self):
+        """
+        A packet covering a whole range removes the range
+        """
+        self.assert_remove([[0, 100], [200, 300], [400, 500]], [200, 300],
+                           [[0, 100], [400, 500]])
+        self.assert_remove([[0, 100]], [0, 100], [])
+
+    def test_remove_not_unprocessed(self):
+        """
+        A packet that is not in the unprocessed data leaves it unchanged
+        """
+        unprocessed = [[100, 200], [300, 400]]
+        # before the first range, between ranges, after the last range
+        for packet in ([0, 50], [220, 280], [450, 500]):
+            self.assert_remove([list(r) for r in unprocessed], packet, unprocessed)
+        # overlapping the end of a range or spanning two
+        for packet in ([150, 250], [50, 150], [150, 350]):
+            self.assert_remove([list(r) for r in unprocessed], packet, unprocessed)
+        self.assert_remove([], [0, 10], [])
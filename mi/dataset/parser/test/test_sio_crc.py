@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.parser.test.test_sio_crc
+@file mi/dataset/parser/test/test_sio_crc.py
+@brief Test code for the SIO block checksum
+"""
+
+import os
+from nose.plugins.attrib import attr
+
+from mi.core.unit_test import MiUnitTestCase
+from mi.dataset.parser import sio_crc
+
+
+def bitwise_checksum(data):
+    """
+    The SIO CRC calculated a bit at a time, as the checksum is specified.
+    """
+    crc = 0xFFFF
+    for char in data:
+        crc ^= ord(char)
+        for i in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ 0x8408
+            else:
+                crc >>= 1
+    return '%04X' % (~crc & 0xFFFF)
+
+
+@attr('UNIT', group='mi')
+class SioCrcUnitTestCase(MiUnitTestCase):
+
+    def test_known_block(self):
+        """
+        Checksums from SIO headers in node files
+        """
+        self.assertEqual(sio_crc.checksum('\n18.72 17.4 2 1 1\n'), 'C3AF')
+        self.assertEqual(sio_crc.checksum('\x158Sf\x9e\x1a\xa2\x0c\x81\xd5\x81\x19\r5;\xa2\x10\xc3Z'
+                                          '\xe7\n\x81\xd5\x81\x19\r79L\xe0\xc3T\xe6\n\x81\xd5\x81\x19\r'),
+                         '507E')
+        self.assertEqual(sio_crc.checksum(''), '0000')
+
+    def test_bitwise(self):
+        """
+        Compare with the bitwise calculation over all byte values and lengths
+        """
+        self.assertEqual(sio_crc.checksum(''.join(chr(i) for i in range(256))),
+                         bitwise_checksum(''.join(chr(i) for i in range(256))))
+
+        for length in range(64):
+            data = os.urandom(length)
+            self.assertEqual(sio_crc.checksum(data), bitwise_checksum(data))
+            self.assertEqual(sio_crc.crc(data), int(bitwise_checksum(data), 16))
@@ -13,14 +13,12 @@ __license__ = 'Apache 2.0'
 
 import copy
 import re
-import time
-import ntplib
-from dateutil import parser
 from functools import partial
 
 from mi.core.log import get_logger ; log = get_logger()
 
 from mi.core.common import BaseEnum
+from mi.core.time import fields_to_ntp_date_time
 from mi.core.exceptions import SampleException, DatasetParserException
 from mi.core.instrument.chunker import StringChunker
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey
@@ -40,6 +38,10 @@ DATA_MATCHER = re.compile(DATA_REGEX, re.DOTALL)
 VEL_DATA_REGEX = r'(\d*\-\d*\-\d*\s*\d*:\d*:[\.\d]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*),([\-\d\.]*)'
 VEL_DATA_MATCHER = re.compile(VEL_DATA_REGEX, re.DOTALL)
 
+# M/D/YYYY H:M:S or M-D-YYYY H:M:S
+TS_REGEX = r'(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})\s*(\d{1,2}):(\d{1,2}):(\d{1,2})'
+TS_MATCHER = re.compile(TS_REGEX, re.DOTALL)
+
 
 
 class StateKey(BaseEnum):
@@ -108,24 +110,12 @@ class WfpParticle(DataParticle):
         """
         Convert passed in zulu timestamp string to a ntp timestamp float
         """
-        log.trace("ts_string = " + ts_string)
+        log.trace("ts_string = %s", ts_string)
 
-        TS_REGEX = r'(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})\s*(\d{1,2}):(\d{1,2}):(\d{1,2})'
-        TS_MATCHER = re.compile(TS_REGEX, re.DOTALL)
         m = TS_MATCHER.match(ts_string)
 
-        zulu_ts = "%04d-%02d-%02dT%02d:%02d:%02dZ" % (
-            int(m.group(3)), int(m.group(1)), int(m.group(2)),
-            int(m.group(4)), int(m.group(5)), int(m.group(6))
-        )
-        log.trace("converted ts '%s' to '%s'", ts_string, zulu_ts)
-
-        localtime_offset = float(parser.parse("1970-01-01T00:00:00.00Z").strftime("%s.%f"))
-        converted_time = float(parser.parse(zulu_ts).strftime("%s.%f"))
-        adjusted_time = round(converted_time - localtime_offset)
-        ntptime = ntplib.system_to_ntp_time(adjusted_time)
-
-        return ntptime
+        return fields_to_ntp_date_time(int(m.group(3)), int(m.group(1)), int(m.group(2)),
+                                       int(m.group(4)), int(m.group(5)), int(m.group(6)))
 
     def __eq__(self, arg):
         """
@@ -305,10 +295,7 @@ class WfpParser(BufferLoadingParser):
         if not (StateKey.POSITION in state_obj):
             raise DatasetParserException("Invalid state keys")
 
-        self._chunker.buffer = ""
-        self._chunker.raw_chunk_list = []
-        self._chunker.data_chunk_list = []
-        self._chunker.nondata_chunk_list = []
+        self._chunker.clean_all_chunks()
         self._record_buffer = []
         self._state = state_obj
         self._read_state = state_obj
@@ -22,9 +22,10 @@ from ion.agents.agent_stream_publisher import AgentStreamPublisher
 
 from pyon.public import log
 
-import json
 import uuid
 
+from mi.core.instrument.data_particle import decode_particle
+
 
 class IDKAgentStreamPublisher(AgentStreamPublisher):
     def _publish_stream_buffer(self, stream_name):
@@ -77,7 +78,7 @@ class InstrumentAgent(ion.agents.instrument.instrument_agent.InstrumentAgent):
         '''
         # If the sample event is encoded, load it back to a dict.
         if isinstance(val, str):
-            val = json.loads(val)
+            val = decode_particle(val)
         try:
             stream_name = val['stream_name']
             
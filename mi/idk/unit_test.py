@@ -82,6 +82,7 @@ from mi.core.instrument.data_particle import DataParticle
 from mi.core.instrument.data_particle import DataParticleKey
 from mi.core.instrument.data_particle import DataParticleValue
 from mi.core.instrument.data_particle import RawDataParticleKey
+from mi.core.instrument.data_particle import decode_particle
 from mi.core.instrument.instrument_driver import DriverEvent
 from mi.core.instrument.instrument_driver import DriverConnectionState
 from mi.core.instrument.instrument_driver import DriverProtocolState
@@ -851,7 +852,7 @@ class InstrumentDriverTestCase(MiIntTestCase):
             result = []
             for evt in samples:
                 value = evt.get('value')
-                particle = json.loads(value)
+                particle = decode_particle(value)
                 if(particle and particle.get('stream_name') == type):
                     result.append(evt)
 
@@ -1214,8 +1215,10 @@ class InstrumentDriverUnitTestCase(InstrumentDriverTestCase):
         event_type = event['type']
         if event_type == DriverAsyncEvent.SAMPLE:
             sample_value = event['value']
-            particle_dict = json.loads(sample_value)
+            particle_dict = decode_particle(sample_value)
             self._data_particle_received.append(sample_value)
+        elif event_type == DriverAsyncEvent.SAMPLE_BATCH:
+            self._data_particle_received.extend(event['value'])
 
     def compare_parsed_data_particle(self, particle_type, raw_input, happy_structure):
         """
@@ -1328,9 +1331,11 @@ class InstrumentDriverUnitTestCase(InstrumentDriverTestCase):
 
         # Push the data into the driver
         driver._protocol.got_raw(port_agent_packet)
+        # send samples held back by protocols that batch them
+        driver._protocol._flush_samples()
         self.assertEqual(len(self._data_particle_received), 1)
         particle = self._data_particle_received.pop()
-        particle_dict = json.loads(particle)
+        particle_dict = decode_particle(particle)
         log.debug("Raw Particle: %s", particle_dict)
 
         # Verify the data particle
@@ -1362,11 +1367,13 @@ class InstrumentDriverUnitTestCase(InstrumentDriverTestCase):
 
         # Push the data into the driver
         driver._protocol.got_data(port_agent_packet)
+        # send samples held back by protocols that batch them
+        driver._protocol._flush_samples()
 
         # Find all particles of the correct data particle types (not raw)
         particles = []
         for p in self._data_particle_received:
-            particle_dict = json.loads(p)
+            particle_dict = decode_particle(p)
             stream_type = particle_dict.get('stream_name')
             self.assertIsNotNone(stream_type)
             if(stream_type != CommonDataParticleType.RAW):
@@ -1875,7 +1882,7 @@ class InstrumentDriverIntegrationTestCase(InstrumentDriverTestCase):   # Must in
         value = sample.get('value')
         self.assertIsNotNone(value)
 
-        particle = json.loads(value)
+        particle = decode_particle(value)
         self.assertIsNotNone(particle)
 
         particle_callback(particle)
@@ -1901,7 +1908,7 @@ class InstrumentDriverIntegrationTestCase(InstrumentDriverTestCase):   # Must in
                 value = sample.get('value')
                 self.assertIsNotNone(value)
 
-                particle = json.loads(value)
+                particle = decode_particle(value)
                 self.assertIsNotNone(particle)
 
                 # So we have found one particle and verified it.  We are done here!
@@ -32,12 +32,17 @@ from cPickle import Unpickler
 from cStringIO import StringIO
 
 import string
+import time
+import base64
 
 import ntplib
+import numpy as np
 
 from mi.core.log import get_logger ; log = get_logger()
 
 from mi.core.common import BaseEnum
+from mi.core.exceptions import InstrumentParameterException
+from mi.core.time import unix_to_ntp_time
 from mi.core.instrument.instrument_protocol import CommandResponseInstrumentProtocol
 from mi.core.instrument.instrument_fsm import InstrumentFSM
 from mi.core.instrument.instrument_driver import SingleConnectionInstrumentDriver
@@ -50,6 +55,10 @@ from mi.core.instrument.data_particle import DataParticle
 from mi.core.instrument.data_particle import DataParticleKey
 from mi.core.instrument.data_particle import CommonDataParticleType
 from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.protocol_param_dict import ParameterDictType
+from mi.core.instrument.protocol_param_dict import ParameterDictVisibility
+# Parameter is this driver's parameter enum
+from mi.core.instrument.protocol_param_dict import Parameter as DictParameter
 from mi.core.instrument.driver_dict import DriverDictKey
 
 
@@ -59,6 +68,9 @@ NEWLINE = '\r\n'
 # default timeout.
 TIMEOUT = 10
 
+# range of samples sent as 32 bit integers in binary packet particles
+INT32 = np.iinfo(np.int32)
+
 ###
 #    Driver Constant Definitions
 ###
@@ -70,8 +82,23 @@ class DataParticleType(BaseEnum):
     RAW = CommonDataParticleType.RAW
 
     HYDLF_SAMPLE = 'hydlf_sample'
+    HYDLF_PACKET = 'hydlf_packet'
 #    HYDLF_STATUS = 'hydlf_status'
 
+class ParticleMode(BaseEnum):
+    """
+    How the samples in an orb packet are published
+    """
+    # one hydlf_sample particle per sample per channel
+    SAMPLE = 'sample'
+    # one hydlf_packet particle per channel holding a list of the samples
+    PACKET = 'packet'
+    # one hydlf_packet particle per channel holding the samples as a base64
+    # encoded array
+    BINARY_PACKET = 'binary_packet'
+
+DEFAULT_PARTICLE_MODE = ParticleMode.SAMPLE
+
 class ProtocolState(BaseEnum):
     """
     Instrument protocol states
@@ -117,6 +144,8 @@ class Parameter(DriverParameter):
     Device specific parameters.
     """
     # JML: select/reject goes here?
+    # ParticleMode the samples are published with, a driver setting only
+    PARTICLE_MODE = 'particle_mode'
 
 class Prompt(BaseEnum):
     """
@@ -204,6 +233,112 @@ class HYDLF_SampleDataParticle(DataParticle):
         return result
 
 
+class HYDLF_PacketDataParticleKey(BaseEnum):
+    # From Channel object
+    CALIB = 'calib'
+    CALPER = 'calper'
+    CHAN = 'chan'
+    LOC = 'loc'
+    NET = 'net'
+    NSAMP = 'nsamp'
+    SAMPRATE = 'samprate'
+    SEGTYPE = 'segtype'
+    STA = 'sta'
+    TIME = 'time'
+    SAMPLES = 'samples'
+    # numpy dtype string of the samples array, binary packets only
+    SAMPLE_FORMAT = 'sample_format'
+
+
+class HYDLF_PacketDataParticle(DataParticle):
+    """
+    All the samples of one channel of an orb packet. The internal timestamp
+    is the time of the first sample, sample i was taken at
+    time + i / samprate; see sample_times.
+    """
+    _data_particle_type = DataParticleType.HYDLF_PACKET
+
+    # send the samples as a base64 encoded little endian array instead of a
+    # list of numbers
+    _binary_samples = False
+
+    def _build_parsed_values(self):
+
+        chan = self.raw_data
+
+        self.set_internal_timestamp(unix_time=chan['time'])
+
+        result = []
+        pk = HYDLF_PacketDataParticleKey
+        vid = DataParticleKey.VALUE_ID
+        v = DataParticleKey.VALUE
+
+        # Copy this stuff verbatim from the Antelope PktChannel object
+        result.append({vid: pk.CALIB, v: chan[pk.CALIB]})
+        result.append({vid: pk.CALPER, v: chan[pk.CALPER]})
+        result.append({vid: pk.CHAN, v: chan[pk.CHAN]})
+        result.append({vid: pk.LOC, v: chan[pk.LOC]})
+        result.append({vid: pk.NET, v: chan[pk.NET]})
+        result.append({vid: pk.NSAMP, v: chan[pk.NSAMP]})
+        result.append({vid: pk.SAMPRATE, v: chan[pk.SAMPRATE]})
+        result.append({vid: pk.SEGTYPE, v: chan[pk.SEGTYPE]})
+        result.append({vid: pk.STA, v: chan[pk.STA]})
+        # timestamp of samples[0]
+        result.append({vid: pk.TIME, v: chan[pk.TIME]})
+
+        samples = chan['data']
+        if self._binary_samples:
+            samples = np.asarray(samples)
+            if samples.dtype.kind == 'i' and samples.dtype.itemsize > 4 and len(samples) and \
+                    INT32.min <= samples.min() and samples.max() <= INT32.max:
+                # digitizer counts are 32 bit, python ints come in as 64 bit
+                samples = samples.astype('<i4')
+            samples = samples.astype(samples.dtype.newbyteorder('<'), copy=False)
+            result.append({vid: pk.SAMPLE_FORMAT, v: samples.dtype.str})
+            result.append({vid: pk.SAMPLES, v: base64.b64encode(samples.tostring()),
+                           DataParticleKey.BINARY: True})
+        elif isinstance(samples, np.ndarray):
+            result.append({vid: pk.SAMPLES, v: samples.tolist()})
+        else:
+            result.append({vid: pk.SAMPLES, v: list(samples)})
+        return result
+
+    @staticmethod
+    def sample_times(start_time, samprate, nsamp):
+        """
+        Get the time of each sample in a packet particle.
+        @param start_time unix time of the first sample, the time value
+        @param samprate samples per second, the samprate value
+        @param nsamp number of samples
+        @retval numpy array of the NTP timestamp of each sample
+        """
+        return unix_to_ntp_time(start_time + np.arange(nsamp) / float(samprate))
+
+    @staticmethod
+    def decode_samples(samples, sample_format):
+        """
+        Get the samples of a binary packet particle.
+        @param samples base64 encoded samples value
+        @param sample_format the sample_format value
+        @retval numpy array of the samples
+        """
+        return np.frombuffer(base64.b64decode(samples), dtype=sample_format)
+
+
+class HYDLF_BinaryPacketDataParticle(HYDLF_PacketDataParticle):
+    """
+    Packet particle with the samples sent as a base64 encoded array.
+    """
+    _binary_samples = True
+
+
+# particle class published for each channel of an orb packet, by particle mode
+PACKET_PARTICLE_CLASSES = {
+    ParticleMode.PACKET: HYDLF_PacketDataParticle,
+    ParticleMode.BINARY_PACKET: HYDLF_BinaryPacketDataParticle,
+}
+
+
 # Status would go here I guess
 # port_agent_antelope happily sends along parameter file (antelope's proprietary
 # JSON-like serialization format) and string packets, if there are any. They
@@ -221,11 +356,15 @@ class InstrumentDriver(SingleConnectionInstrumentDriver):
     Subclasses SingleConnectionInstrumentDriver with connection state
     machine.
     """
-    def __init__(self, evt_callback):
+    def __init__(self, evt_callback, particle_mode=DEFAULT_PARTICLE_MODE):
         """
         Driver constructor.
         @param evt_callback Driver process event callback.
+        @param particle_mode ParticleMode the protocol publishes samples with
+            unless the particle_mode parameter is set
         """
+        self._particle_mode = particle_mode
+
         #Construct superclass.
         SingleConnectionInstrumentDriver.__init__(self, evt_callback)
 
@@ -247,7 +386,7 @@ class InstrumentDriver(SingleConnectionInstrumentDriver):
         """
         Construct the driver protocol state machine.
         """
-        self._protocol = Protocol(Prompt, NEWLINE, self._driver_event)
+        self._protocol = Protocol(Prompt, NEWLINE, self._driver_event, self._particle_mode)
 
 
 ###########################################################################
@@ -259,13 +398,20 @@ class Protocol(CommandResponseInstrumentProtocol):
     Instrument protocol class
     Subclasses CommandResponseInstrumentProtocol
     """
-    def __init__(self, prompts, newline, driver_event):
+    def __init__(self, prompts, newline, driver_event, particle_mode=DEFAULT_PARTICLE_MODE):
         """
         Protocol constructor.
         @param prompts A BaseEnum class containing instrument prompts.
         @param newline The newline.
         @param driver_event Driver process event callback.
+        @param particle_mode default ParticleMode to publish samples with,
+            the particle_mode parameter can change it
+        @throws InstrumentParameterException if the particle mode is unknown
         """
+        if not ParticleMode.has(particle_mode):
+            raise InstrumentParameterException("unknown particle mode: %s" % particle_mode)
+        self._default_particle_mode = particle_mode
+
         # Construct protocol superclass.
         CommandResponseInstrumentProtocol.__init__(self, prompts, newline, driver_event)
 
@@ -283,7 +429,7 @@ class Protocol(CommandResponseInstrumentProtocol):
         self._protocol_fsm.add_handler(ProtocolState.COMMAND, ProtocolEvent.ENTER, self._handler_command_enter)
         self._protocol_fsm.add_handler(ProtocolState.COMMAND, ProtocolEvent.EXIT, self._handler_command_exit)
         self._protocol_fsm.add_handler(ProtocolState.COMMAND, ProtocolEvent.START_DIRECT, self._handler_command_start_direct)
-        self._protocol_fsm.add_handler(ProtocolState.COMMAND, ProtocolEvent.GET, self._handler_command_get)
+        self._protocol_fsm.add_handler(ProtocolState.COMMAND, ProtocolEvent.GET, self._handler_get)
         self._protocol_fsm.add_handler(ProtocolState.COMMAND, ProtocolEvent.SET, self._handler_command_set)
 
         self._protocol_fsm.add_handler(ProtocolState.AUTOSAMPLE, ProtocolEvent.ENTER, self._handler_autosample_enter)
@@ -297,10 +443,7 @@ class Protocol(CommandResponseInstrumentProtocol):
 
         # Construct the parameter dictionary containing device parameters,
         # current parameter values, and set formatting functions.
-        #
-        # JML: Not in OPTAA?
-        #
-        #self._build_param_dict()
+        self._build_param_dict()
 
         # Add build handlers for device commands.
 
@@ -374,19 +517,35 @@ class Protocol(CommandResponseInstrumentProtocol):
         """Generate a sequence of particles from orb_packet
 
         @returns An iterator which yields a new particle object for each sample
-        for each channel.
+        for each channel, or in the packet modes for each channel.
         """
+        # all the particles from a packet are made at the same time
+        driver_timestamp = ntplib.system_to_ntp_time(time.time())
+
+        particle_mode = self._param_dict.get(Parameter.PARTICLE_MODE)
+
         # TODO Might want to verify that the channel name matches a pattern,
         # e.g. the SEED standard for hydrophones.
+        if particle_mode != ParticleMode.SAMPLE:
+            particle_class = PACKET_PARTICLE_CLASSES[particle_mode]
+            for chan in orb_packet['channels']:
+                yield particle_class(
+                    raw_data = chan,
+                    port_timestamp = port_timestamp,
+                    preferred_timestamp = DataParticleKey.INTERNAL_TIMESTAMP,
+                    driver_timestamp = driver_timestamp
+                )
+            return
+
         for chan in orb_packet['channels']:
             for index, sample in enumerate(chan['data']):
                 # Yield a new particle
-                # TODO don't hardcode particle class
                 particle = HYDLF_SampleDataParticle(
                     # TODO: Fix this passing raw_data as tuple hack
                     raw_data = (orb_packet, chan, index, sample),
                     port_timestamp = port_timestamp,
-                    preferred_timestamp = DataParticleKey.INTERNAL_TIMESTAMP
+                    preferred_timestamp = DataParticleKey.INTERNAL_TIMESTAMP,
+                    driver_timestamp = driver_timestamp
                 )
                 yield particle
 
@@ -403,6 +562,59 @@ class Protocol(CommandResponseInstrumentProtocol):
         and value formatting function for set commands.
         """
         # Add parameter handlers to parameter dict.
+        # The instrument has no settings of its own, the particle mode is
+        # only used by the driver.
+        self._param_dict.add_parameter(
+            DictParameter(Parameter.PARTICLE_MODE,
+                          str,
+                          type=ParameterDictType.STRING,
+                          visibility=ParameterDictVisibility.READ_WRITE,
+                          display_name="Particle Mode",
+                          startup_param=True,
+                          default_value=self._default_particle_mode)
+        )
+        self._param_dict.set_default(Parameter.PARTICLE_MODE)
+
+    def _set_params(self, *args, **kwargs):
+        """
+        Set the driver parameters; none of them are sent to the instrument.
+        @param args[0] dict of parameter names and values
+        @param args[1] True if setting startup values
+        @retval dict of the parameters set and their values
+        @throws InstrumentParameterException if the parameters are missing or
+            invalid, or the particle mode is unknown
+        """
+        try:
+            params = args[0]
+        except IndexError:
+            raise InstrumentParameterException('Set command requires a parameter dict.')
+
+        try:
+            startup = args[1]
+        except IndexError:
+            startup = False
+
+        self._verify_not_readonly(params, startup)
+
+        for (key, val) in params.iteritems():
+            if not Parameter.has(key):
+                raise InstrumentParameterException("unknown parameter: %s" % key)
+            if key == Parameter.PARTICLE_MODE and not ParticleMode.has(val):
+                raise InstrumentParameterException("unknown particle mode: %s" % val)
+
+        config_change = False
+        result = {}
+        for (key, val) in params.iteritems():
+            log.debug("_set_params: %s = %s", key, val)
+            if self._param_dict.get(key) != val:
+                config_change = True
+            self._param_dict.set_value(key, val)
+            result[key] = val
+
+        if config_change:
+            self._driver_event(DriverAsyncEvent.CONFIG_CHANGE)
+
+        return result
 
     def _got_chunk(self, chunk):
         """
@@ -470,27 +682,23 @@ class Protocol(CommandResponseInstrumentProtocol):
         # Command device to update parameters and send a config change event.
         #self._update_params()
 
+        # Apply the startup config, such as the particle mode.
+        self._init_params()
+
         # Tell driver superclass to send a state change event.
         # Superclass will query the state.
         self._driver_event(DriverAsyncEvent.STATE_CHANGE)
 
-    def _handler_command_get(self, *args, **kwargs):
-        """
-        Get parameter
-        """
-        next_state = None
-        result = None
-
-
-        return (next_state, result)
-
     def _handler_command_set(self, *args, **kwargs):
         """
         Set parameter
+        @throws InstrumentParameterException if the parameters are invalid
         """
         next_state = None
         result = None
 
+        self._set_params(*args, **kwargs)
+
         return (next_state, result)
 
     def _handler_command_exit(self, *args, **kwargs):
@@ -533,6 +741,9 @@ class Protocol(CommandResponseInstrumentProtocol):
         # Command device to update parameters and send a config change event.
         #self._update_params()
 
+        # Apply the startup config, such as the particle mode.
+        self._init_params()
+
         # Tell driver superclass to send a state change event.
         # Superclass will query the state.
         self._driver_event(DriverAsyncEvent.STATE_CHANGE)
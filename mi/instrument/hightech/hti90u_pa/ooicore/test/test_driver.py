@@ -43,6 +43,7 @@ from mi.core.instrument.chunker import StringChunker
 from mi.core.instrument.instrument_driver import DriverAsyncEvent
 from mi.core.instrument.instrument_driver import DriverConnectionState
 from mi.core.instrument.instrument_driver import DriverProtocolState
+from mi.core.instrument.instrument_driver import DriverConfigKey
 
 from ion.agents.instrument.instrument_agent import InstrumentAgentState
 from ion.agents.instrument.direct_access.direct_access_server import DirectAccessTypes
@@ -58,6 +59,12 @@ from mi.instrument.hightech.hti90u_pa.ooicore.driver import Protocol
 from mi.instrument.hightech.hti90u_pa.ooicore.driver import Prompt
 from mi.instrument.hightech.hti90u_pa.ooicore.driver import NEWLINE
 from mi.instrument.hightech.hti90u_pa.ooicore.driver import HYDLF_SampleDataParticleKey
+from mi.instrument.hightech.hti90u_pa.ooicore.driver import HYDLF_PacketDataParticleKey
+from mi.instrument.hightech.hti90u_pa.ooicore.driver import HYDLF_PacketDataParticle
+from mi.instrument.hightech.hti90u_pa.ooicore.driver import ParticleMode
+from mi.core.instrument.data_particle import DataParticleKey
+from mi.core.instrument.data_particle import decode_particle
+from mi.core.exceptions import InstrumentParameterException
 
 import pickle
 
@@ -267,6 +274,90 @@ class DriverUnitTest(InstrumentDriverUnitTestCase, DataParticleMixin):
         driver = InstrumentDriver(self._got_data_event_callback)
         self.assert_capabilities(driver, capabilities)
 
+    def test_packet_particles(self):
+        """
+        Verify the packet modes publish one particle per channel holding all
+        the samples, with the same sample times as the per sample particles.
+        """
+        packet = dict(SHORT_SAMPLE_DICT)
+        packet['channels'] = [dict(SHORT_SAMPLE_DICT['channels'][0], data=(-15294, 7, 2**31 - 1), nsamp=3)]
+        port_agent_packet = Mock()
+        port_agent_packet.get_data.return_value = pickle.dumps(packet)
+        port_agent_packet.get_timestamp.return_value = 3.6e9
+
+        def published(particle_mode):
+            callback = Mock()
+            protocol = Protocol(Prompt, NEWLINE, callback, particle_mode)
+            protocol.got_data(port_agent_packet)
+            return [decode_particle(args[1]) for (args, kwargs) in callback.call_args_list
+                    if args[0] == DriverAsyncEvent.SAMPLE]
+
+        samples = published(ParticleMode.SAMPLE)
+        self.assertEqual(len(samples), 3)
+        sample_times = [sample[DataParticleKey.INTERNAL_TIMESTAMP] for sample in samples]
+
+        for particle_mode in (ParticleMode.PACKET, ParticleMode.BINARY_PACKET):
+            particles = published(particle_mode)
+            self.assertEqual(len(particles), 1)
+            self.assertEqual(particles[0][DataParticleKey.STREAM_NAME], DataParticleType.HYDLF_PACKET)
+            self.assertEqual(particles[0][DataParticleKey.INTERNAL_TIMESTAMP], sample_times[0])
+
+            values = dict((value[DataParticleKey.VALUE_ID], value[DataParticleKey.VALUE])
+                          for value in particles[0][DataParticleKey.VALUES])
+            data = values[HYDLF_PacketDataParticleKey.SAMPLES]
+            if particle_mode == ParticleMode.BINARY_PACKET:
+                self.assertEqual(values[HYDLF_PacketDataParticleKey.SAMPLE_FORMAT], '<i4')
+                data = HYDLF_PacketDataParticle.decode_samples(data, values[HYDLF_PacketDataParticleKey.SAMPLE_FORMAT])
+            self.assertEqual(list(data), [-15294, 7, 2**31 - 1])
+
+            times = HYDLF_PacketDataParticle.sample_times(values[HYDLF_PacketDataParticleKey.TIME],
+                                                          values[HYDLF_PacketDataParticleKey.SAMPRATE],
+                                                          len(data))
+            self.assertEqual(list(times), sample_times)
+
+        self.assertRaises(InstrumentParameterException, Protocol, Prompt, NEWLINE, Mock(), 'bogus')
+
+    def test_particle_mode_parameter(self):
+        """
+        Verify the particle mode is taken from the startup config when the
+        protocol starts streaming, and can be set in command mode.
+        """
+        port_agent_packet = Mock()
+        port_agent_packet.get_data.return_value = SHORT_SAMPLE
+        port_agent_packet.get_timestamp.return_value = 3.6e9
+
+        callback = Mock()
+        protocol = Protocol(Prompt, NEWLINE, callback)
+
+        def published():
+            callback.reset_mock()
+            protocol.got_data(port_agent_packet)
+            return [decode_particle(args[1]) for (args, kwargs) in callback.call_args_list
+                    if args[0] == DriverAsyncEvent.SAMPLE]
+
+        protocol.set_init_params({DriverConfigKey.PARAMETERS: {Parameter.PARTICLE_MODE: ParticleMode.PACKET}})
+        protocol._protocol_fsm.on_event(ProtocolEvent.DISCOVER)
+        self.assertEqual(protocol.get_current_state(), ProtocolState.AUTOSAMPLE)
+
+        particles = published()
+        self.assertEqual(len(particles), 1)
+        self.assertEqual(particles[0][DataParticleKey.STREAM_NAME], DataParticleType.HYDLF_PACKET)
+
+        protocol._protocol_fsm.on_event(ProtocolEvent.STOP_AUTOSAMPLE)
+        callback.reset_mock()
+        protocol._protocol_fsm.on_event(ProtocolEvent.SET, {Parameter.PARTICLE_MODE: ParticleMode.BINARY_PACKET})
+        callback.assert_called_once_with(DriverAsyncEvent.CONFIG_CHANGE)
+        self.assertEqual(protocol._protocol_fsm.on_event(ProtocolEvent.GET, Parameter.ALL),
+                         {Parameter.PARTICLE_MODE: ParticleMode.BINARY_PACKET})
+        self.assertRaises(InstrumentParameterException, protocol._protocol_fsm.on_event,
+                          ProtocolEvent.SET, {Parameter.PARTICLE_MODE: 'bogus'})
+
+        protocol._protocol_fsm.on_event(ProtocolEvent.START_AUTOSAMPLE)
+        particles = published()
+        self.assertEqual(len(particles), 1)
+        values = [value[DataParticleKey.VALUE_ID] for value in particles[0][DataParticleKey.VALUES]]
+        self.assertIn(HYDLF_PacketDataParticleKey.SAMPLE_FORMAT, values)
+
 
 
 
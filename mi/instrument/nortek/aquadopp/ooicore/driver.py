@@ -43,6 +43,9 @@ from mi.core.instrument.data_particle import DataParticle, DataParticleKey, Data
 
 from mi.core.common import InstErrorCode
 
+from mi.instrument.nortek import structures
+from mi.instrument.nortek.structures import StructureSieve
+
 from mi.core.log import get_logger ; log = get_logger()
 
 
@@ -65,12 +68,12 @@ DIAGNOSTIC_DATA_HEADER_LEN = 36
 DIAGNOSTIC_DATA_HEADER_SYNC_BYTES = '\xa5\x06\x12\x00'
 DIAGNOSTIC_DATA_LEN = 42
 DIAGNOSTIC_DATA_SYNC_BYTES = '\xa5\x80\x15\x00'
-CHECK_SUM_SEED = 0xb58c
 FAT_LENGTH = 512
 
 sample_structures = [[VELOCITY_DATA_SYNC_BYTES, VELOCITY_DATA_LEN],
                      [DIAGNOSTIC_DATA_SYNC_BYTES, VELOCITY_DATA_LEN],
                      [DIAGNOSTIC_DATA_HEADER_SYNC_BYTES, DIAGNOSTIC_DATA_HEADER_LEN]]
+SAMPLE_SIEVE = StructureSieve(sample_structures)
 
 VELOCITY_DATA_PATTERN = r'^%s(.{6})(.{2})(.{2})(.{2})(.{2})(.{2})(.{2})(.{2})(.{1})(.{1})(.{2})(.{2})(.{2})(.{2})(.{2})(.{1})(.{1})(.{1})(.{3})' % VELOCITY_DATA_SYNC_BYTES
 VELOCITY_DATA_REGEX = re.compile(VELOCITY_DATA_PATTERN, re.DOTALL)
@@ -505,13 +508,7 @@ class BinaryProtocolParameterDict(ProtocolParameterDict):
     
     @staticmethod
     def calculate_checksum(input, length):
-        #log.debug("calculate_checksum: input=%s, length=%d", input.encode('hex'), length)
-        calculated_checksum = CHECK_SUM_SEED
-        for word_index in range(0, length-2, 2):
-            word_value = BinaryProtocolParameterDict.convert_word_to_int(input[word_index:word_index+2])
-            calculated_checksum = (calculated_checksum + word_value) % 0x10000
-            #log.debug('w_i=%d, c_c=%d' %(word_index, calculated_checksum))
-        return calculated_checksum
+        return structures.checksum(input, length)
 
     @staticmethod
     def convert_time(response):
@@ -995,20 +992,7 @@ class Protocol(CommandResponseInstrumentProtocol):
     def chunker_sieve_function(raw_data):
         """ The method that detects data sample structures from instrument
         """
-        return_list = []
-        
-        for structure_sync, structure_len in sample_structures:
-            start = raw_data.find(structure_sync)
-            if start != -1:    # found a sync pattern
-                if start+structure_len <= len(raw_data):    # only check the CRC if all of the structure has arrived
-                    calculated_checksum = BinaryProtocolParameterDict.calculate_checksum(raw_data[start:start+structure_len], structure_len)
-                    #log.debug('chunker_sieve_function: calculated checksum = %s' % calculated_checksum)
-                    sent_checksum = BinaryProtocolParameterDict.convert_word_to_int(raw_data[start+structure_len-2:start+structure_len])
-                    if sent_checksum == calculated_checksum:
-                        return_list.append((start, start+structure_len))        
-                        #log.debug("chunker_sieve_function: found %s", raw_data[start:start+structure_len].encode('hex'))
-                
-        return return_list
+        return SAMPLE_SIEVE(raw_data)
     
     def _filter_capabilities(self, events):
         """
@@ -1926,11 +1910,8 @@ class Protocol(CommandResponseInstrumentProtocol):
             log.debug('_create_set_output: adding %s to list' %name)
             output += parameters.format_parameter(name)
         
-        checksum = CHECK_SUM_SEED
-        for word_index in range(0, len(output), 2):
-            word_value = BinaryProtocolParameterDict.convert_word_to_int(output[word_index:word_index+2])
-            checksum = (checksum + word_value) % 0x10000
-            #log.debug('w_i=%d, c_c=%d' %(word_index, calculated_checksum))
+        # the checksum covers everything before it
+        checksum = structures.checksum(output, len(output) + 2)
         log.debug('_create_set_output: user checksum = %s' % checksum)
 
         output += BinaryProtocolParameterDict.word_to_string(checksum)
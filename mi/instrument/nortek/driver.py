@@ -45,6 +45,9 @@ from mi.core.exceptions import SampleException
 from mi.core.time import get_timestamp_delayed
 from mi.core.common import InstErrorCode, BaseEnum
 
+from mi.instrument.nortek import structures
+from mi.instrument.nortek.structures import StructureSieve
+
 # newline.
 NEWLINE = '\n\r'
 
@@ -57,7 +60,6 @@ HW_CONFIG_LEN = 48
 HW_CONFIG_SYNC_BYTES   = '\xa5\x05\x18\x00'
 HEAD_CONFIG_LEN = 224
 HEAD_CONFIG_SYNC_BYTES = '\xa5\x04\x70\x00'
-CHECK_SUM_SEED = 0xb58c
 
 HARDWARE_CONFIG_DATA_PATTERN = r'%s(.{14})(.{2})(.{2})(.{2})(.{2})(.{2})(.{2})(.{12})(.{4})(.{2})' % HW_CONFIG_SYNC_BYTES
 HARDWARE_CONFIG_DATA_REGEX = re.compile(HARDWARE_CONFIG_DATA_PATTERN, re.DOTALL)
@@ -76,6 +78,7 @@ ID_DATA_REGEX = re.compile(ID_DATA_PATTERN, re.DOTALL)
 NORTEK_COMMON_SAMPLE_STRUCTS = [[USER_CONFIG_SYNC_BYTES, USER_CONFIG_LEN],
                                 [HW_CONFIG_SYNC_BYTES, HW_CONFIG_LEN],
                                 [HEAD_CONFIG_SYNC_BYTES, HEAD_CONFIG_LEN]]
+NORTEK_COMMON_SIEVE = StructureSieve(NORTEK_COMMON_SAMPLE_STRUCTS)
 
 class ScheduledJob(BaseEnum):
     CLOCK_SYNC = 'clock_sync'
@@ -1184,15 +1187,7 @@ class NortekProtocolParameterDict(ProtocolParameterDict):
 
     @staticmethod
     def calculate_checksum(input, length=None):
-        #log.debug("calculate_checksum: input=%s, length=%d", input.encode('hex'), length)
-        calculated_checksum = CHECK_SUM_SEED
-        if length == None:
-            length = len(input)
-        for word_index in range(0, length-2, 2):
-            word_value = NortekProtocolParameterDict.convert_word_to_int(input[word_index:word_index+2])
-            calculated_checksum = (calculated_checksum + word_value) % 0x10000
-            #log.trace('w_i=%d, c_c=%d', word_index, calculated_checksum)
-        return calculated_checksum
+        return structures.checksum(input, length)
 
     @staticmethod
     def convert_bytes_to_string(bytes_in):
@@ -1351,20 +1346,9 @@ class NortekInstrumentProtocol(CommandResponseInstrumentProtocol):
         @param structs Additional structures to include in the structure search.
         Should be in the format [[structure_sync_bytes, structure_len]*]
         """
-        return_list = []
-        structs = add_structs + NORTEK_COMMON_SAMPLE_STRUCTS
-        for structure_sync, structure_len in structs:
-            start = raw_data.find(structure_sync)
-            if start != -1:    # found a sync pattern
-                if start+structure_len <= len(raw_data):    # only check the CRC if all of the structure has arrived
-                    calculated_checksum = NortekProtocolParameterDict.calculate_checksum(raw_data[start:start+structure_len], structure_len)
-                    log.debug('chunker_sieve_function: calculated checksum = %s' % calculated_checksum)
-                    sent_checksum = NortekProtocolParameterDict.convert_word_to_int(raw_data[start+structure_len-2:start+structure_len])
-                    if sent_checksum == calculated_checksum:
-                        return_list.append((start, start+structure_len))        
-                        log.debug("chunker_sieve_function: found %s", raw_data[start:start+structure_len].encode('hex'))
-                
-        return return_list
+        if add_structs:
+            return StructureSieve(add_structs + NORTEK_COMMON_SAMPLE_STRUCTS)(raw_data)
+        return NORTEK_COMMON_SIEVE(raw_data)
 
     ########################################################################
     # overridden superclass methods
@@ -2447,11 +2431,8 @@ class NortekInstrumentProtocol(CommandResponseInstrumentProtocol):
                 output += parameters.format(name)
         log.debug("Created set output: %s with length: %s", output, len(output))
         
-        checksum = CHECK_SUM_SEED
-        for word_index in range(0, len(output), 2):
-            word_value = NortekProtocolParameterDict.convert_word_to_int(output[word_index:word_index+2])
-            checksum = (checksum + word_value) % 0x10000
-            #log.debug('*** w_i=%d, c_c=%d', word_index, checksum)
+        # the checksum covers everything before it
+        checksum = structures.checksum(output, len(output) + 2)
         log.debug('_create_set_output: user checksum = %s', checksum)
 
         output += NortekProtocolParameterDict.word_to_string(checksum)
@@ -0,0 +1,88 @@
+"""
+@package mi.instrument.nortek.structures
+@file marine-integrations/mi/instrument/nortek/structures.py
+@brief Framing and checksums of Nortek binary data structures, shared by
+    the Aquadopp and Vector drivers.
+
+Release notes:
+    Every Nortek structure starts with the sync byte 0xa5 and an id byte
+    and ends with a checksum, the seed plus the sum of the little endian
+    words before it. StructureSieve looks up each sync byte in the data by
+    its id, so one pass over the data finds every complete structure of
+    every known type, however many of them have arrived.
+"""
+__license__ = 'Apache 2.0'
+
+import struct
+
+from mi.core.exceptions import SampleException
+
+# first byte of every structure
+SYNC_BYTE = '\xa5'
+
+# starting value of the structure checksum
+CHECK_SUM_SEED = 0xb58c
+
+# the checksum stored in the last word of a structure
+CHECKSUM = struct.Struct('<H')
+
+def checksum(data, length=None, offset=0):
+    """
+    Calculate the checksum of a structure, the seed plus the sum of its words
+    other than the last one, which holds the checksum sent.
+    @param data string holding the structure
+    @param length length of the structure including the checksum, defaults to
+        the rest of data
+    @param offset where the structure starts in data
+    @retval the checksum
+    @throws SampleException if data is shorter than the structure
+    """
+    if length is None:
+        length = len(data) - offset
+    count = max((length - 1) // 2, 0)
+    if offset + 2 * count > len(data):
+        raise SampleException("structure of %d bytes at %d does not fit in %d bytes of data" %
+                              (length, offset, len(data)))
+    return (CHECK_SUM_SEED + sum(struct.unpack_from('<%dH' % count, data, offset))) % 0x10000
+
+class StructureSieve(object):
+    """
+    Chunker sieve function finding every complete structure with a good
+    checksum in the data.
+    """
+    def __init__(self, structures):
+        """
+        @param structures list of [sync_bytes, length] for each structure type.
+            sync_bytes starts with the sync byte and id byte.
+        @throws ValueError if two structure types have the same id
+        """
+        # sync bytes and length of each type, by its sync and id bytes
+        self._structures = {}
+        for sync, length in structures:
+            if sync[:2] in self._structures:
+                raise ValueError("more than one structure with id %s" % sync[:2].encode('hex'))
+            self._structures[sync[:2]] = (sync, length)
+
+    def __call__(self, raw_data):
+        """
+        @param raw_data data from the instrument
+        @retval list of (start, end) of the structures found, in order
+        """
+        return_list = []
+        structures = self._structures
+        data_length = len(raw_data)
+
+        start = raw_data.find(SYNC_BYTE)
+        while start != -1:
+            structure = structures.get(raw_data[start:start+2])
+            if structure is not None:
+                sync, length = structure
+                end = start + length
+                if end <= data_length and raw_data.startswith(sync, start) and \
+                   CHECKSUM.unpack_from(raw_data, end - 2)[0] == checksum(raw_data, length, start):
+                    return_list.append((start, end))
+                    start = raw_data.find(SYNC_BYTE, end)
+                    continue
+            start = raw_data.find(SYNC_BYTE, start + 1)
+
+        return return_list
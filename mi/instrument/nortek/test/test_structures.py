@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""
+@package mi.instrument.nortek.test.test_structures
+@file mi/instrument/nortek/test/test_structures.py
+@brief Test cases for Nortek structure framing and checksums
+"""
+
+__license__ = 'Apache 2.0'
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTestCase
+
+from mi.core.exceptions import SampleException
+from mi.instrument.nortek.structures import checksum, StructureSieve, CHECK_SUM_SEED
+
+VELOCITY = "a51000db00008f10000049f041f72303303132120918d8f7".decode('hex')
+SYSTEM = "a5110e0003261317121294007c3b83041301cdfe0a08007b0000e4d9".decode('hex')
+VELOCITY_HEADER = ("a512150012491711121270032f2f2e0002090d00000000000000000000"
+                   "00000000000000000000005d70").decode('hex')
+
+STRUCTURES = [['\xa5\x10', 24],
+              ['\xa5\x11\x0e\x00', 28],
+              ['\xa5\x12\x15\x00', 42]]
+
+@attr('UNIT', group='mi')
+class UnitTestStructures(MiUnitTestCase):
+    """
+    Test the Nortek structure sieve and checksum
+    """
+    def test_checksum(self):
+        for sample in (VELOCITY, SYSTEM, VELOCITY_HEADER):
+            self.assertEqual(checksum(sample), ord(sample[-2]) + 0x100 * ord(sample[-1]))
+            self.assertEqual(checksum('xx' + sample, len(sample), 2), checksum(sample))
+            # anything after the structure, such as an ACK, is not summed
+            self.assertEqual(checksum(sample + '\x06\x06', len(sample)), checksum(sample))
+
+        self.assertEqual(checksum('\xff\xff' * 3), (CHECK_SUM_SEED + 2 * 0xffff) % 0x10000)
+        self.assertEqual(checksum(''), CHECK_SUM_SEED)
+        self.assertRaises(SampleException, checksum, VELOCITY, 48)
+
+    def test_sieve(self):
+        sieve = StructureSieve(STRUCTURES)
+        self.assertEqual(sieve(''), [])
+        self.assertEqual(sieve(VELOCITY), [(0, 24)])
+        self.assertEqual(sieve(VELOCITY[:-1]), [])
+
+        # every structure is found, including several of the same type
+        data = VELOCITY_HEADER + VELOCITY + VELOCITY + SYSTEM + VELOCITY
+        self.assertEqual(sieve(data), [(0, 42), (42, 66), (66, 90), (90, 118), (118, 142)])
+
+        # noise, stray sync bytes and bad checksums are skipped
+        bad = VELOCITY[:-1] + '\x00'
+        data = '\xa5\x10noise' + bad + SYSTEM + '\xa5' + VELOCITY + '\xa5\x12'
+        self.assertEqual(sieve(data), [(31, 59), (60, 84)])
+
+        # structure types are told apart by their id, which must be unique
+        self.assertRaises(ValueError, StructureSieve, STRUCTURES + [['\xa5\x10\x0c\x00', 24]])
@@ -29,9 +29,11 @@ from mi.instrument.nortek.driver import NortekInstrumentProtocol
 from mi.instrument.nortek.driver import NortekProtocolParameterDict
 from mi.instrument.nortek.driver import Parameter, InstrumentCmds, InstrumentPrompts
 from mi.instrument.nortek.driver import NEWLINE
+from mi.instrument.nortek.driver import NORTEK_COMMON_SAMPLE_STRUCTS
 from mi.instrument.nortek.driver import HARDWARE_CONFIG_DATA_REGEX
 from mi.instrument.nortek.driver import HEAD_CONFIG_DATA_REGEX
 from mi.instrument.nortek.driver import USER_CONFIG_DATA_REGEX
+from mi.instrument.nortek.structures import StructureSieve
 
 from mi.core.instrument.chunker import StringChunker
 
@@ -49,6 +51,7 @@ VECTOR_SAMPLE_STRUCTURES = [[VELOCITY_DATA_SYNC_BYTES, VELOCITY_DATA_LEN],
                             [SYSTEM_DATA_SYNC_BYTES, SYSTEM_DATA_LEN],
                             [VELOCITY_HEADER_DATA_SYNC_BYTES, VELOCITY_HEADER_DATA_LEN]
                            ]
+VECTOR_SIEVE = StructureSieve(VECTOR_SAMPLE_STRUCTURES + NORTEK_COMMON_SAMPLE_STRUCTS)
 
 VELOCITY_DATA_PATTERN = r'^%s(.{1})(.{1})(.{1})(.{1})(.{2})(.{2})(.{2})(.{2})(.{2})(.{1})(.{1})(.{1})(.{1})(.{1})(.{1}).{2}' % VELOCITY_DATA_SYNC_BYTES
 VELOCITY_DATA_REGEX = re.compile(VELOCITY_DATA_PATTERN, re.DOTALL)
@@ -448,11 +451,13 @@ class Protocol(NortekInstrumentProtocol):
         
         # create chunker for processing instrument samples.
         self._chunker = StringChunker(Protocol.chunker_sieve_function)
+
+        # velocity data arrives at up to 64 Hz, publish it in batches
+        self._enable_sample_batching()
         
     @staticmethod
     def chunker_sieve_function(raw_data):
-        return NortekInstrumentProtocol.chunker_sieve_function(raw_data,
-                                                               VECTOR_SAMPLE_STRUCTURES)
+        return VECTOR_SIEVE(raw_data)
 
     ########################################################################
     # overridden superclass methods
@@ -41,8 +41,11 @@ from mi.instrument.nortek.test.test_driver import NortekUnitTest, NortekIntTest,
 from mi.core.instrument.instrument_driver import DriverConnectionState
 from mi.core.instrument.instrument_driver import DriverParameter
 from mi.core.instrument.instrument_driver import DriverConfigKey
+from mi.core.instrument.instrument_driver import DriverAsyncEvent
+from mi.core.instrument.port_agent_client import PortAgentPacket
 
 from mi.core.instrument.data_particle import DataParticleKey, DataParticleValue
+from mi.core.instrument.data_particle import decode_particle
 from mi.core.instrument.chunker import StringChunker
 
 from mi.core.exceptions import InstrumentParameterException
@@ -53,6 +56,8 @@ from mi.core.exceptions import SampleException
 from mi.instrument.nortek.driver import ProtocolState
 from mi.instrument.nortek.driver import ProtocolEvent
 from mi.instrument.nortek.driver import Parameter
+from mi.instrument.nortek.driver import InstrumentPrompts
+from mi.instrument.nortek.driver import NEWLINE
 from mi.instrument.nortek.vector.ooicore.driver import DataParticleType
 from mi.instrument.nortek.vector.ooicore.driver import Protocol
 from mi.instrument.nortek.vector.ooicore.driver import VectorVelocityHeaderDataParticle
@@ -394,6 +399,31 @@ class UnitFromIDK(NortekUnitTest):
         with self.assertRaises(SampleException):
             particle.generate()
 
+    def test_sample_batching(self):
+        """
+        Verify velocity data is published in SAMPLE_BATCH events
+        """
+        events = []
+        def event_callback(event, value=None):
+            events.append((event, value))
+
+        protocol = Protocol(InstrumentPrompts, NEWLINE, event_callback)
+
+        port_agent_packet = PortAgentPacket()
+        port_agent_packet.attach_data(velocity_header_sample() + velocity_sample() * 4)
+        port_agent_packet.attach_timestamp(3558720820.531179)
+        port_agent_packet.pack_header()
+        protocol.got_data(port_agent_packet)
+
+        # held back until the batch is full or old enough
+        self.assertEqual([value for (event, value) in events if event == DriverAsyncEvent.SAMPLE], [])
+        protocol._flush_samples()
+
+        batches = [value for (event, value) in events if event == DriverAsyncEvent.SAMPLE_BATCH]
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([decode_particle(sample)[DataParticleKey.STREAM_NAME] for sample in batches[0]],
+                         [DataParticleType.VELOCITY_HEADER] + [DataParticleType.VELOCITY] * 4)
+
  
 ###############################################################################
 #                            INTEGRATION TESTS                                #
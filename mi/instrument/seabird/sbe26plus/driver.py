@@ -34,6 +34,7 @@ from mi.core.instrument.data_particle import DataParticle, DataParticleKey, Comm
 from mi.core.instrument.protocol_param_dict import ParameterDictType
 from mi.core.instrument.driver_dict import DriverDictKey
 from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.chunker import MultiPatternSieve
 from mi.core.exceptions import InstrumentParameterException
 from mi.core.exceptions import SampleException
 from mi.core.exceptions import InstrumentStateException
@@ -62,6 +63,14 @@ DC_REGEX_MATCHER = re.compile(DC_REGEX, re.DOTALL)
 DS_REGEX = r'(SBE 26plus V.+?)logging = [\w, ].+?\r\n'
 DS_REGEX_MATCHER = re.compile(DS_REGEX, re.DOTALL)
 
+# all of the above, in one pass for the chunker
+SIEVE_MATCHER = MultiPatternSieve([TS_REGEX_MATCHER,
+                                   TIDE_REGEX_MATCHER,
+                                   WAVE_REGEX_MATCHER,
+                                   STATS_REGEX_MATCHER,
+                                   DS_REGEX_MATCHER,
+                                   DC_REGEX_MATCHER])
+
 ###
 #    Driver Constant Definitions
 ###
@@ -1143,20 +1152,7 @@ class Protocol(SeaBirdProtocol):
         Chunker sieve method to help the chunker identify chunks.
         @returns a list of chunks identified, if any.  The chunks are all the same type.
         """
-        sieve_matchers = [TS_REGEX_MATCHER,
-                          TIDE_REGEX_MATCHER,
-                          WAVE_REGEX_MATCHER,
-                          STATS_REGEX_MATCHER,
-                          DS_REGEX_MATCHER,
-                          DC_REGEX_MATCHER]
-
-        return_list = []
-
-        for matcher in sieve_matchers:
-            for match in matcher.finditer(raw_data):
-                return_list.append((match.start(), match.end()))
-
-        return return_list
+        return SIEVE_MATCHER(raw_data)
 
     def _filter_capabilities(self, events):
         """
@@ -36,6 +36,7 @@ from mi.core.instrument.instrument_driver import ResourceAgentEvent
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey, CommonDataParticleType
 from mi.core.instrument.driver_dict import DriverDictKey
 from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.chunker import MultiPatternSieve
 from mi.core.exceptions import InstrumentTimeoutException
 from mi.core.exceptions import InstrumentParameterException
 from mi.core.exceptions import SampleException
@@ -192,6 +193,11 @@ STATUS_DATA_REGEX_MATCHER = re.compile(STATUS_DATA_REGEX, re.DOTALL)
 CALIBRATION_DATA_REGEX = r"(SBE37-SM.*?RTCA2 = -?[\d\.e\-\+]+)"
 CALIBRATION_DATA_REGEX_MATCHER = re.compile(CALIBRATION_DATA_REGEX, re.DOTALL)
 
+# all of the above, in one pass for the chunker
+SIEVE_MATCHER = MultiPatternSieve([SAMPLE_PATTERN_MATCHER,
+                                   STATUS_DATA_REGEX_MATCHER,
+                                   CALIBRATION_DATA_REGEX_MATCHER])
+
   
 ###############################################################################
 # Seabird Electronics 37-SMP MicroCAT Driver.
@@ -762,17 +768,7 @@ class SBE37Protocol(CommandResponseInstrumentProtocol):
         Chunker sieve method to help the chunker identify chunks.
         @returns a list of chunks identified, if any.  The chunks are all the same type.
         """
-        sieve_matchers = [SAMPLE_PATTERN_MATCHER,
-                          STATUS_DATA_REGEX_MATCHER,
-                          CALIBRATION_DATA_REGEX_MATCHER]
-
-        return_list = []
-
-        for matcher in sieve_matchers:
-            for match in matcher.finditer(raw_data):
-                return_list.append((match.start(), match.end()))
-
-        return return_list
+        return SIEVE_MATCHER(raw_data)
     def _filter_capabilities(self, events):
         """
         """ 
@@ -39,6 +39,7 @@ from mi.core.exceptions import InstrumentParameterExpirationException
 
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey, CommonDataParticleType
 from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.chunker import MultiPatternSieve
 
 from mi.instrument.seabird.driver import SeaBirdInstrumentDriver
 from mi.instrument.seabird.driver import SeaBirdProtocol
@@ -185,6 +186,14 @@ SAMPLE_REF_OSC_MATCHER = re.compile(SAMPLE_REF_OSC_REGEX, re.DOTALL)
 ENGINEERING_DATA_REGEX = "<MainSupplyVoltage>([.\d]+)</MainSupplyVoltage>"
 ENGINEERING_DATA_MATCHER = re.compile(SAMPLE_REF_OSC_REGEX, re.DOTALL)
 
+# all of the above, in one pass for the chunker
+SIEVE_MATCHER = MultiPatternSieve([STATUS_DATA_REGEX_MATCHER,
+                                   CONFIGURATION_DATA_REGEX_MATCHER,
+                                   EVENT_COUNTER_DATA_REGEX_MATCHER,
+                                   HARDWARE_DATA_REGEX_MATCHER,
+                                   SAMPLE_DATA_REGEX_MATCHER,
+                                   ENGINEERING_DATA_MATCHER])
+
 class SBE54tpsStatusDataParticleKey(BaseEnum):
     DEVICE_TYPE = "device_type"
     SERIAL_NUMBER = "serial_number"
@@ -1200,20 +1209,7 @@ class Protocol(SeaBirdProtocol):
         """
         The method that splits samples
         """
-        return_list = []
-
-        sieve_matchers = [ STATUS_DATA_REGEX_MATCHER,
-                           CONFIGURATION_DATA_REGEX_MATCHER,
-                           EVENT_COUNTER_DATA_REGEX_MATCHER,
-                           HARDWARE_DATA_REGEX_MATCHER,
-                           SAMPLE_DATA_REGEX_MATCHER,
-                           ENGINEERING_DATA_MATCHER ]
-
-        for matcher in sieve_matchers:
-            for match in matcher.finditer(raw_data):
-                return_list.append((match.start(), match.end()))
-
-        return return_list
+        return SIEVE_MATCHER(raw_data)
 
     def _filter_capabilities(self, events):
         """
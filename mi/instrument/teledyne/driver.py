@@ -46,6 +46,10 @@ TIMEOUT = 20
 # newline.
 NEWLINE = '\r\n'
 
+# longest record the sieve can match, a PD0 ensemble can be up to 0xFFFF
+# bytes long plus the two byte header ID
+PD0_MAX_RECORD_LENGTH = 65537
+
 # TODO: do i keep below two defines for _do_cmd_resp
 DEFAULT_CMD_TIMEOUT=20
 DEFAULT_WRITE_DELAY=0
@@ -245,6 +249,9 @@ class TeledyneProtocol(CommandResponseInstrumentProtocol):
 
         self.last_wakeup = 0
 
+        # ensembles can arrive several times a second, publish them in batches
+        self._enable_sample_batching()
+
         # Build ADCPT protocol state machine.
         self._protocol_fsm = InstrumentFSM(TeledyneProtocolState, TeledyneProtocolEvent,
                             TeledyneProtocolEvent.ENTER, TeledyneProtocolEvent.EXIT)
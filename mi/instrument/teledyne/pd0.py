@@ -0,0 +1,195 @@
+"""
+@package mi.instrument.teledyne.pd0
+@file marine-integrations/mi/instrument/teledyne/pd0.py
+@brief Decoding of Teledyne RDI PD0 ensembles, shared by the Teledyne
+    instrument particles and the ADCPA dataset parser.
+
+Release notes:
+    An ensemble is a header, a table of offsets to its data types, the data
+    types and a checksum. verify_checksum and data_types take an ensemble
+    apart so a particle only has to decode the data types it knows, picking
+    the decoder by the id each data type starts with.
+
+    The per depth cell data types (velocity, correlation magnitude, echo
+    intensity and percent good) are a two byte id followed by one value per
+    beam for each depth cell. Rather than unpacking a depth cell at a time,
+    the whole block is read with numpy.frombuffer as a (cells x beams) array.
+
+    Ensembles are framed by find_ensembles, which walks the data once using
+    the length in each ensemble header and only accepts an ensemble whose
+    checksum matches, so a 0x7f7f inside the data is not taken for a header.
+"""
+__license__ = 'Apache 2.0'
+
+import struct
+
+import numpy as np
+
+from mi.core.exceptions import SampleException
+
+# number of beams in the per depth cell data types
+NUM_BEAMS = 4
+
+# size of the id at the start of each data type
+DATA_TYPE_ID_SIZE = 2
+
+# header id and data source id at the start of every ensemble
+HEADER_ID = '\x7f\x7f'
+
+# bytes of the ensemble header up to and including the number of data types
+HEADER_SIZE = 6
+
+# number of bytes in the ensemble, excluding the checksum, at offset 2
+ENSEMBLE_LENGTH = struct.Struct('<H')
+
+# the checksum follows the ensemble
+CHECKSUM = struct.Struct('<H')
+
+# header id, data source id, number of bytes, spare, number of data types
+HEADER = struct.Struct('<BBHBB')
+
+# id at the start of each data type
+DATA_TYPE_ID = struct.Struct('<H')
+
+# reserved bytes between the last data type and the checksum
+RESERVED_SIZE = 2
+
+# data type ids, as read little-endian from the start of each data type
+FIXED_LEADER_ID = 0x0000
+VARIABLE_LEADER_ID = 0x0080
+VELOCITY_ID = 0x0100
+CORRELATION_MAGNITUDE_ID = 0x0200
+ECHO_INTENSITY_ID = 0x0300
+PERCENT_GOOD_ID = 0x0400
+BOTTOM_TRACK_ID = 0x0600
+
+
+def checksum(data, length, offset=0):
+    """
+    Calculate the PD0 checksum, the sum of the first length bytes of the
+    ensemble modulo 65536.
+
+    @param data ensemble bytes
+    @param length number of bytes to sum, from the ensemble header
+    @param offset index of the start of the ensemble in data
+    @retval checksum
+    """
+    return int(np.frombuffer(data, dtype=np.uint8, count=length,
+                             offset=offset).sum()) & 65535
+
+
+def verify_checksum(data):
+    """
+    Check the checksum at the end of an ensemble.
+
+    @param data ensemble bytes, including the checksum
+    @retval (length, checksum), length being the number of bytes in the
+        ensemble before the checksum
+    @throws SampleException if the ensemble is shorter than its header says
+        or the checksum does not match
+    """
+    if len(data) < HEADER_SIZE:
+        raise SampleException("Ensemble too short for a header")
+
+    (length,) = ENSEMBLE_LENGTH.unpack_from(data, 2)
+    if len(data) < length + CHECKSUM.size:
+        raise SampleException("Ensemble shorter than its length, %d < %d" %
+                              (len(data), length + CHECKSUM.size))
+
+    value = checksum(data, length)
+    if value != CHECKSUM.unpack_from(data, length)[0]:
+        raise SampleException("Checksum mismatch")
+
+    return length, value
+
+
+def data_type_offsets(data, num_data_types):
+    """
+    Read the table of data type offsets following the ensemble header.
+
+    @param data ensemble bytes
+    @param num_data_types number of data types, from the ensemble header
+    @retval list of the offsets of the data types in the ensemble
+    """
+    return list(struct.unpack_from('<%dH' % num_data_types, data, HEADER_SIZE))
+
+
+def data_types(data, offsets, end):
+    """
+    Split an ensemble into its data types. Each data type runs up to the
+    start of the next one, the last one up to end.
+
+    @param data ensemble bytes
+    @param offsets data type offsets, from data_type_offsets
+    @param end index the last data type ends at, usually the ensemble
+        length less RESERVED_SIZE
+    @retval list of (data type id, start, end) for each data type
+    """
+    ends = offsets[1:] + [end]
+    return [(DATA_TYPE_ID.unpack_from(data, start)[0], start, stop)
+            for (start, stop) in zip(offsets, ends)]
+
+
+def find_ensembles(data):
+    """
+    Find the complete ensembles in a buffer, in a single pass. Each 0x7f7f
+    is taken as a candidate header, and the candidate is an ensemble if the
+    data holds as many bytes as its header says and the checksum after them
+    matches. Scanning then carries on after the ensemble, or from the next
+    byte if the candidate was not one. Can be used as a chunker sieve
+    function.
+
+    @param data buffer to search
+    @retval list of (start, end) indexes of the ensembles, end including the
+        checksum
+    """
+    ensembles = []
+    data_length = len(data)
+
+    pos = data.find(HEADER_ID)
+    while 0 <= pos <= data_length - HEADER_SIZE:
+        (length,) = ENSEMBLE_LENGTH.unpack_from(data, pos + 2)
+        end = pos + length + CHECKSUM.size
+
+        if length >= HEADER_SIZE and end <= data_length and \
+           checksum(data, length, pos) == CHECKSUM.unpack_from(data, pos + length)[0]:
+            ensembles.append((pos, end))
+            pos = data.find(HEADER_ID, end)
+        else:
+            pos = data.find(HEADER_ID, pos + 1)
+
+    return ensembles
+
+
+def cell_array(chunk, dtype, cells=None, beams=NUM_BEAMS):
+    """
+    Decode a per depth cell data type as a (cells x beams) array.
+
+    @param chunk data type bytes, starting with the two byte id
+    @param dtype numpy dtype of one value, e.g. '<i2' for velocities
+    @param cells number of depth cells to decode, defaults to as many as fit
+    @param beams number of values per depth cell
+    @retval numpy array of shape (cells, beams)
+    """
+    dtype = np.dtype(dtype)
+    if cells is None:
+        cells = (len(chunk) - DATA_TYPE_ID_SIZE) / (dtype.itemsize * beams)
+    cells = max(cells, 0)
+
+    values = np.frombuffer(chunk, dtype=dtype, count=cells * beams,
+                           offset=DATA_TYPE_ID_SIZE)
+    return values.reshape(cells, beams)
+
+
+def beam_lists(chunk, dtype, cells=None, beams=NUM_BEAMS):
+    """
+    Decode a per depth cell data type as one list of python values per beam,
+    ready to be used as particle values.
+
+    @param chunk data type bytes, starting with the two byte id
+    @param dtype numpy dtype of one value, e.g. '<i2' for velocities
+    @param cells number of depth cells to decode, defaults to as many as fit
+    @param beams number of values per depth cell
+    @retval list of beams lists, each of cells values
+    """
+    return cell_array(chunk, dtype, cells, beams).T.tolist()
@@ -0,0 +1,96 @@
+"""
+@package mi.instrument.teledyne.test.test_pd0
+@file marine-integrations/mi/instrument/teledyne/test/test_pd0.py
+@brief Test cases for the shared PD0 decoding functions
+"""
+__license__ = 'Apache 2.0'
+
+from struct import pack
+
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTestCase
+from mi.core.exceptions import SampleException
+
+from mi.instrument.teledyne import pd0
+
+
+@attr('UNIT', group='mi')
+class PD0UnitTestCase(MiUnitTestCase):
+    """
+    Test the vectorized PD0 decoders against struct
+    """
+    def test_checksum(self):
+        data = ''.join(chr(i % 256) for i in range(1000))
+        self.assertEqual(pd0.checksum(data, 1000), sum(ord(c) for c in data) & 65535)
+        self.assertEqual(pd0.checksum(data, 10), 45)
+        self.assertEqual(pd0.checksum(bytearray(data), 1000), pd0.checksum(data, 1000))
+
+    def test_cell_array(self):
+        cells = [(i, -i, 2 * i, -2 * i) for i in range(20)]
+        chunk = pack('<H', 256) + ''.join(pack('<hhhh', *cell) for cell in cells)
+
+        array = pd0.cell_array(chunk, '<i2')
+        self.assertEqual(array.shape, (20, 4))
+        self.assertEqual([tuple(row) for row in array.tolist()], cells)
+
+        # one list per beam, optionally limited to some of the cells
+        beams = pd0.beam_lists(chunk, '<i2')
+        self.assertEqual(beams, [list(beam) for beam in zip(*cells)])
+        self.assertEqual(pd0.beam_lists(chunk, '<i2', 5), [list(beam) for beam in zip(*cells[:5])])
+        self.assertEqual(pd0.beam_lists(chunk, '<i2', -1), [[], [], [], []])
+
+        # single byte values
+        chunk = pack('<H', 512) + ''.join(chr(i) for i in range(40))
+        self.assertEqual(pd0.beam_lists(chunk, 'u1'), [range(b, 40, 4) for b in range(4)])
+
+    def test_checksum_offset(self):
+        data = ''.join(chr(i % 256) for i in range(1000))
+        self.assertEqual(pd0.checksum(data, 10, 100), sum(ord(c) for c in data[100:110]) & 65535)
+
+    def test_find_ensembles(self):
+        def ensemble(body):
+            data = '\x7f\x7f' + pack('<H', len(body) + 4) + body
+            return data + pack('<H', sum(ord(c) for c in data) & 65535)
+
+        first = ensemble('\x00\x06' + ''.join(chr(i) for i in range(200)))
+        # a marker inside an ensemble is not taken for a header
+        second = ensemble('\x00\x06\x7f\x7f\x10\x00' + 'x' * 50)
+        bad = first[:-1] + chr((ord(first[-1]) + 1) % 256)
+
+        data = 'noise' + first + second + '>' + first
+        start = len('noise')
+        self.assertEqual(pd0.find_ensembles(data),
+                         [(start, start + len(first)),
+                          (start + len(first), start + len(first) + len(second)),
+                          (len(data) - len(first), len(data))])
+
+        # bad checksums, lengths shorter than the header and incomplete
+        # ensembles are skipped
+        self.assertEqual(pd0.find_ensembles(bad + second), [(len(bad), len(bad) + len(second))])
+        self.assertEqual(pd0.find_ensembles('\x7f\x7f\x02\x00\x00\x00\x81\x00' + second),
+                         [(8, 8 + len(second))])
+        self.assertEqual(pd0.find_ensembles(second + first[:-1]), [(0, len(second))])
+        self.assertEqual(pd0.find_ensembles(second[:5]), [])
+        self.assertEqual(pd0.find_ensembles(''), [])
+
+    def test_data_types(self):
+        fixed = pack('<H', pd0.FIXED_LEADER_ID) + 'f' * 10
+        velocity = pack('<H', pd0.VELOCITY_ID) + 'v' * 16
+        body = fixed + velocity + '\x00\x00'
+        offsets = [10, 10 + len(fixed)]
+        data = '\x7f\x7f' + pack('<HBB', 10 + len(body), 0, 2) + pack('<HH', *offsets) + body
+        data += pack('<H', sum(ord(c) for c in data) & 65535)
+
+        (length, checksum) = pd0.verify_checksum(data)
+        self.assertEqual(length, len(data) - 2)
+        self.assertEqual(checksum, pd0.checksum(data, length))
+
+        self.assertEqual(pd0.HEADER.unpack_from(data), (0x7f, 0x7f, length, 0, 2))
+        self.assertEqual(pd0.data_type_offsets(data, 2), offsets)
+        self.assertEqual(pd0.data_types(data, offsets, length - pd0.RESERVED_SIZE),
+                         [(pd0.FIXED_LEADER_ID, 10, 22), (pd0.VELOCITY_ID, 22, 40)])
+
+        # bad checksum, short ensemble and not an ensemble at all
+        self.assertRaises(SampleException, pd0.verify_checksum, data[:-1] + '\x00')
+        self.assertRaises(SampleException, pd0.verify_checksum, data[:-4])
+        self.assertRaises(SampleException, pd0.verify_checksum, '\r\n')
@@ -24,10 +24,13 @@ from mi.instrument.teledyne.driver import TeledyneProtocolState
 from mi.instrument.teledyne.driver import TeledyneCapability
 from mi.instrument.teledyne.driver import TeledyneInstrumentDriver
 from mi.instrument.teledyne.driver import TeledyneScheduledJob
+from mi.instrument.teledyne.driver import PD0_MAX_RECORD_LENGTH
+from mi.instrument.teledyne import pd0
 
 from mi.instrument.teledyne.workhorse_monitor_150_khz.particles import *
 
-from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.chunker import BufferedStringChunker
+from mi.core.instrument.chunker import ResumableSieve
 
 
 class WorkhorsePrompt(TeledynePrompt):
@@ -125,31 +128,16 @@ class WorkhorseProtocol(TeledyneProtocol):
         """
 
         sieve_matchers = [ADCP_SYSTEM_CONFIGURATION_REGEX_MATCHER,
-                          ADCP_COMPASS_CALIBRATION_REGEX_MATCHER,
-                          ADCP_PD0_PARSED_REGEX_MATCHER]
+                          ADCP_COMPASS_CALIBRATION_REGEX_MATCHER]
 
         return_list = []
 
         for matcher in sieve_matchers:
-            if matcher == ADCP_PD0_PARSED_REGEX_MATCHER:
-                #
-                # Have to cope with variable length binary records...
-                # lets grab the length, then write a proper query to
-                # snag it.
-                #
-                matcher2 = re.compile(r'\x7f\x7f(..)', re.DOTALL)
-                for match in matcher2.finditer(raw_data):
-                    l = unpack("H", match.group(1))
-                    outer_pos = match.start()
-                    ADCP_PD0_PARSED_TRUE_MATCHER = re.compile(r'\x7f\x7f(.{' + str(l[0]) + '})', re.DOTALL)
-                    for match in ADCP_PD0_PARSED_TRUE_MATCHER.finditer(raw_data, outer_pos):
-                        inner_pos = match.start()
-
-                        if (outer_pos == inner_pos):
-                            return_list.append((match.start(), match.end()))
-            else:
-                for match in matcher.finditer(raw_data):
-                    return_list.append((match.start(), match.end()))
+            for match in matcher.finditer(raw_data):
+                return_list.append((match.start(), match.end()))
+
+        # binary ensembles are framed by their length and checksum
+        return_list.extend(pd0.find_ensembles(raw_data))
 
         return return_list
 
@@ -174,7 +162,9 @@ class WorkhorseProtocol(TeledyneProtocol):
         self._add_build_handler(WorkhorseInstrumentCmds.RESTORE_FACTORY_PARAMS, self._build_simple_command)
         self._add_response_handler(WorkhorseInstrumentCmds.RESTORE_FACTORY_PARAMS, self._parse_restore_factory_params_response)
 
-        self._chunker = StringChunker(WorkhorseProtocol.sieve_function)
+        self._chunker = BufferedStringChunker(
+            ResumableSieve(WorkhorseProtocol.sieve_function,
+                           max_record_length=PD0_MAX_RECORD_LENGTH))
 
     def _get_params(self):
         return dir(WorkhorseParameter)
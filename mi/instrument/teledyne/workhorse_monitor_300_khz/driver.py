@@ -22,12 +22,15 @@ from mi.instrument.teledyne.driver import TeledyneProtocolState
 from mi.instrument.teledyne.driver import TeledyneCapability
 from mi.instrument.teledyne.driver import TeledyneInstrumentDriver
 from mi.instrument.teledyne.driver import TeledyneScheduledJob
+from mi.instrument.teledyne.driver import PD0_MAX_RECORD_LENGTH
+from mi.instrument.teledyne import pd0
 
 from mi.core.instrument.instrument_driver import DriverAsyncEvent
 
 from mi.instrument.teledyne.workhorse_monitor_300_khz.particles import *
 
-from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.chunker import BufferedStringChunker
+from mi.core.instrument.chunker import ResumableSieve
 
 from mi.core.instrument.protocol_param_dict import ParameterDictVisibility
 from mi.core.instrument.protocol_param_dict import ParameterDictType
@@ -128,32 +131,17 @@ class WorkhorseProtocol(TeledyneProtocol):
         """
 
         sieve_matchers = [ADCP_COMPASS_CALIBRATION_REGEX_MATCHER,
-                          ADCP_SYSTEM_CONFIGURATION_REGEX_MATCHER,
-                          ADCP_PD0_PARSED_REGEX_MATCHER]
+                          ADCP_SYSTEM_CONFIGURATION_REGEX_MATCHER]
 
         return_list = []
 
         for matcher in sieve_matchers:
-            if matcher == ADCP_PD0_PARSED_REGEX_MATCHER:
-                #
-                # Have to cope with variable length binary records...
-                # lets grab the length, then write a proper query to
-                # snag it.
-                #
-                matcher2 = re.compile(r'\x7f\x7f(..)', re.DOTALL)
-                for match in matcher2.finditer(raw_data):
-                    l = unpack("H", match.group(1))
-                    outer_pos = match.start()
-                    ADCP_PD0_PARSED_TRUE_MATCHER = re.compile(r'\x7f\x7f(.{' + str(l[0]) + '})', re.DOTALL)
-                    for match in ADCP_PD0_PARSED_TRUE_MATCHER.finditer(raw_data, outer_pos):
-                        inner_pos = match.start()
-
-                        if (outer_pos == inner_pos):
-                            return_list.append((match.start(), match.end()))
-            else:
-                for match in matcher.finditer(raw_data):
-                    return_list.append((match.start(), match.end()))
-                    
+            for match in matcher.finditer(raw_data):
+                return_list.append((match.start(), match.end()))
+
+        # binary ensembles are framed by their length and checksum
+        return_list.extend(pd0.find_ensembles(raw_data))
+
         return return_list
 
     def __init__(self, prompts, newline, driver_event):
@@ -171,7 +159,9 @@ class WorkhorseProtocol(TeledyneProtocol):
                                        WorkhorseProtocolEvent.POWER_DOWN,
                                        self._handler_command_power_down)
 
-        self._chunker = StringChunker(WorkhorseProtocol.sieve_function)
+        self._chunker = BufferedStringChunker(
+            ResumableSieve(WorkhorseProtocol.sieve_function,
+                           max_record_length=PD0_MAX_RECORD_LENGTH))
         
 
     ########################################################################
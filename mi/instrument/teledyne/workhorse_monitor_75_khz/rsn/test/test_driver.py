@@ -12,6 +12,8 @@ import datetime as dt
 from nose.plugins.attrib import attr
 from mock import Mock
 from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.port_agent_client import PortAgentPacket
+from mi.core.instrument.instrument_driver import DriverAsyncEvent
 
 from mi.core.log import get_logger; log = get_logger()
 
@@ -486,6 +488,31 @@ class UnitFromIDK(WorkhorseDriverUnitTest, ADCPTMixin):
         self.assert_particle_published(driver, RSN_PS0_RAW_DATA, self.assert_particle_system_configuration, True)
         self.assert_particle_published(driver, RSN_SAMPLE_RAW_DATA, self.assert_particle_pd0_data, True)
 
+    def test_sample_batching(self):
+        """
+        Verify ensembles are published together in SAMPLE_BATCH events
+        """
+        events = []
+        driver = InstrumentDriver(events.append)
+        self.assert_initialize_driver(driver)
+
+        for i in range(3):
+            port_agent_packet = PortAgentPacket()
+            port_agent_packet.attach_data(RSN_SAMPLE_RAW_DATA)
+            port_agent_packet.attach_timestamp(3583612801.0 + i)
+            port_agent_packet.pack_header()
+            driver._protocol.got_data(port_agent_packet)
+
+        # held back until the batch is full or old enough
+        self.assertEqual([event for event in events if event['type'] == DriverAsyncEvent.SAMPLE], [])
+        driver._protocol._flush_samples()
+
+        batches = [event['value'] for event in events if event['type'] == DriverAsyncEvent.SAMPLE_BATCH]
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 3)
+        for sample in batches[0]:
+            self.assert_particle_pd0_data(sample, True)
+
     def test_driver_parameters(self):
         """
         Verify the set of parameters known by the driver
@@ -15,6 +15,8 @@ import re
 import time
 import string
 
+import numpy as np
+
 from mi.core.log import get_logger ; log = get_logger()
 
 from mi.core.common import BaseEnum
@@ -47,6 +49,11 @@ INDEX_OF_START_OF_SCAN_DATA = 32
 SIZEOF_PACKET_RECORD_LENGTH = 2
 SIZEOF_SCAN_DATA_SIGNAL_COUNTS = 2
 SIZEOF_CHECKSUM_PLUS_PAD = 3   # three bytes for 2 byte checksum and 1 byte pad
+# c reference, a reference, c signal and a signal counts for each wavelength
+NUM_SCAN_DATA_VECTORS = 4
+SIZEOF_SCAN_DATA_WAVELENGTH = NUM_SCAN_DATA_VECTORS * SIZEOF_SCAN_DATA_SIGNAL_COUNTS
+# scan data counts are big endian unsigned shorts
+SCAN_DATA_DTYPE = np.dtype('>u2')
 
 PACKET_REGISTRATION_PATTERN = '\xff\x00\xff\x00'
 PACKET_REGISTRATION_REGEX = re.compile(PACKET_REGISTRATION_PATTERN)
@@ -140,6 +147,32 @@ def get_three_byte_value(str, index):
 
 def get_four_byte_value(str, index):
     return ord(str[index])*2**24 + get_three_byte_value(str, index+1)
+
+def calculate_checksum(record, length):
+    """
+    @param record packet string
+    @param length number of bytes of the packet to sum
+    @retval the 16 bit sum of the first length bytes
+    """
+    return int(np.frombuffer(record, dtype=np.uint8, count=length).sum()) & 0xffff
+
+def get_scan_data_vectors(record, record_length):
+    """
+    Split the scan data of a packet into its interleaved count vectors.
+    @param record packet string
+    @param record_length packet record length, the end of the scan data
+    @retval list of the c reference, a reference, c signal and a signal
+    count lists
+    @throws SampleException if the packet is too short for the scan data
+    """
+    # a trailing partial wavelength is read whole, into the checksum
+    num_wavelengths = -(-max(record_length - INDEX_OF_START_OF_SCAN_DATA, 0) // SIZEOF_SCAN_DATA_WAVELENGTH)
+    if len(record) < INDEX_OF_START_OF_SCAN_DATA + num_wavelengths * SIZEOF_SCAN_DATA_WAVELENGTH:
+        raise SampleException("OPTAA_SampleDataParticle: packet too short for %d wavelengths" % num_wavelengths)
+
+    counts = np.frombuffer(record, dtype=SCAN_DATA_DTYPE, count=num_wavelengths * NUM_SCAN_DATA_VECTORS,
+                           offset=INDEX_OF_START_OF_SCAN_DATA)
+    return [counts[i::NUM_SCAN_DATA_VECTORS].tolist() for i in range(NUM_SCAN_DATA_VECTORS)]
         
 
 ###############################################################################
@@ -180,10 +213,7 @@ class OPTAA_SampleDataParticle(DataParticle):
         record_length = get_two_byte_value(match.group(1), 0)
         
         packet_checksum = get_two_byte_value(record, record_length)
-        checksum = 0
-        for i in range(0, record_length):
-            checksum += ord(record[i])
-            checksum &= 0xffff
+        checksum = calculate_checksum(record, record_length)
         if checksum != packet_checksum:
             log.debug('OPTAA_SampleDataParticle: Checksum mismatch in data packet, rcvd=%d, calc=%d.'
                       %(packet_checksum, checksum))
@@ -220,21 +250,8 @@ class OPTAA_SampleDataParticle(DataParticle):
                        DataParticleKey.VALUE: ord(match.group(13))})
 
         ### Now build four vectors out of the wavelength data
-        index = INDEX_OF_START_OF_SCAN_DATA
-        C_REFERENCE_COUNTS_VECTOR = []
-        A_REFERENCE_COUNTS_VECTOR = []
-        C_SIGNAL_COUNTS_VECTOR = []
-        A_SIGNAL_COUNTS_VECTOR = []
-        
-        while index < record_length:
-            C_REFERENCE_COUNTS_VECTOR.append(get_two_byte_value(record, index))
-            index += SIZEOF_SCAN_DATA_SIGNAL_COUNTS
-            A_REFERENCE_COUNTS_VECTOR.append(get_two_byte_value(record, index))
-            index += SIZEOF_SCAN_DATA_SIGNAL_COUNTS
-            C_SIGNAL_COUNTS_VECTOR.append(get_two_byte_value(record, index))
-            index += SIZEOF_SCAN_DATA_SIGNAL_COUNTS
-            A_SIGNAL_COUNTS_VECTOR.append(get_two_byte_value(record, index))
-            index += SIZEOF_SCAN_DATA_SIGNAL_COUNTS
+        (C_REFERENCE_COUNTS_VECTOR, A_REFERENCE_COUNTS_VECTOR,
+         C_SIGNAL_COUNTS_VECTOR, A_SIGNAL_COUNTS_VECTOR) = get_scan_data_vectors(record, record_length)
 
         result.append({DataParticleKey.VALUE_ID: OPTAA_SampleDataParticleKey.C_REFERENCE_COUNTS,
                        DataParticleKey.VALUE: C_REFERENCE_COUNTS_VECTOR})
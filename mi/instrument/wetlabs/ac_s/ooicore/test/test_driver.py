@@ -63,6 +63,8 @@ from mi.instrument.wetlabs.ac_s.ooicore.driver import OPTAA_SampleDataParticleKe
 from mi.instrument.wetlabs.ac_s.ooicore.driver import OPTAA_SampleDataParticle
 from mi.instrument.wetlabs.ac_s.ooicore.driver import OPTAA_StatusDataParticleKey
 from mi.instrument.wetlabs.ac_s.ooicore.driver import OPTAA_StatusDataParticle
+from mi.instrument.wetlabs.ac_s.ooicore.driver import calculate_checksum
+from mi.instrument.wetlabs.ac_s.ooicore.driver import get_scan_data_vectors
 
 from mi.core.exceptions import SampleException, InstrumentParameterException, InstrumentStateException
 from mi.core.exceptions import InstrumentProtocolException, InstrumentCommandException, Conflict
@@ -462,6 +464,27 @@ class TestUNIT(InstrumentDriverUnitTestCase, UtilMixin):
         self.assert_chunker_combined_sample(chunker, OPTAA_STATUS_DATA)
 
 
+    def test_scan_data_vectors(self):
+        """
+        Test the checksum and splitting the scan data into count vectors
+        """
+        header = '\x00' * 32
+        scan_data = pack('>8H', 1, 2, 3, 4, 5, 6, 7, 0xffff)
+        record = header + scan_data + '\xff\xff\x00'
+
+        self.assertEqual(calculate_checksum(record, 4), 0)
+        self.assertEqual(calculate_checksum(record, 48), 28 + 0x1fe)
+        self.assertEqual(calculate_checksum('\xff' * 300, 300), (0xff * 300) & 0xffff)
+
+        self.assertEqual(get_scan_data_vectors(record, 48), [[1, 5], [2, 6], [3, 7], [4, 0xffff]])
+        self.assertEqual(get_scan_data_vectors(record, 32), [[], [], [], []])
+
+        # a partial wavelength is read as a whole one
+        self.assertEqual(get_scan_data_vectors(record, 34), [[1], [2], [3], [4]])
+
+        with self.assertRaises(SampleException):
+            get_scan_data_vectors(record, 50)
+
     def test_corrupt_data_sample(self):
         # garbage is not okay
         particle = OPTAA_SampleDataParticle(OPTAA_SAMPLE.replace('\x00\x00\x7b', 'foo'),